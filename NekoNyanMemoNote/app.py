@@ -13,7 +13,7 @@ import threading
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTabWidget, QSplitter, QTextEdit, QStatusBar, QLabel,
-    QMenu, QMessageBox, QPushButton, QSizePolicy, QTreeView, QDialog
+    QMenu, QMessageBox, QPushButton, QSizePolicy, QTreeView, QDialog, QInputDialog, QProgressDialog
 )
 from PyQt6.QtGui import (
     QAction, QKeySequence, QShortcut, QIcon, QActionGroup, QTextCursor
@@ -34,15 +34,23 @@ from .constants import (
     DEFAULT_WINDOW_X, DEFAULT_WINDOW_Y, MAIN_LAYOUT_MARGIN, MAIN_LAYOUT_SPACING,
     FONT_BUTTON_SIZE, FONT_LAYOUT_SPACING, TIMER_INTERVAL_MS, HOTKEY_DEBOUNCE_TIME,
     CHAR_WRAP_WIDTH, WINDOWS_API_TIMER_DELAY, WINDOWS_API_RESTORE_DELAY,
-    ENABLE_DEBUG_OUTPUT
+    ENABLE_DEBUG_OUTPUT, SHUTDOWN_FLUSH_DEADLINE_MS, HIBERNATION_MODE,
+    SEARCH_INDEX_FILE_NAME, SEARCH_INDEX_BUILD_DELAY_MS, TRANSFORM_PROGRESS_DELAY_MS
 )
 from .widgets import (
-    MemoTextEdit, ReadOnlyFileSystemModel, CustomTreeView, CustomTabBar, AutoTextSettingsDialog, UpdateDebouncer
+    MemoTextEdit, ReadOnlyFileSystemModel, CustomTreeView, CustomTabBar, AutoTextSettingsDialog, UpdateDebouncer,
+    MemoSearchDialog, GrepDialog, FindReplaceDialog
 )
 from .file_system import FileSystemManager, BASE_MEMO_DIR, safe_error_message, get_safe_path
 from .settings_manager import SettingsManager
 from .tab_manager import TabManager
 from .hotkey_manager import HotkeyManager
+from .hibernation_store import HibernationStore
+from .search_index import SearchIndex, SearchIndexer, fts5_trigram_available
+from .quick_open import MemoNameIndexer
+from .grep_search import GrepSearcher
+from .find_replace import DocumentFinder
+from .text_transform import TextTransformer, TextPipeline, TEXT_TRANSFORMS
 from .interfaces import ISettingsManager, IFileSystemManager, ITabManager, IHotkeyManager
 
 class MemoApp(QMainWindow):
@@ -69,6 +77,23 @@ class MemoApp(QMainWindow):
         if hasattr(self.hotkey_manager, 'parent'):
             self.hotkey_manager.parent = self
         
+        # 前回判定したエンコーディングを引き継ぎ、レガシーなCP932メモの推定を省略
+        if hasattr(self.fs_manager, 'load_encoding_cache'):
+            self.fs_manager.load_encoding_cache()
+        if hasattr(self.fs_manager, 'enable_line_index_cache'):
+            self.fs_manager.enable_line_index_cache()
+        if hasattr(self.fs_manager, 'windowed_view_threshold') and hasattr(self.settings_manager, 'get_windowed_view_threshold_mb'):
+            self.fs_manager.windowed_view_threshold = self.settings_manager.get_windowed_view_threshold_mb() * 1024 * 1024
+        if hasattr(self.fs_manager, 'set_content_cache_budget') and hasattr(self.settings_manager, 'get_content_cache_budget_mb'):
+            self.fs_manager.set_content_cache_budget(self.settings_manager.get_content_cache_budget_mb() * 1024 * 1024)
+        self.hibernation_mode = HIBERNATION_MODE
+        if hasattr(self.settings_manager, 'get_hibernation_mode'):
+            self.hibernation_mode = self.settings_manager.get_hibernation_mode()
+        if hasattr(self.tab_manager, 'hibernation_mode'):
+            self.tab_manager.hibernation_mode = self.hibernation_mode
+        if hasattr(self.tab_manager, 'memory_governor') and hasattr(self.settings_manager, 'get_tab_memory_budget_mb'):
+            self.tab_manager.memory_governor.set_budget(self.settings_manager.get_tab_memory_budget_mb() * 1024 * 1024)
+        
         self.read_only_files = set()
         self.ignore_save = False
         self.settings = self.settings_manager.settings  # 後方互換性のため
@@ -80,7 +105,10 @@ class MemoApp(QMainWindow):
         self.last_hotkey_press_time = 0
         self.hotkey_debounce_time = HOTKEY_DEBOUNCE_TIME
         self.memory_optimization_enabled = False
-        self.inactive_tab_content = {}
+        # TabManagerとメモリ上限による追い出しが退避した内容も終了時に保存できるよう、同じストアを使う
+        self.inactive_tab_content = getattr(self.tab_manager, 'inactive_tab_content', None)
+        if self.inactive_tab_content is None:
+            self.inactive_tab_content = HibernationStore()
         
         # DOM更新最適化のデバウンサー初期化
         self.footer_update_debouncer = UpdateDebouncer(delay_ms=100, parent=self)
@@ -109,6 +137,46 @@ class MemoApp(QMainWindow):
                 QMessageBox.critical(self, "致命的なエラー", f"ベースディレクトリを作成できませんでした。\n{e}")
                 sys.exit(1)
 
+        # クイックオープン用のメモ名の索引（起動後に裏で作成し、以後は変更の通知だけで更新する）
+        self.quick_open_dialog = None
+        self.name_indexer = MemoNameIndexer(BASE_MEMO_DIR, self)
+        self.name_indexer.build_finished.connect(self._on_name_index_finished)
+        change_notifier = getattr(self.fs_manager, 'change_notifier', None)
+        if change_notifier:
+            change_notifier.file_changed.connect(self.name_indexer.on_file_changed)
+        QTimer.singleShot(SEARCH_INDEX_BUILD_DELAY_MS, self.name_indexer.start_build)
+
+        # 索引を使わないgrep検索（正規表現など。開いたときに全メモを読む）
+        self.grep_dialog = None
+        self.grep_searcher = GrepSearcher(BASE_MEMO_DIR, self)
+
+        # 開いているメモの検索と置換（一致の検索・置換後の文字列の作成はバックグラウンドで行う）
+        self.find_dialog = None
+        self.document_finder = DocumentFinder(self)
+        self.document_finder.replace_finished.connect(self._on_replace_all_finished)
+
+        # タブ・改行の削除などのテキスト変換（変換はバックグラウンドで行い、長いメモでは進み具合を表示する）
+        self.text_transform_progress = None
+        self.text_transformer = TextTransformer(self)
+        self.text_transformer.transform_progress.connect(self._on_text_transform_progress)
+        self.text_transformer.transform_finished.connect(self._on_text_transform_finished)
+
+        # 全文検索の索引（PyMemoNoteDataと同じ場所に置き、起動を妨げないよう少し待ってから裏で突き合わせる）
+        self.search_index = None
+        self.search_indexer = None
+        self.search_dialog = None
+        if fts5_trigram_available():
+            self.search_index = SearchIndex(os.path.join(os.path.dirname(BASE_MEMO_DIR), SEARCH_INDEX_FILE_NAME))
+            self.search_indexer = SearchIndexer(self.search_index, BASE_MEMO_DIR, self)
+            self.search_indexer.build_progress.connect(self._on_search_index_progress)
+            self.search_indexer.build_finished.connect(self._on_search_index_finished)
+            # 起動後の保存・名前変更・削除は、変更されたメモだけを索引に反映する
+            if change_notifier:
+                change_notifier.file_changed.connect(self.search_indexer.on_file_changed)
+            QTimer.singleShot(SEARCH_INDEX_BUILD_DELAY_MS, self.search_indexer.start_build)
+        else:
+            print("WARNING: SQLiteがFTS5のtrigramトークナイザに対応していないため、全文検索は使えません")
+
         self.init_ui()
         self.load_settings()
         self.apply_font_size_to_all_editors()
@@ -568,6 +636,8 @@ class MemoApp(QMainWindow):
         self.status_bar.addWidget(self.status_label_cursor)
         self.status_label_chars = QLabel("文字数: -")
         self.status_bar.addWidget(self.status_label_chars)
+        self.status_label_memory = QLabel("メモリ: -")
+        self.status_bar.addWidget(self.status_label_memory)
         
         # スペーサー
         spacer = QWidget()
@@ -610,6 +680,7 @@ class MemoApp(QMainWindow):
         self._create_wrap_menu()
         self._create_auto_text_button()
         self._create_tab_newline_remove_button()
+        self._create_text_transform_button()
         self._setup_shortcuts()
     
     def _create_wrap_menu(self):
@@ -659,10 +730,158 @@ class MemoApp(QMainWindow):
         remove_button.clicked.connect(self.remove_tabs_and_newlines)
         self.status_bar.addPermanentWidget(remove_button)
     
+    def _create_text_transform_button(self):
+        # テキスト変換メニューの作成（登録されている変換と、よく使う組み合わせ）
+        transform_menu = QMenu("テキスト変換", self)
+        for name, transform_class in TEXT_TRANSFORMS.items():
+            action = QAction(transform_class.label, self)
+            action.triggered.connect(lambda checked=False, names=[name]: self.run_text_transform(names))
+            transform_menu.addAction(action)
+        transform_menu.addSeparator()
+        for names in (['sort', 'dedupe'], ['trim', 'dedupe']):
+            action = QAction(TextPipeline(names).label, self)
+            action.triggered.connect(lambda checked=False, names=names: self.run_text_transform(names))
+            transform_menu.addAction(action)
+        
+        transform_button = QPushButton("テキスト変換")
+        transform_button.setToolTip("選択テキストまたは全テキストを変換する（Undoで元に戻せます）")
+        transform_button.setMenu(transform_menu)
+        self.status_bar.addPermanentWidget(transform_button)
+    
     def _setup_shortcuts(self):
         # ショートカットの設定
         self.auto_text_shortcut = QShortcut(QKeySequence("Ctrl+W"), self)
         self.auto_text_shortcut.activated.connect(self.show_auto_text_menu)
+        self.go_to_line_shortcut = QShortcut(QKeySequence("Ctrl+G"), self)
+        self.go_to_line_shortcut.activated.connect(self.go_to_line)
+        self.search_shortcut = QShortcut(QKeySequence("Ctrl+Shift+F"), self)
+        self.search_shortcut.activated.connect(self.show_search_dialog)
+        self.quick_open_shortcut = QShortcut(QKeySequence("Ctrl+P"), self)
+        self.quick_open_shortcut.activated.connect(self.show_quick_open)
+        self.grep_shortcut = QShortcut(QKeySequence("Ctrl+Shift+G"), self)
+        self.grep_shortcut.activated.connect(self.show_grep_dialog)
+        self.find_shortcut = QShortcut(QKeySequence("Ctrl+F"), self)
+        self.find_shortcut.activated.connect(self.show_find_dialog)
+        self.replace_shortcut = QShortcut(QKeySequence("Ctrl+H"), self)
+        self.replace_shortcut.activated.connect(lambda: self.show_find_dialog(focus_replace=True))
+    
+    def show_search_dialog(self):
+        """全文検索ダイアログを表示（索引の更新中も索引済みの分から検索できる）"""
+        if not self.search_index:
+            QMessageBox.information(self, "全文検索", "このPython環境のSQLiteはFTS5のtrigramに対応していないため、全文検索は使えません。")
+            return
+        if self.search_dialog is None:
+            self.search_dialog = MemoSearchDialog(self.search_index.search, BASE_MEMO_DIR, self)
+            self.search_dialog.memo_selected.connect(self.open_memo_path)
+        if self.search_indexer.is_building:
+            self.search_dialog.set_index_status("索引を更新中…")
+        self.search_dialog.show()
+        self.search_dialog.raise_()
+        self.search_dialog.activateWindow()
+        self.search_dialog.query_input.setFocus()
+        self.search_dialog.query_input.selectAll()
+    
+    def show_quick_open(self):
+        """クイックオープン（全フォルダのメモ名をあいまい検索して開く）を表示"""
+        if self.quick_open_dialog is None:
+            self.quick_open_dialog = MemoSearchDialog(self.name_indexer.search, BASE_MEMO_DIR, self,
+                                                      title="メモを開く", placeholder="メモ名（あいまい検索）", debounce_ms=0)
+            self.quick_open_dialog.memo_selected.connect(self._open_quick_open_result)
+        if self.name_indexer.is_building:
+            self.quick_open_dialog.set_index_status("メモ名の一覧を作成中…")
+        self.quick_open_dialog.show()
+        self.quick_open_dialog.raise_()
+        self.quick_open_dialog.activateWindow()
+        self.quick_open_dialog.query_input.setFocus()
+        self.quick_open_dialog.query_input.selectAll()
+    
+    def show_grep_dialog(self):
+        """grep検索ダイアログ（全メモを正規表現・文字列で検索し、一致した行を見つかった順に表示）を表示"""
+        if self.grep_dialog is None:
+            self.grep_dialog = GrepDialog(self.grep_searcher, BASE_MEMO_DIR, self)
+            self.grep_dialog.memo_selected.connect(self.open_memo_path)
+        self.grep_dialog.show()
+        self.grep_dialog.raise_()
+        self.grep_dialog.activateWindow()
+        self.grep_dialog.query_input.setFocus()
+        self.grep_dialog.query_input.selectAll()
+    
+    def show_find_dialog(self, focus_replace=False):
+        """開いているメモの検索と置換ダイアログを表示（選択中の1行のテキストを検索語にする）"""
+        editor = self.get_current_editor()
+        if self.find_dialog is None:
+            self.find_dialog = FindReplaceDialog(self.document_finder, self.get_current_editor, self)
+        if editor and editor.textCursor().hasSelection():
+            selected_text = editor.textCursor().selectedText()
+            if '\u2029' not in selected_text:
+                self.find_dialog.query_input.setText(selected_text)
+        self.find_dialog.show()
+        self.find_dialog.raise_()
+        self.find_dialog.activateWindow()
+        line_edit = self.find_dialog.replace_input if focus_replace else self.find_dialog.query_input
+        line_edit.setFocus()
+        line_edit.selectAll()
+        self.find_dialog.run_search()
+    
+    def _on_replace_all_finished(self, result):
+        # 置換はエディタから切り離したドキュメントに反映するため、textChangedによる自動保存の予約はここで行う
+        if result.get('count'):
+            self._schedule_autosave(result['editor'])
+            self.update_footer_status()
+    
+    def _open_quick_open_result(self, file_path):
+        if self.open_memo_path(file_path):
+            self.quick_open_dialog.hide()
+    
+    def _on_name_index_finished(self, stats):
+        if self.quick_open_dialog and self.quick_open_dialog.isVisible():
+            # 作成中に入力された分を作成した索引で検索し直す
+            self.quick_open_dialog.run_search()
+            self.quick_open_dialog.set_index_status(f"{stats['memos']:,}件のメモ")
+    
+    def _on_search_index_progress(self, done, total):
+        if self.search_dialog and self.search_dialog.isVisible():
+            self.search_dialog.set_index_status(f"索引を更新中: {done:,}/{total:,}")
+    
+    def _on_search_index_finished(self, stats):
+        if self.search_dialog and self.search_dialog.isVisible():
+            self.search_dialog.set_index_status(f"索引済み: {stats['files']:,}件" if stats else "索引の更新に失敗しました")
+    
+    def open_memo_path(self, file_path):
+        """メモを含むフォルダのタブに切り替えて、そのメモを開く
+        
+        Returns:
+            bool: 開いた場合True
+        """
+        norm_path = os.path.normcase(os.path.abspath(file_path))
+        for i in range(self.tab_widget.count()):
+            splitter, _, tree, _ = self.get_current_widgets(i)
+            folder_path = splitter.property("folder_path") if splitter else None
+            if folder_path and norm_path.startswith(os.path.normcase(os.path.abspath(folder_path)) + os.sep):
+                if i != self.tab_widget.currentIndex():
+                    self.save_current_memo()
+                    self.tab_widget.setCurrentIndex(i)
+                self.select_file_in_tree(file_path, tree)
+                return True
+        self.status_bar.showMessage(f"メモを含むフォルダのタブがありません: {file_path}", 5000)
+        return False
+    
+    def go_to_line(self):
+        """指定した行へ移動（閲覧モードでは行索引から該当位置だけを読み込む）"""
+        editor = self.get_current_editor()
+        if not editor or not editor.file_path:
+            return
+        total_lines = max(1, editor.total_line_count())
+        line, ok = QInputDialog.getInt(self, "行へ移動", f"行番号 (1-{total_lines:,}):", 1, 1, total_lines)
+        if not ok:
+            return
+        if editor.windowed_view:
+            editor.windowed_view.show_line(line - 1)
+        else:
+            cursor = QTextCursor(editor.document().findBlockByNumber(line - 1))
+            editor.setTextCursor(cursor)
+            editor.ensureCursorVisible()
+        editor.setFocus()
     
     def _setup_event_filter(self):
         # イベントフィルターの設定
@@ -712,12 +931,17 @@ class MemoApp(QMainWindow):
 
     def closeEvent(self, event):
         print("DEBUG: closeEvent が呼ばれました")
+        # 後片付けを始める前に未保存のメモを保存する（保存できなければ終了を取りやめられる）
+        if not self._cleanup_performed and not self._flush_before_close():
+            if ENABLE_DEBUG_OUTPUT:
+                print("DEBUG: 保存できなかったメモがあるため終了を取りやめました")
+            event.ignore()
+            return
         self.update_last_opened_file_for_current_tab()
-        self.save_current_memo()
         self.save_settings()
         
         print("DEBUG: cleanup_resources() を呼び出し中...")
-        # リソースクリーンアップを実行
+        # リソースクリーンアップを実行（全タブの未保存のメモもここで保存する）
         self.cleanup_resources()
         print("DEBUG: cleanup_resources() 完了")
         
@@ -734,17 +958,54 @@ class MemoApp(QMainWindow):
             return
         
         self._cleanup_performed = True
+        if hasattr(self, 'cleanup_timer') and self.cleanup_timer:
+            self.cleanup_timer.stop()
+        
+        # 各段階の所要時間（ms）を記録し、最後にまとめて出力する
+        phase_times = []
+        phase_started = time.perf_counter()
+        def end_phase(name):
+            nonlocal phase_started
+            now = time.perf_counter()
+            phase_times.append((name, (now - phase_started) * 1000))
+            phase_started = now
+        
         try:
             print("DEBUG: リソースクリーンアップを開始...")
             
-            # HotkeyManagerを使用してホットキーリスナーを停止
-            if hasattr(self, 'hotkey_manager') and self.hotkey_manager:
+            # ホットキースレッドには停止要求だけ送り、保存と並行して終了させる
+            hotkey_manager = getattr(self, 'hotkey_manager', None)
+            if hotkey_manager and hasattr(hotkey_manager, 'request_stop'):
+                hotkey_manager.request_stop()
+            # 検索索引の更新も中断を要求しておく（索引済みの分は次回に引き継がれる）
+            search_indexer = getattr(self, 'search_indexer', None)
+            if search_indexer:
+                search_indexer.cancel()
+            name_indexer = getattr(self, 'name_indexer', None)
+            if name_indexer:
+                name_indexer.cancel()
+            grep_searcher = getattr(self, 'grep_searcher', None)
+            if grep_searcher:
+                grep_searcher.cancel()
+            document_finder = getattr(self, 'document_finder', None)
+            if document_finder:
+                document_finder.cancel()
+            text_transformer = getattr(self, 'text_transformer', None)
+            if text_transformer:
+                text_transformer.cancel()
+            end_phase("ホットキー停止要求")
+            
+            # 全タブ（退避中のタブを含む）の未保存のメモを期限つきで並列に保存
+            # （closeEventで保存済み・破棄を選択済みの場合は行わない）
+            if not getattr(self, '_shutdown_flush_done', False) and self._can_flush_documents():
+                results = self._flush_dirty_documents()
+                end_phase(f"未保存メモの保存({len(results)}件)")
+            
+            # HotkeyManagerを使用してホットキーリスナーを停止（停止要求済みなので終了を待つだけ）
+            if hotkey_manager:
                 try:
                     print("DEBUG: ホットキーマネージャーの停止中...")
-                    self.hotkey_manager.stop_hotkey_listener()
-                    # スレッドの停止を確実に待つため、追加の待機時間
-                    QApplication.processEvents()  # イベント処理を強制実行
-                    time.sleep(0.5)  # 待機時間を延長
+                    hotkey_manager.stop_hotkey_listener()
                     print("DEBUG: ホットキーマネージャーが停止されました")
                 except Exception as e:
                     print(f"ERROR: ホットキーマネージャー停止エラー: {e}")
@@ -752,6 +1013,21 @@ class MemoApp(QMainWindow):
                     traceback.print_exc()
             else:
                 print("DEBUG: ホットキーマネージャーが存在しません")
+            end_phase("ホットキー終了待ち")
+            
+            if search_indexer:
+                if not search_indexer.wait(2000):
+                    print("WARNING: 検索索引の更新が2秒以内に中断できませんでした")
+                self.search_index.close()
+            if name_indexer and not name_indexer.wait(2000):
+                print("WARNING: メモ名の索引の作成が2秒以内に中断できませんでした")
+            if grep_searcher and not grep_searcher.wait(2000):
+                print("WARNING: grep検索が2秒以内に中断できませんでした")
+            if document_finder and not document_finder.wait(2000):
+                print("WARNING: メモ内の検索・置換が2秒以内に終わりませんでした")
+            if text_transformer and not text_transformer.wait(2000):
+                print("WARNING: テキスト変換が2秒以内に中断できませんでした")
+            end_phase("検索索引の停止")
             
             # ローカルサーバーを停止
             if hasattr(self, 'local_server') and self.local_server:
@@ -776,6 +1052,8 @@ class MemoApp(QMainWindow):
                     print("DEBUG: fs_manager.cleanup()を呼び出し中...")
                     self.fs_manager.cleanup()
                     print("DEBUG: fs_manager.cleanup()完了")
+                    if hasattr(self.fs_manager, 'save_encoding_cache'):
+                        self.fs_manager.save_encoding_cache()
                 except Exception as e:
                     print(f"Error cleaning up file system manager: {e}")
             else:
@@ -788,14 +1066,107 @@ class MemoApp(QMainWindow):
             # メモリ最適化のキャッシュをクリア
             if hasattr(self, 'inactive_tab_content'):
                 self.inactive_tab_content.clear()
+            end_phase("後始末")
             
-            print("リソースクリーンアップ完了")
+            total_ms = sum(elapsed for _, elapsed in phase_times)
+            details = " / ".join(f"{name} {elapsed:.0f}ms" for name, elapsed in phase_times)
+            print(f"リソースクリーンアップ完了: 合計 {total_ms:.0f}ms ({details})")
             
         except Exception as e:
             print(f"Error during resource cleanup: {e}")
             import traceback
             traceback.print_exc()
 
+    def _can_flush_documents(self):
+        """終了時の一括保存が使えるか"""
+        return bool(getattr(self, 'fs_manager', None)) and hasattr(self.fs_manager, 'flush_documents')
+    
+    def _flush_before_close(self):
+        """閉じる前に未保存のメモを保存する
+        
+        保存に失敗・期限切れのメモがあれば、再試行・保存せずに終了・終了の取りやめを選ばせる。
+        
+        Returns:
+            bool: 終了を続ける場合True
+        """
+        if not self._can_flush_documents():
+            return True
+        while True:
+            results = self._flush_dirty_documents()
+            failed = {file_path: success for file_path, success in results.items() if not success}
+            if not failed:
+                break
+            lines = [f"{file_path}（時間内に完了しませんでした）" if success is None else file_path
+                     for file_path, success in list(failed.items())[:10]]
+            if len(failed) > 10:
+                lines.append(f"ほか{len(failed) - 10}件")
+            reply = QMessageBox.warning(
+                self, "保存エラー",
+                "次のメモを保存できませんでした。\n\n" + "\n".join(lines) +
+                "\n\n再試行しますか？「破棄」を選ぶと保存せずに終了します。",
+                QMessageBox.StandardButton.Retry | QMessageBox.StandardButton.Discard | QMessageBox.StandardButton.Cancel,
+                QMessageBox.StandardButton.Retry
+            )
+            if reply == QMessageBox.StandardButton.Discard:
+                break
+            if reply != QMessageBox.StandardButton.Retry:
+                return False
+        self._shutdown_flush_done = True
+        return True
+    
+    def _flush_dirty_documents(self):
+        """未保存のメモを期限つきで並列に保存し、保存できたメモだけ保存済みにする
+        
+        Returns:
+            dict: パス -> 保存結果（失敗はFalse、期限内に完了しなかったものはNone）
+        """
+        documents = self._collect_dirty_documents()
+        if not documents:
+            return {}
+        deadline_ms = self.settings_manager.get_shutdown_flush_deadline_ms() \
+            if hasattr(self.settings_manager, 'get_shutdown_flush_deadline_ms') else SHUTDOWN_FLUSH_DEADLINE_MS
+        results = self.fs_manager.flush_documents(documents, deadline_ms)
+        for file_path, success in results.items():
+            if success is None:
+                print(f"!!! ERROR: 終了時の保存が{deadline_ms}ms以内に完了しませんでした: {file_path}")
+            elif not success:
+                print(f"!!! ERROR: 終了時の保存に失敗しました: {file_path}")
+        self._mark_documents_saved({file_path for file_path, success in results.items() if success})
+        return results
+    
+    def _collect_dirty_documents(self):
+        """未保存の変更があるメモをすべて集める（非アクティブ化で退避中のタブも含む）
+        
+        未保存の状態は変えない（保存できたものだけ _mark_documents_saved で保存済みにする）。
+        
+        Returns:
+            dict: パス -> 保存する内容
+        """
+        documents = {}
+        for i in range(self.tab_widget.count()):
+            _, _, _, editor = self.get_current_widgets(i)
+            # 休止中のタブは切り離したドキュメントに変更が残っている
+            document = editor.content_document() if editor else None
+            if not editor or not editor.file_path or editor.isReadOnly() or not document.isModified():
+                continue
+            documents[editor.file_path] = document.toPlainText()
+        for file_path in self.inactive_tab_content.modified_paths():
+            if file_path not in documents:
+                documents[file_path] = self.inactive_tab_content.peek(file_path)['content']
+        return documents
+    
+    def _mark_documents_saved(self, saved_paths):
+        """保存できたメモの未保存の状態を解除"""
+        if not saved_paths:
+            return
+        for i in range(self.tab_widget.count()):
+            _, _, _, editor = self.get_current_widgets(i)
+            if editor and editor.file_path in saved_paths:
+                editor.content_document().setModified(False)
+        for file_path in self.inactive_tab_content.modified_paths():
+            if file_path in saved_paths:
+                self.inactive_tab_content.mark_saved(file_path)
+
     def load_settings(self):
         try:
             geometry = self.settings.value("geometry")
@@ -966,15 +1337,19 @@ class MemoApp(QMainWindow):
             # 小さいファイルは非同期読み込み
             self.fs_manager.load_memo_content_async(
                 file_path, 
-                lambda content: self._on_content_loaded_immediate(editor, content)
+                lambda content: self._on_content_loaded_immediate(editor, content, file_path)
             )
     
     def _load_file_streaming(self, file_path, editor):
         """大容量ファイルをストリーミングで読み込み"""
         # ストリーミング読み込み用のコールバック
         def on_chunk(chunk_content, current_pos, total_size):
+            if editor.file_path != file_path:
+                return
             if current_pos == -1 and total_size == -1:
                 # 完了時
+                if chunk_content is None:
+                    return
                 editor.setPlainText(chunk_content)
                 editor.is_loaded = True
                 editor.document().setModified(False)
@@ -985,9 +1360,9 @@ class MemoApp(QMainWindow):
         
         self.fs_manager.load_memo_content_streaming(file_path, on_chunk)
     
-    def _on_content_loaded_immediate(self, editor, content):
+    def _on_content_loaded_immediate(self, editor, content, file_path):
         """非同期読み込み完了時の処理"""
-        if content is not None and not editor.is_loaded:
+        if content is not None and not editor.is_loaded and editor.file_path == file_path:
             editor.setPlainText(content)
             editor.is_loaded = True
             editor.document().setModified(False)
@@ -1042,6 +1417,7 @@ class MemoApp(QMainWindow):
             if not model.isDir(index):
                 self.load_memo(file_path)
                 self.update_last_opened_file(file_path)
+                self._prefetch_likely_next_memos(tree, model, index)
             else:
                 if editor and editor.file_path:
                     self.ignore_save = True
@@ -1086,6 +1462,10 @@ class MemoApp(QMainWindow):
                 read_only_action.setChecked(norm_path in self.read_only_files)
                 read_only_action.triggered.connect(lambda checked, path=file_path, mdl=model: self.toggle_read_only(path, checked, mdl))
                 menu.addAction(read_only_action)
+                if editor and editor.windowed_view and editor.file_path == norm_path:
+                    load_fully_action = QAction("全体を読み込んで編集する", self)
+                    load_fully_action.triggered.connect(lambda checked=False, path=norm_path: self.load_memo_fully(path))
+                    menu.addAction(load_fully_action)
         menu.exec(tree.viewport().mapToGlobal(position))
 
     def get_current_folder_path(self):
@@ -1276,13 +1656,15 @@ class MemoApp(QMainWindow):
         if read_only and editor and editor.file_path == norm_path and not editor.isReadOnly():
             if editor.document().isModified():
                 content = editor.toPlainText()
+                editor.document().setModified(False)
                 
                 def on_save_before_readonly(success):
                     """読み取り専用設定前の保存完了コールバック"""
                     if success:
-                        editor.document().setModified(False)
                         if ENABLE_DEBUG_OUTPUT:
                             print(f"読み取り専用設定前の保存完了: {os.path.basename(norm_path)}")
+                    elif editor.file_path == norm_path:
+                        editor.document().setModified(True)
                 
                 # 非同期保存を実行
                 self.fs_manager.save_memo_content_async(norm_path, content, on_save_before_readonly)
@@ -1296,11 +1678,18 @@ class MemoApp(QMainWindow):
             editor.setReadOnly(read_only)
             self.update_footer_status()
 
-    def load_memo(self, file_path):
-        """メモを読み込み（ストリーミング対応）"""
+    def load_memo(self, file_path, restore_state=None):
+        """メモを読み込み（ストリーミング対応）
+        
+        restore_stateにcursor_pos・scroll_posを渡すと、読み込み後にその位置へ戻す
+        """
         _, _, _, editor = self.get_current_widgets()
         if not editor: 
             return
+        
+        # 前のメモの段階的な追記・閲覧モードが残っていれば止める
+        editor.progressive_loader.abort()
+        editor.close_windowed_view()
             
         norm_path = os.path.normcase(os.path.abspath(file_path))
         if not os.path.isfile(norm_path):
@@ -1320,79 +1709,209 @@ class MemoApp(QMainWindow):
         file_size = self.fs_manager.get_file_size(norm_path)
         is_large_file = file_size > 1024 * 1024  # 1MB以上
         
+        # 前のファイルの読み込みが未完了ならキャンセル（結果が後から届いて上書きしないように）
+        previous_path = editor.file_path
+        if previous_path and previous_path != norm_path:
+            self.fs_manager.cancel_file_operation(previous_path)
+        
         self.ignore_save = True
         
-        # エディタの基本設定
-        is_read_only = norm_path in self.read_only_files
+        # エディタの基本設定（読み込み完了までは編集不可にしておく）
         editor.file_path = norm_path
-        editor.setReadOnly(is_read_only)
+        editor.setReadOnly(True)
         
-        if is_large_file:
+        if self.fs_manager.get_file_load_strategy(norm_path) == 'windowed':
+            # 巨大なファイルは表示位置周辺の行だけを読み込む閲覧モード
+            self._open_memo_windowed(norm_path, editor)
+        elif is_large_file:
             # 大容量ファイルはストリーミング読み込み
-            self._load_memo_streaming(norm_path, editor)
+            self._load_memo_streaming(norm_path, editor, restore_state)
         else:
             # 小容量ファイルは非同期読み込み
-            self._load_memo_async(norm_path, editor)
+            self._load_memo_async(norm_path, editor, restore_state)
+    
+    def reload_evicted_memo(self, editor, state):
+        """メモリ上限で破棄したタブのメモをディスクから読み直し、カーソル・スクロール位置を戻す"""
+        if not editor.file_path or editor is not self.get_current_widgets()[3]:
+            return
+        self.load_memo(editor.file_path, restore_state=state)
+    
+    def _restore_view_state(self, editor, state):
+        """読み込み直後のエディタにカーソル・スクロール位置を戻す"""
+        cursor = editor.textCursor()
+        cursor.setPosition(min(state['cursor_pos'], editor.document().characterCount() - 1))
+        editor.setTextCursor(cursor)
+        editor.verticalScrollBar().setValue(state['scroll_pos'])
+    
+    def _prefetch_likely_next_memos(self, tree, model, index):
+        """次に開かれそうなメモ（ツリー上の前後のメモ、他のフォルダタブで最後に開いたメモ）を先読み"""
+        if not hasattr(self.fs_manager, 'prefetch_memos'):
+            return
+        candidates = []
+        for neighbour in (tree.indexBelow(index), tree.indexAbove(index)):
+            if neighbour.isValid() and not model.isDir(neighbour):
+                candidates.append(os.path.normcase(os.path.abspath(model.filePath(neighbour))))
+        current_index = self.tab_widget.currentIndex()
+        for i in range(self.tab_widget.count()):
+            splitter = self.get_current_widgets(i)[0]
+            if i == current_index or not splitter or not splitter.property("folder_path"):
+                continue
+            last_file = self.last_opened_files.get(os.path.normcase(os.path.abspath(splitter.property("folder_path"))))
+            if last_file:
+                candidates.append(last_file)
+        self.fs_manager.prefetch_memos(candidates)
+    
+    def _open_memo_windowed(self, file_path, editor):
+        """巨大なメモを閲覧モードで開く（作成済みの行索引がなければ先頭部分の索引で表示を始め、全体の索引は裏で作成）"""
+        try:
+            # 範囲ごとの読み込みは推定済みのエンコーディング（途中で不正なバイトがあればCP932）を使う
+            self.fs_manager.detect_encoding(file_path)
+            line_offsets = self.fs_manager.get_line_index(file_path)
+            has_full_index = line_offsets is not None
+            if not has_full_index:
+                line_offsets = self.fs_manager.scan_line_offsets(file_path, 1024 * 1024)
+        except OSError as e:
+            error_message = safe_error_message(f"メモ '{os.path.basename(file_path)}' を読み込めませんでした。", f"エラー詳細: {e}")
+            print(f"!!! ERROR: {error_message}")
+            QMessageBox.critical(self, "読み込みエラー", error_message)
+            self._on_memo_load_failed(editor)
+            return
+        
+        view = editor.open_windowed_view(
+            line_offsets, lambda start, end: self.fs_manager.read_text_range(file_path, start, end))
+        self.update_footer_status()
+        self.ignore_save = False
+        if has_full_index:
+            return
+        
+        def on_index_built(offsets):
+            if editor.windowed_view is view and offsets:
+                view.set_line_offsets(offsets)
+                self.update_footer_status()
+        
+        self.fs_manager.build_line_index_async(file_path, on_index_built)
     
-    def _load_memo_streaming(self, file_path, editor):
-        """大容量メモをストリーミング読み込み"""
-        accumulated_content = []
+    def load_memo_fully(self, file_path):
+        """閲覧モードのメモをファイル全体の読み込みで開き直し、編集できるようにする"""
+        _, _, _, editor = self.get_current_widgets()
+        if not editor or editor.file_path != file_path or not editor.windowed_view:
+            return
+        self.fs_manager.cancel_file_operation(file_path)
+        editor.close_windowed_view()
+        self.ignore_save = True
+        editor.setReadOnly(True)
+        self._load_memo_streaming(file_path, editor)
+    
+    def _load_memo_streaming(self, file_path, editor, restore_state=None):
+        """大容量メモをストリーミング読み込み（届いたチャンクから順に表示）"""
+        loader = editor.progressive_loader
+        loader.begin()
+        
+        def on_loaded():
+            editor.setReadOnly(file_path in self.read_only_files)
+            editor.document().setModified(False)
+            if restore_state:
+                self._restore_view_state(editor, restore_state)
+            self.update_footer_status()
+            editor.setFocus()
+            self.ignore_save = False
         
         def on_chunk(chunk_content, current_pos, total_size):
+            if editor.file_path != file_path:
+                # 読み込み中に別のメモへ切り替わった
+                return
             if current_pos == -1 and total_size == -1:
-                # ストリーミング完了
-                complete_content = ''.join(accumulated_content)
-                editor.setPlainText(complete_content)
-                editor.document().setModified(False)
-                editor.moveCursor(QTextCursor.MoveOperation.Start)
-                self.update_footer_status()
-                editor.setFocus()
-                self.ignore_save = False
+                # ストリーミング完了（残りの追記が終わってから編集可能にする）
+                if chunk_content is None:
+                    loader.abort()
+                    self._on_memo_load_failed(editor)
+                    return
+                loader.finish(on_loaded)
             else:
                 # チャンク受信中
-                accumulated_content.append(chunk_content)
+                if current_pos == 0:
+                    # 先頭からの読み直し
+                    loader.begin()
+                loader.append(chunk_content)
                 # プログレス表示（オプション）
                 if total_size > 0:
                     progress = (current_pos / total_size) * 100
                     self.status_label_chars.setText(f"読み込み中: {progress:.1f}%")
         
-        self.fs_manager.load_memo_content_streaming(file_path, on_chunk)
+        self.fs_manager.load_memo_content_streaming(file_path, on_chunk, accumulate=False)
     
-    def _load_memo_async(self, file_path, editor):
+    def _load_memo_async(self, file_path, editor, restore_state=None):
         """小容量メモを非同期読み込み"""
         def on_content_loaded(content):
+            if editor.file_path != file_path:
+                # 読み込み中に別のメモへ切り替わった
+                return
             if content is not None:
                 editor.setPlainText(content)
+                editor.setReadOnly(file_path in self.read_only_files)
                 editor.document().setModified(False)
-                editor.moveCursor(QTextCursor.MoveOperation.Start)
+                if restore_state:
+                    self._restore_view_state(editor, restore_state)
+                else:
+                    editor.moveCursor(QTextCursor.MoveOperation.Start)
                 self.update_footer_status()
                 editor.setFocus()
+                self.ignore_save = False
             else:
-                editor.clear()
-                editor.setReadOnly(True)
-                editor.file_path = None
-                self.update_footer_status()
-            self.ignore_save = False
+                self._on_memo_load_failed(editor)
         
         self.fs_manager.load_memo_content_async(file_path, on_content_loaded)
+    
+    def _on_memo_load_failed(self, editor):
+        """メモ読み込み失敗時にエディタを空の編集不可状態に戻す"""
+        editor.clear()
+        editor.setReadOnly(True)
+        editor.file_path = None
+        self.update_footer_status()
+        self.ignore_save = False
 
     def save_current_memo(self, index=None):
         _, _, _, editor = self.get_current_widgets(index)
-        if not editor or self.ignore_save or not editor.file_path or editor.isReadOnly() or not editor.document().isModified(): 
+        if not self._schedule_autosave(editor):
             return
+        # 明示的な保存（タブ・メモ切り替えなど）は待たずに書き込みに回す
+        self.fs_manager.flush_saves(editor.file_path)
+
+    def _schedule_autosave(self, editor):
+        """編集中のメモの保存を予約（連続した入力はまとめて1回の書き込みにする）
+        
+        Returns:
+            bool: 保存を予約した場合True
+        """
+        if not editor or self.ignore_save or not editor.file_path or editor.isReadOnly() or not editor.document().isModified():
+            return False
         
         file_path = editor.file_path
-        content = editor.toPlainText()
+        
+        def provide_content():
+            """書き込み直前に最新の内容を取得（別のメモに切り替わっていればNone）"""
+            # 書き込みまでにタブが休止していても、切り離したドキュメントから取得する
+            document = editor.content_document()
+            if editor.file_path != file_path or not document.isModified():
+                return None
+            # 保存はバックグラウンドで行うため、投入時点で未変更扱いにする
+            # （完了前の追加入力で変更フラグが立てば次回また保存される）
+            document.setModified(False)
+            return document.toPlainText()
         
         def on_content_saved(success):
             """保存完了時のコールバック"""
             if success:
-                editor.document().setModified(False)
                 if ENABLE_DEBUG_OUTPUT:
                     print(f"非同期保存完了: {os.path.basename(file_path)}")
+            elif editor.file_path == file_path:
+                # 失敗した場合は再保存できるよう変更フラグを戻す
+                editor.content_document().setModified(True)
         
-        # 非同期保存を実行
-        self.fs_manager.save_memo_content_async(file_path, content, on_content_saved)
+        # 保留中の要求にまとめる場合、完了コールバックは最初の1つで足りる
+        already_pending = self.fs_manager.save_scheduler.has_pending(file_path)
+        self.fs_manager.schedule_save(file_path, provide_content, None if already_pending else on_content_saved)
+        return True
 
     def insert_date(self):
         focused_widget = QApplication.focusWidget()
@@ -1573,6 +2092,7 @@ class MemoApp(QMainWindow):
         self.apply_font_size(memo_edit)
         memo_edit.setReadOnly(True)
         memo_edit.textChanged.connect(self._schedule_footer_update)
+        memo_edit.textChanged.connect(lambda editor=memo_edit: self._schedule_autosave(editor))
         memo_edit.cursorPositionChanged.connect(self._schedule_footer_update)
         splitter.addWidget(memo_edit)
         splitter.setStretchFactor(0, 1)
@@ -1616,7 +2136,10 @@ class MemoApp(QMainWindow):
             return
         _, _, _, editor = self.get_current_widgets()
         if editor and editor.file_path:
-            if editor.isReadOnly():
+            if editor.windowed_view:
+                self.status_label_chars.setText(f"閲覧モード: {editor.windowed_view.total_lines:,}行")
+                self.status_label_cursor.setText("カーソル: -")
+            elif editor.isReadOnly():
                 self.status_label_chars.setText("文字数: - (編集不可)")
                 self.status_label_cursor.setText("カーソル: -")
             else:
@@ -1713,40 +2236,64 @@ class MemoApp(QMainWindow):
 
     def remove_tabs_and_newlines(self):
         """現在のエディタからタブと改行を削除する"""
-        try:
-            current_editor = self.get_current_editor()
-            if not current_editor:
-                QMessageBox.warning(self, "警告", "編集可能なメモが開かれていません。")
-                return
-            
-            cursor = current_editor.textCursor()
-            
-            # 選択テキストがある場合は選択部分のみ、ない場合は全体を処理
-            if cursor.hasSelection():
-                selected_text = cursor.selectedText()
-                # タブと改行を削除
-                processed_text = selected_text.replace('\t', '').replace('\n', '').replace('\r', '')
-                cursor.insertText(processed_text)
-                if ENABLE_DEBUG_OUTPUT:
-                    print(f"DEBUG: 選択テキストからタブ・改行を削除: {len(selected_text)} → {len(processed_text)} 文字")
-            else:
-                # 全テキストを処理
-                all_text = current_editor.toPlainText()
-                processed_text = all_text.replace('\t', '').replace('\n', '').replace('\r', '')
-                current_editor.setPlainText(processed_text)
-                if ENABLE_DEBUG_OUTPUT:
-                    print(f"DEBUG: 全テキストからタブ・改行を削除: {len(all_text)} → {len(processed_text)} 文字")
-            
-            # ステータス更新
+        self.run_text_transform(['remove_tabs_newlines'])
+
+    def run_text_transform(self, names):
+        """現在のエディタの選択テキスト（なければ全テキスト）を変換する
+        
+        変換はバックグラウンドで行い、変わった範囲だけを1つの編集として反映する（Undo 1回で元に戻せる）。
+        TRANSFORM_PROGRESS_DELAY_MSより長くかかる場合は進み具合を表示し、キャンセルできる。
+        
+        Args:
+            names (list): 順に適用する変換の名前（TEXT_TRANSFORMSのキー）
+        """
+        current_editor = self.get_current_editor()
+        if not current_editor:
+            QMessageBox.warning(self, "警告", "編集可能なメモが開かれていません。")
+            return
+        self._close_text_transform_progress()
+        if not self.text_transformer.start(current_editor, names):
+            QMessageBox.warning(self, "警告", "読み取り専用・読み込み中のメモは変換できません。")
+            return
+        
+        progress = QProgressDialog(f"{TextPipeline(names).label}…", "キャンセル", 0, 100, self)
+        progress.setWindowTitle("テキスト変換")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(TRANSFORM_PROGRESS_DELAY_MS)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        progress.canceled.connect(self._cancel_text_transform)
+        progress.setValue(0)
+        self.text_transform_progress = progress
+
+    def _cancel_text_transform(self):
+        self.text_transformer.cancel()
+        self._close_text_transform_progress()
+        if ENABLE_DEBUG_OUTPUT:
+            print("DEBUG: テキスト変換をキャンセルしました")
+
+    def _close_text_transform_progress(self):
+        progress = self.text_transform_progress
+        if progress is None:
+            return
+        self.text_transform_progress = None
+        progress.canceled.disconnect(self._cancel_text_transform)
+        progress.close()
+        progress.deleteLater()
+
+    def _on_text_transform_progress(self, done, total):
+        if self.text_transform_progress is not None and total:
+            self.text_transform_progress.setValue(done * 100 // total)
+
+    def _on_text_transform_finished(self, result):
+        self._close_text_transform_progress()
+        if 'error' in result:
+            QMessageBox.warning(self, "エラー", result['error'])
+            return
+        # 変換はエディタから切り離したドキュメントに反映するため、textChangedによる自動保存の予約はここで行う
+        if result['changed']:
+            self._schedule_autosave(result['editor'])
             self.update_footer_status()
-            
-        except Exception as e:
-            error_msg = f"タブ・改行削除中にエラーが発生しました: {str(e)}"
-            if ENABLE_DEBUG_OUTPUT:
-                print(f"ERROR: {error_msg}")
-                import traceback
-                traceback.print_exc()
-            QMessageBox.critical(self, "エラー", error_msg)
 
     def update_last_opened_file(self, file_path):
         current_folder_path = self.get_current_folder_path()
@@ -1920,7 +2467,13 @@ class MemoApp(QMainWindow):
             return
             
         file_path = editor.file_path
-        if not file_path or not editor.toPlainText():
+        if self.hibernation_mode == 'swap':
+            # ドキュメントごと切り離す（Undo履歴・カーソル・スクロール位置もそのまま残る）
+            if file_path and editor.hibernate_document():
+                print(f"DEBUG: ドキュメント休止 - {os.path.basename(file_path)}")
+            return
+        if not file_path or editor.windowed_view or not editor.toPlainText():
+            # 閲覧モードはファイルの一部しか持っていないので退避しない
             return
             
         # 現在の状態を保存
@@ -1929,12 +2482,8 @@ class MemoApp(QMainWindow):
         scroll_pos = editor.verticalScrollBar().value()
         is_modified = editor.document().isModified()
         
-        self.inactive_tab_content[file_path] = {
-            'content': content,
-            'cursor_pos': cursor_pos,
-            'scroll_pos': scroll_pos,
-            'modified': is_modified
-        }
+        # 内容は圧縮して退避する
+        self.inactive_tab_content.put(file_path, content, cursor_pos, scroll_pos, is_modified)
         
         # メモリ解放（内容をクリア）
         self.ignore_save = True
@@ -1948,13 +2497,16 @@ class MemoApp(QMainWindow):
         # タブのメモリをアクティブ化(退避内容を復元)
         if not isinstance(editor, MemoTextEdit):
             return
+        if editor.wake_document():
+            print(f"DEBUG: ドキュメント復帰 - {os.path.basename(editor.file_path or '')}")
+            return
             
         file_path = editor.file_path
         if not file_path or file_path not in self.inactive_tab_content:
             return
             
-        # 保存された状態を復元
-        saved_state = self.inactive_tab_content[file_path]
+        # 保存された状態を復元（ストアからは取り出した時点で削除される）
+        saved_state = self.inactive_tab_content.take(file_path)
         
         self.ignore_save = True
         editor.setPlainText(saved_state['content'])
@@ -1971,16 +2523,14 @@ class MemoApp(QMainWindow):
         editor.document().setModified(saved_state['modified'])
         self.ignore_save = False
         
-        # キャッシュから削除
-        del self.inactive_tab_content[file_path]
         print(f"DEBUG: メモリ復元 - {os.path.basename(file_path)} ({len(saved_state['content'])}文字)")
     
     def get_memory_usage_info(self):
         # メモリ使用状況の情報を取得
         active_tabs = 0
         inactive_cached_tabs = len(self.inactive_tab_content)
+        hibernated_documents = 0
         total_active_chars = 0
-        total_cached_chars = 0
         
         # アクティブタブの文字数カウント
         for i in range(self.tab_widget.count()):
@@ -1988,23 +2538,35 @@ class MemoApp(QMainWindow):
             if isinstance(widget, QSplitter) and not widget.property(PLUS_TAB_PROPERTY):
                 editor = widget.widget(1) if widget.count() > 1 else None
                 if isinstance(editor, MemoTextEdit):
+                    if editor.is_hibernated:
+                        hibernated_documents += 1
+                        continue
                     content = editor.toPlainText()
                     if content:
                         active_tabs += 1
                         total_active_chars += len(content)
         
-        # キャッシュされたタブの文字数カウント
-        for cached_data in self.inactive_tab_content.values():
-            total_cached_chars += len(cached_data['content'])
+        # 退避中のタブの圧縮前・圧縮後のサイズ
+        hibernation_stats = self.inactive_tab_content.get_statistics()
         
         return {
             'active_tabs': active_tabs,
             'inactive_cached_tabs': inactive_cached_tabs,
-            'total_tabs': active_tabs + inactive_cached_tabs,
+            'hibernated_documents': hibernated_documents,
+            'total_tabs': active_tabs + inactive_cached_tabs + hibernated_documents,
             'total_active_chars': total_active_chars,
-            'total_cached_chars': total_cached_chars,
-            'optimization_enabled': self.memory_optimization_enabled,
-            'estimated_memory_saved_mb': (total_cached_chars * 3) / (1024 * 1024)
+            'hibernated_raw_bytes': hibernation_stats['raw_bytes'],
+            'hibernated_compressed_bytes': hibernation_stats['compressed_bytes'],
+            'hibernated_spilled_bytes': hibernation_stats['spilled_bytes'],
+            'optimization_enabled': self.memory_optimization_enabled
+                                    or getattr(self.tab_manager, 'memory_optimization_enabled', False),
+            'governor': self.tab_manager.memory_governor.get_statistics()
+                        if hasattr(self.tab_manager, 'memory_governor') else None,
+            'memory_saved_mb': (hibernation_stats['raw_bytes'] - hibernation_stats['memory_bytes']) / (1024 * 1024),
+            'content_cache': self.fs_manager.get_content_cache_statistics()
+                             if hasattr(self.fs_manager, 'get_content_cache_statistics') else None,
+            'prefetch': self.fs_manager.get_prefetch_statistics()
+                        if hasattr(self.fs_manager, 'get_prefetch_statistics') else None
         }
     
     def update_memory_status(self):
@@ -2016,9 +2578,30 @@ class MemoApp(QMainWindow):
         
         if memory_info['optimization_enabled']:
             status_text = f"メモリ: {memory_info['active_tabs']}A/{memory_info['inactive_cached_tabs']}C"
-            if memory_info['estimated_memory_saved_mb'] > 0.1:
-                status_text += f" (-{memory_info['estimated_memory_saved_mb']:.1f}MB)"
+            if memory_info['memory_saved_mb'] > 0.1:
+                status_text += (f" (-{memory_info['memory_saved_mb']:.1f}MB, "
+                                f"圧縮 {memory_info['hibernated_raw_bytes'] / (1024 * 1024):.1f}"
+                                f"→{memory_info['hibernated_compressed_bytes'] / (1024 * 1024):.1f}MB)")
         else:
             status_text = "メモリ: 最適化OFF"
+        
+        governor_stats = memory_info['governor']
+        if governor_stats and governor_stats['budget_bytes']:
+            status_text += (f" / タブ {governor_stats['tracked_bytes'] / (1024 * 1024):.1f}"
+                            f"/{governor_stats['budget_bytes'] / (1024 * 1024):.0f}MB")
+            if governor_stats['last_decision']:
+                file_name, action, freed = governor_stats['last_decision']
+                label = "圧縮退避" if action == 'compressed' else "破棄"
+                status_text += (f" 追出: {file_name}({label} {freed / (1024 * 1024):.1f}MB,"
+                                f" 計{governor_stats['compressed'] + governor_stats['dropped']}件)")
+        
+        cache_stats = memory_info['content_cache']
+        if cache_stats:
+            status_text += (f" / キャッシュ: {cache_stats['entries']}件 {cache_stats['bytes'] / (1024 * 1024):.1f}MB"
+                            f" 命中{cache_stats['hit_rate']:.0%} (ヒット{cache_stats['hits']}/ミス{cache_stats['misses']}"
+                            f"/追出{cache_stats['evictions']})")
+        prefetch_stats = memory_info['prefetch']
+        if prefetch_stats and prefetch_stats['requested']:
+            status_text += f" / 先読み的中{prefetch_stats['hit_rate']:.0%} ({prefetch_stats['used']}/{prefetch_stats['loads']})"
             
         self.status_label_memory.setText(status_text)
@@ -39,6 +39,7 @@ else:
 PLUS_TAB_PROPERTY = "_is_plus_tab"
 DEFAULT_FONT_SIZE = 10
 PREEDIT_PROPERTY_ID = QTextFormat.Property.UserProperty + 1
+FIND_HIGHLIGHT_PROPERTY_ID = QTextFormat.Property.UserProperty + 2  # 検索で一致した箇所の強調表示
 # シングルインスタンス用キー（安全な英数字+アンダースコアのみ）
 import hashlib
 import getpass
@@ -76,6 +77,63 @@ CHAR_WRAP_WIDTH = 36  # 全角36文字分の幅
 WINDOWS_API_TIMER_DELAY = 50
 WINDOWS_API_RESTORE_DELAY = 100
 
+# --- 大容量ファイル ---
+WINDOWED_VIEW_THRESHOLD_MB = 64  # このサイズ以上のメモは閲覧モード（必要な行だけ読み込む）で開く
+WINDOWED_VIEW_WINDOW_LINES = 3000  # 閲覧モードでドキュメントに置く行数
+STREAM_CREDIT_WINDOW = 8  # ストリーミング読み込みで受信側が未処理のまま溜められるチャンク数
+PROGRESS_UPDATES_PER_SECOND = 10  # 読み込み・保存の進捗通知の最大頻度
+CONTENT_CACHE_BUDGET_MB = 32  # 読み込んだメモ内容を再利用するキャッシュの上限
+PREFETCH_MAX_CANDIDATES = 4  # 一度に先読みするメモの数
+PREFETCH_DELAY_MS = 150  # メモを開いてから先読みを始めるまでの待ち時間（開いたメモの読み込みを優先）
+PREFETCH_MAX_FILE_SIZE = 1024 * 1024  # これより大きいメモは先読みしない（ストリーミング読み込みの対象）
+HIBERNATION_MEMORY_BUDGET_MB = 16  # 非アクティブなタブの圧縮済み内容をメモリに置く上限（超えた分は一時ファイルへ）
+HIBERNATION_MODES = ('swap', 'compress')  # swap: ドキュメントを切り離して保持（Undo履歴も残る）/ compress: テキストを圧縮して退避
+HIBERNATION_MODE = 'swap'  # 非アクティブなタブの休止方式の既定値
+TAB_MEMORY_BUDGET_MB = 256  # すべてのタブのドキュメントに使うメモリの上限（超えたら最も長く表示していないタブから追い出す）
+DOCUMENT_BLOCK_OVERHEAD_BYTES = 128  # ドキュメントのメモリ概算で1ブロック（行）あたりに見込む管理領域
+MEMORY_GOVERNOR_HISTORY = 20  # ステータス表示用に記録する追い出しの判断の件数
+
+# --- 自動保存 ---
+AUTOSAVE_DEBOUNCE_MS = 2000  # 入力が止まってから保存するまでの待ち時間
+AUTOSAVE_MAX_LATENCY_MS = 10000  # 入力が続いていても、変更をこれ以上未保存のままにしない
+SHUTDOWN_FLUSH_DEADLINE_MS = 3000  # 終了時に未保存のメモの書き込み完了を待つ最大時間
+
+# --- 全文検索 ---
+SEARCH_INDEX_FILE_NAME = "PyMemoNoteData.search.sqlite3"  # 検索索引（PyMemoNoteDataと同じ場所に置く）
+SEARCH_INDEX_BUILD_DELAY_MS = 2000  # 起動してから索引の更新を始めるまでの待ち時間
+SEARCH_INDEX_MAX_FILE_SIZE = 8 * 1024 * 1024  # これより大きいメモは本文を索引しない（ファイル名だけで検索できる）
+SEARCH_INDEX_BATCH_SIZE = 1000  # 索引の作成で1トランザクションにまとめるメモの数
+SEARCH_INDEX_PARALLEL_MIN_FILES = 1000  # 読み直すメモがこれ以上あるときは複数のプロセスで読む（初回の作成など）
+SEARCH_INDEX_SCAN_PROCESSES = 8  # メモを読むプロセス数の上限（CPUのコア数-1まで）
+SEARCH_INDEX_SCAN_CHUNK = 128  # 1つのプロセスに一度に渡すメモの数
+SEARCH_INDEX_UPDATE_DELAY_MS = 300  # 保存・名前変更などの通知をまとめて索引に反映するまでの待ち時間
+SEARCH_RESULT_LIMIT = 100  # 検索結果に表示する最大件数
+SEARCH_SNIPPET_TOKENS = 24  # 検索結果の抜粋の長さ（trigramでは文字数にほぼ等しい）
+SEARCH_DEBOUNCE_MS = 150  # 検索語の入力が止まってから検索するまでの待ち時間
+
+# --- クイックオープン ---
+QUICK_OPEN_RESULT_LIMIT = 50  # クイックオープンに表示する最大件数
+QUICK_OPEN_MAX_CANDIDATES = 500  # 順位を付ける候補の上限（これを超える場合は短い名前から選ぶ）
+QUICK_OPEN_MAX_FILTERED = 5000  # 1文字ずつ照合して絞り込む候補の上限（1文字の語・タイプミス。超える場合は短い名前から選ぶ）
+QUICK_OPEN_SCAN_REBUILD_CHANGES = 1024  # 1文字の語の検索用の文字列を作り直すまでに溜める追加・削除の数（メモ数の1/8の方が多ければそちら）
+
+# --- grep検索 ---
+GREP_THREADS = 4  # メモを読んで照合するスレッド数（一覧の走査に1本使う）
+GREP_CHUNK_FILES = 16  # 1つのタスクで照合するメモの数
+GREP_BLOCK_SIZE = 1024 * 1024  # 大きなメモを行の区切りで分けてデコード・照合するバイト数
+GREP_MAX_HITS_PER_FILE = 100  # 1つのメモから表示する一致した行の上限
+GREP_MAX_RESULTS = 1000  # 表示する一致した行の上限（達したら検索を打ち切る）
+GREP_CONTEXT_CHARS = 40  # 一致した行の抜粋で、一致箇所の前後に表示する文字数
+
+# --- 検索と置換（開いているメモ） ---
+FIND_THREADS = 2  # 検索・置換に使うスレッド数（取り消した検索の中断を待たずに次の検索を始められるよう2本）
+FIND_ABORT_CHECK_MATCHES = 4096  # 一致をこの数だけ集めるごとに取り消されていないか確かめる
+FIND_HIGHLIGHT_LIMIT = 2000  # 表示範囲で強調表示する一致の上限
+
+# --- テキスト変換（タブ・改行の削除、行の並べ替えなど） ---
+TRANSFORM_CHUNK_CHARS = 1024 * 1024  # 行の区切りでこの文字数ずつに分けて変換する（取り消し・進み具合の単位）
+TRANSFORM_PROGRESS_DELAY_MS = 500  # 変換にこれより長くかかる場合に進み具合を表示する
+
 # --- 機能フラグ ---
 # デバッグ出力設定
 ENABLE_DEBUG_OUTPUT = False  # 本番環境では False に設定
@@ -1,14 +1,35 @@
 # -*- coding: utf-8 -*-
 
+import codecs
+import hashlib
+import io
+import json
+import mmap
+import operator
 import os
 import shutil
+import stat
+import struct
+import sys
+import tempfile
 import traceback
 import time
+from array import array
+from collections import OrderedDict, deque
+from itertools import accumulate, islice, repeat
 from pathlib import Path
 from PyQt6.QtWidgets import QMessageBox, QInputDialog, QLineEdit
-from PyQt6.QtCore import QThread, QObject, pyqtSignal, QTimer, QMutex, QMutexLocker
+from PyQt6.QtCore import (
+    Qt, QThread, QObject, pyqtSignal, QTimer, QMutex, QMutexLocker,
+    QWaitCondition, QThreadPool, QRunnable
+)
 
-from .constants import APP_DATA_BASE_DIR, ENABLE_DEBUG_OUTPUT, ENABLE_ASYNC_PERFORMANCE_MONITORING
+from .constants import (
+    APP_DATA_BASE_DIR, ENABLE_DEBUG_OUTPUT, ENABLE_ASYNC_PERFORMANCE_MONITORING, WINDOWED_VIEW_THRESHOLD_MB,
+    AUTOSAVE_DEBOUNCE_MS, AUTOSAVE_MAX_LATENCY_MS, SHUTDOWN_FLUSH_DEADLINE_MS,
+    STREAM_CREDIT_WINDOW, PROGRESS_UPDATES_PER_SECOND, CONTENT_CACHE_BUDGET_MB,
+    PREFETCH_MAX_CANDIDATES, PREFETCH_DELAY_MS, PREFETCH_MAX_FILE_SIZE
+)
 from . import strings
 from .interfaces import IFileSystemManager
 
@@ -89,12 +110,277 @@ def validate_windows_filename(filename):
     
     return True, ""
 
+def content_digest(data):
+    """保存内容の比較に使うダイジェストを計算"""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def encode_memo_content(content):
+    """
+    メモの文字列を保存するバイト列にエンコード
+    
+    テキストモードで encoding='utf-8-sig' を指定して書き込んだ場合と同じく、BOM付きUTF-8にし、
+    改行はOSの改行（Windowsなら\r\n）にする。
+    """
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    return content.encode('utf-8-sig')
+
+ENCODING_PROBE_SIZE = 64 * 1024  # エンコーディング推定で調べる先頭バイト数
+ENCODING_CACHE_MAX_ENTRIES = 10000
+
+def detect_memo_encoding(prefix):
+    """
+    ファイル先頭のバイト列からエンコーディングを推定
+    
+    BOM付き・UTF-8として妥当なら 'utf-8-sig'（BOMなしUTF-8もそのまま読める）、それ以外は 'cp932'。
+    末尾で切れたマルチバイト文字はエラーにしない。
+    """
+    if prefix.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp932'
+
+def decode_memo_bytes(data, encoding=None):
+    """
+    ファイルのバイト列をメモの文字列にデコード
+    
+    エンコーディングが未指定なら先頭部分から推定し、1回だけデコードする。
+    改行はテキストモード読み込みと同様に\nへ統一する。
+    
+    Returns:
+        tuple: (content, encoding)
+    """
+    if encoding is None:
+        encoding = detect_memo_encoding(data[:ENCODING_PROBE_SIZE])
+    if encoding == 'cp932':
+        content = data.decode('cp932', errors='replace')
+    else:
+        try:
+            content = data.decode(encoding)
+        except UnicodeDecodeError:
+            # 推定範囲より後ろに不正なバイトがあった場合のみCP932で読み直す
+            encoding = 'cp932'
+            content = data.decode('cp932', errors='replace')
+    return content.replace('\r\n', '\n').replace('\r', '\n'), encoding
+
+LINE_SCAN_BLOCK_SIZE = 1024 * 1024  # 行索引作成時に一度に調べるバイト数
+
+def append_line_starts(offsets, block, base):
+    """
+    block（ファイル上の位置base から始まるバイト列）内の各改行の直後の位置をoffsetsに追加
+    
+    1行ごとにfindするとPythonのループが行数分回るため、splitした各行の長さを累積して求める。
+    \n はCP932の2バイト目にも現れないため、バイト単位で探してよい。
+    """
+    pieces = block.split(b'\n')
+    line_starts = accumulate(map(operator.add, map(len, pieces[:-1]), repeat(1)), initial=base)
+    offsets.extend(islice(line_starts, 1, None))
+
+def find_line_offsets(buffer, should_abort=None, is_complete=True):
+    """
+    バイト列（mmap可）の行頭オフセットを列挙
+    
+    戻り値の末尾は最終行の終端位置なので、行数は len(offsets) - 1、
+    i行目（0始まり）は buffer[offsets[i]:offsets[i + 1]] になる。
+    is_complete=False（ファイルの先頭部分だけ）の場合は改行で終わる完全な行だけを数える。
+    
+    Returns:
+        array or None: 行頭オフセットの array('Q')。should_abort()がTrueを返した場合None
+    """
+    total_size = len(buffer)
+    offsets = array('Q', [0])
+    for base in range(0, total_size, LINE_SCAN_BLOCK_SIZE):
+        if should_abort and should_abort():
+            return None
+        append_line_starts(offsets, buffer[base:base + LINE_SCAN_BLOCK_SIZE], base)
+    if is_complete and offsets[-1] != total_size:
+        # 改行で終わらない最終行
+        offsets.append(total_size)
+    return offsets
+
+class ProgressThrottle:
+    """進捗通知を一定の頻度以下に間引く（最後の通知は必ず通す）"""
+    
+    def __init__(self, updates_per_second=PROGRESS_UPDATES_PER_SECOND):
+        self.interval = 1.0 / updates_per_second
+        self._last_time = None
+    
+    def ready(self, current, total):
+        """今回の進捗を通知すべきか"""
+        now = time.monotonic()
+        if current < total and self._last_time is not None and now - self._last_time < self.interval:
+            return False
+        self._last_time = now
+        return True
+
+def atomic_write_bytes(file_path, data, chunk_size=None, progress_callback=None):
+    """
+    同じディレクトリの一時ファイルに書き込み、fsync後にos.replaceで差し替える
+    
+    既存ファイルは読み直さないため、書き込み量は新しい内容のサイズだけになる。
+    途中で失敗しても元のファイルはそのまま残る。
+    
+    Args:
+        file_path (str): 保存先のパス
+        data (bytes): 書き込む内容
+        chunk_size (int): 指定した場合はこのサイズずつ書き込み、progress_callbackを呼ぶ
+                          （memoryviewのスライスで書き込むため、チャンクごとのコピーは発生しない）
+        progress_callback (callable): progress_callback(written_bytes, total_bytes)
+    """
+    dir_path = os.path.dirname(file_path) or "."
+    os.makedirs(dir_path, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=dir_path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            total_bytes = len(data)
+            if chunk_size and total_bytes > chunk_size:
+                with memoryview(data) as view:
+                    for current_pos in range(0, total_bytes, chunk_size):
+                        end_pos = min(current_pos + chunk_size, total_bytes)
+                        f.write(view[current_pos:end_pos])
+                        if progress_callback:
+                            progress_callback(end_pos, total_bytes)
+            else:
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstempは0600で作るため、既存ファイルの権限を引き継ぐ
+        try:
+            os.chmod(temp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
 BASE_MEMO_DIR = get_safe_path(APP_DATA_BASE_DIR, "PyMemoNoteData")
+ENCODING_CACHE_FILE = get_safe_path(APP_DATA_BASE_DIR, "encoding_cache.json")
+LINE_INDEX_CACHE_DIR = get_safe_path(APP_DATA_BASE_DIR, "line_index_cache")
+LINE_INDEX_CACHE_MAX_FILES = 200
+LINE_INDEX_MEMORY_ENTRIES = 4
+LINE_INDEX_HEADER = struct.Struct('<QQQ')  # size, mtime_ns, オフセット数
+
+class MemoContentCache:
+    """デコード済みのメモ内容のLRUキャッシュ（合計サイズの上限つき）
+    
+    サイズと更新時刻が一致する場合のみ内容を返す。プールスレッドから使うためQMutexで保護する。
+    """
+    
+    def __init__(self, budget_bytes=CONTENT_CACHE_BUDGET_MB * 1024 * 1024):
+        self.mutex = QMutex()
+        self.budget_bytes = budget_bytes
+        self._entries = OrderedDict()  # 正規化パス -> (size, mtime_ns, content, is_cp932_fallback, cost)
+        self._total_bytes = 0
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+    
+    def get(self, path_key, file_stat):
+        """キャッシュ済みの内容を取得
+        
+        Returns:
+            tuple or None: (content, is_cp932_fallback)。ないか古い場合はNone
+        """
+        with QMutexLocker(self.mutex):
+            entry = self._entries.get(path_key)
+            if entry and entry[0] == file_stat.st_size and entry[1] == file_stat.st_mtime_ns:
+                self._entries.move_to_end(path_key)
+                self._stats['hits'] += 1
+                return entry[2], entry[3]
+            if entry:
+                # 他のプログラムで更新された
+                self._remove(path_key)
+            self._stats['misses'] += 1
+            return None
+    
+    def contains(self, path_key, file_stat):
+        """有効な内容があるか（統計・使用順には影響しない）"""
+        with QMutexLocker(self.mutex):
+            entry = self._entries.get(path_key)
+        return bool(entry) and entry[0] == file_stat.st_size and entry[1] == file_stat.st_mtime_ns
+    
+    def put(self, path_key, file_stat, content, is_cp932_fallback=False):
+        """内容を記録（上限を超えた分は使われていない順に追い出す）"""
+        cost = sys.getsizeof(content)
+        with QMutexLocker(self.mutex):
+            self._remove(path_key)
+            if cost > self.budget_bytes:
+                return
+            self._entries[path_key] = (file_stat.st_size, file_stat.st_mtime_ns, content, is_cp932_fallback, cost)
+            self._total_bytes += cost
+            self._evict()
+    
+    def discard(self, path_key):
+        """パス（フォルダの場合は配下すべて）の内容を破棄"""
+        prefix = path_key.rstrip(os.sep) + os.sep
+        with QMutexLocker(self.mutex):
+            for key in [k for k in self._entries if k == path_key or k.startswith(prefix)]:
+                self._remove(key)
+    
+    def set_budget(self, budget_bytes):
+        """上限を変更（0でキャッシュを無効化）"""
+        with QMutexLocker(self.mutex):
+            self.budget_bytes = budget_bytes
+            self._evict()
+    
+    def get_statistics(self):
+        """統計を取得
+        
+        Returns:
+            dict: hits, misses, evictions, entries, bytes, budget_bytes, hit_rate
+        """
+        with QMutexLocker(self.mutex):
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._total_bytes
+            stats['budget_bytes'] = self.budget_bytes
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+    
+    def _remove(self, path_key):
+        entry = self._entries.pop(path_key, None)
+        if entry:
+            self._total_bytes -= entry[4]
+    
+    def _evict(self):
+        while self._total_bytes > self.budget_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry[4]
+            self._stats['evictions'] += 1
 
 # --- 非同期ファイルI/O操作クラス ---
 
+class FileIOTask(QRunnable):
+    """スレッドプール上で1件のファイル操作を実行するタスク"""
+    
+    def __init__(self, worker, operation_id, kind, file_path, func, args):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.worker = worker
+        self.operation_id = operation_id
+        self.kind = kind
+        self.file_path = file_path
+        self.path_key = normalize_path_for_comparison(file_path)
+        self.func = func
+        self.args = args
+    
+    def run(self):
+        self.worker._run_task(self)
+
+
 class FileIOWorker(QObject):
-    """ファイルI/O操作を非同期で実行するワーカークラス（完全版）"""
+    """ファイルI/O操作をスレッドプールで非同期実行するワーカークラス
+    
+    同一パスへの操作は投入順に1件ずつ実行される（保存直後の読み込みが
+    古い内容を返さないように）。異なるパスの操作は並列に実行される。
+    結果はシグナルで返すため、受信側はQueuedConnectionで接続すること。
+    """
     
     # シグナル定義（出力用）
     content_loaded = pyqtSignal(str, str)  # file_path, content
@@ -105,22 +391,71 @@ class FileIOWorker(QObject):
     progress_updated = pyqtSignal(str, int, int)  # file_path, current, total
     error_occurred = pyqtSignal(str, str, str)  # operation, file_path, error_message
     
+    # 操作単位のシグナル（operation_idでコールバックを引き当てるため）
+    operation_chunk = pyqtSignal(str, str, int, int)  # operation_id, chunk_content, current_pos, total_size
+    operation_finished = pyqtSignal(str, object)  # operation_id, result
+    operation_canceled = pyqtSignal(str)  # operation_id
+    save_latency = pyqtSignal(str, int, float)  # file_path, written_bytes, elapsed_seconds
+    
     # スロット定義（入力用）
     load_requested = pyqtSignal(str)  # file_path
     save_requested = pyqtSignal(str, str)  # file_path, content
     streaming_requested = pyqtSignal(str)  # file_path
     
-    def __init__(self):
+    # 操作種別（operation_idの接頭辞）
+    OP_LOAD = "async_load"
+    OP_SAVE = "async_save"
+    OP_STREAM = "stream_load"
+    OP_CREATE = "async_create"
+    OP_INDEX = "line_index"
+    OP_PREFETCH = "prefetch"
+    
+    # スレッドプールでの優先度（先読みは他の操作より後に実行する）
+    TASK_PRIORITIES = {OP_PREFETCH: -1}
+    
+    def __init__(self, max_threads=4):
         super().__init__()
         self.mutex = QMutex()
+        self.idle_condition = QWaitCondition()
+        self.credit_condition = QWaitCondition()
         self.chunk_size = 64 * 1024  # 64KB チャンクサイズ
         self.large_file_threshold = 512 * 1024  # 512KB以上でストリーミング読み込み（改善）
         self.max_chunk_size = 256 * 1024  # 最大チャンクサイズ（256KB）
         self.min_chunk_size = 16 * 1024   # 最小チャンクサイズ（16KB）
         
-        # 進行中のファイル操作を管理
-        self._active_operations = set()
+        # I/O専用のスレッドプール（グローバルプールはGUI側の処理と共有しない）
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(max_threads)
+        
+        # 進行中（実行中・待機中）のファイル操作を管理
+        self._active_operations = {}  # operation_id -> FileIOTask
         self._canceled_operations = set()
+        self._path_queues = {}  # 正規化パス -> 待機中タスクのdeque（キーがある間はそのパスの操作が実行中）
+        self._operation_seq = 0
+        
+        # ストリーミング読み込みのフロー制御（operation_id -> 残りクレジット）
+        # チャンクを送るたびに1減り、受信側のacknowledge_chunk()で1戻る。0の間は送信を待つ
+        self._stream_credits = {}
+        self._credit_bypass = 0  # 完了を待っている呼び出し元の数（その間は待たずに送る）
+        
+        # 保存パフォーマンス統計（保存1件ごとの所要時間）
+        self._save_stats = {'count': 0, 'skipped': 0, 'bytes': 0, 'total_time': 0.0, 'last_time': 0.0, 'max_time': 0.0}
+        
+        # ディスク上の内容のダイジェスト（正規化パス -> (size, mtime_ns, digest)）
+        # 読み込み時・保存時に記録し、内容が変わっていない保存を省略する
+        self._content_digests = {}
+        
+        # 判定済みエンコーディング（正規化パス -> (size, mtime_ns, encoding)）
+        # サイズと更新時刻が一致する間は推定を省略する
+        self._encoding_cache = {}
+        
+        # 行頭オフセット索引（正規化パス -> (size, mtime_ns, array('Q'))、最近使った数件だけ保持）
+        # line_index_dirを設定するとファイルにも保存し、次回以降の作成を省略する
+        self._line_indexes = OrderedDict()
+        self.line_index_dir = None
+        
+        # デコード済みの内容（メモを切り替えるたびに読み直さないため）
+        self.content_cache = MemoContentCache()
         
         # 停止フラグ（重要な追加）
         self._stop_requested = False
@@ -134,12 +469,10 @@ class FileIOWorker(QObject):
     finished = pyqtSignal()  # 停止完了シグナル
     
     def request_stop(self):
-        """停止要求"""
+        """停止要求（読み込み系はキャンセルし、保存は完了まで実行する）"""
         print("DEBUG: FileIOWorker 停止要求を受信")
         self._stop_requested = True
-        # 進行中の操作をキャンセル
-        self._canceled_operations.update(self._active_operations)
-        # finished.emit()は実際に停止した時に呼ぶ（ここでは呼ばない）
+        self.cancel_all_operations()
         
         # アクティブな操作がない場合は即座に終了
         if not self._active_operations:
@@ -152,33 +485,260 @@ class FileIOWorker(QObject):
             print("DEBUG: 全ての操作が完了、finished信号を発火")
             self.finished.emit()
     
+    # --- スケジューリング ---
+    
+    def submit(self, kind, file_path, func, *args):
+        """ファイル操作をスレッドプールに投入する
+        
+        Args:
+            kind (str): 操作種別（OP_LOAD など）
+            file_path (str): 対象ファイルのパス
+            func (callable): func(operation_id, file_path, *args) の形で呼ばれる処理本体
+            
+        Returns:
+            str: operation_id
+        """
+        with QMutexLocker(self.mutex):
+            self._operation_seq += 1
+            operation_id = f"{kind}_{self._operation_seq}_{file_path}"
+            task = FileIOTask(self, operation_id, kind, file_path, func, args)
+            self._active_operations[operation_id] = task
+            queue = self._path_queues.get(task.path_key)
+            if queue is not None:
+                # 同じパスの操作が実行中なので後ろに並べる
+                queue.append(task)
+                return operation_id
+            self._path_queues[task.path_key] = deque()
+        self.thread_pool.start(task, self.TASK_PRIORITIES.get(kind, 0))
+        return operation_id
+    
+    def _run_task(self, task):
+        """タスクを実行し、完了後に同じパスの次のタスクを起動（プールスレッド上で実行）"""
+        result = None
+        canceled = self.is_canceled(task.operation_id)
+        if not canceled:
+            try:
+                result = task.func(task.operation_id, task.file_path, *task.args)
+            except Exception as e:
+                print(f"!!! ERROR: ファイル操作で予期しないエラー: {e}\n{traceback.format_exc()}")
+                self.error_occurred.emit(task.kind, task.file_path, f"予期しないエラー: {str(e)}")
+            canceled = self.is_canceled(task.operation_id)
+        
+        next_task = None
+        with QMutexLocker(self.mutex):
+            self._active_operations.pop(task.operation_id, None)
+            self._canceled_operations.discard(task.operation_id)
+            queue = self._path_queues.get(task.path_key)
+            if queue:
+                next_task = queue.popleft()
+            else:
+                self._path_queues.pop(task.path_key, None)
+            self.idle_condition.wakeAll()
+        
+        if canceled:
+            self.operation_canceled.emit(task.operation_id)
+        else:
+            self.operation_finished.emit(task.operation_id, result)
+        
+        if next_task is not None:
+            self.thread_pool.start(next_task, self.TASK_PRIORITIES.get(next_task.kind, 0))
+        self._check_and_emit_finished()
+    
+    def is_canceled(self, operation_id):
+        """操作がキャンセルされているか"""
+        return operation_id in self._canceled_operations
+    
+    def cancel_operation(self, file_path):
+        """ファイルの読み込み操作をキャンセル
+        
+        保存はユーザーデータを失わないようキャンセル対象にしない。
+        """
+        path_key = normalize_path_for_comparison(file_path)
+        with QMutexLocker(self.mutex):
+            for operation_id, task in self._active_operations.items():
+                if task.path_key == path_key and task.kind != self.OP_SAVE:
+                    self._canceled_operations.add(operation_id)
+            self.credit_condition.wakeAll()
+    
+    def cancel_all_operations(self):
+        """すべての読み込み操作をキャンセル（保存は継続）"""
+        with QMutexLocker(self.mutex):
+            for operation_id, task in self._active_operations.items():
+                if task.kind != self.OP_SAVE:
+                    self._canceled_operations.add(operation_id)
+            self.credit_condition.wakeAll()
+    
+    def cancel_prefetch(self):
+        """先読み操作をすべてキャンセル"""
+        with QMutexLocker(self.mutex):
+            for operation_id, task in self._active_operations.items():
+                if task.kind == self.OP_PREFETCH:
+                    self._canceled_operations.add(operation_id)
+    
+    def get_active_operations(self):
+        """実行中・待機中の操作IDを取得"""
+        with QMutexLocker(self.mutex):
+            return set(self._active_operations)
+    
+    def wait_for_path(self, file_path, timeout_ms=5000):
+        """指定パスの操作がすべて完了するまで待機
+        
+        Returns:
+            bool: タイムアウト前に完了した場合True
+        """
+        path_key = normalize_path_for_comparison(file_path)
+        deadline = time.monotonic() + timeout_ms / 1000
+        self._suspend_flow_control(True)
+        try:
+            with QMutexLocker(self.mutex):
+                while path_key in self._path_queues:
+                    remaining_ms = int((deadline - time.monotonic()) * 1000)
+                    if remaining_ms <= 0:
+                        return False
+                    self.idle_condition.wait(self.mutex, remaining_ms)
+            return True
+        finally:
+            self._suspend_flow_control(False)
+    
+    def wait_for_done(self, timeout_ms=5000):
+        """すべての操作が完了するまで待機"""
+        self._suspend_flow_control(True)
+        try:
+            return self.thread_pool.waitForDone(timeout_ms)
+        finally:
+            self._suspend_flow_control(False)
+    
+    # --- フロー制御 ---
+    
+    def acknowledge_chunk(self, operation_id):
+        """受信側がチャンクを処理し終えたことを通知（送信クレジットを1戻す）"""
+        with QMutexLocker(self.mutex):
+            if operation_id in self._stream_credits:
+                self._stream_credits[operation_id] += 1
+                self.credit_condition.wakeAll()
+    
+    def _suspend_flow_control(self, suspend):
+        """完了待ちの間はクレジットを待たずに送る
+        
+        受信側（GUIスレッド）が完了を待ってブロックしている間は確認応答が返らないため。
+        """
+        with QMutexLocker(self.mutex):
+            self._credit_bypass += 1 if suspend else -1
+            self.credit_condition.wakeAll()
+    
+    def _acquire_credit(self, operation_id):
+        """チャンク1つ分の送信クレジットを取得（なければ受信側の確認応答まで待つ）
+        
+        Returns:
+            bool: 送信してよい場合True、待機中に中断された場合False
+        """
+        with QMutexLocker(self.mutex):
+            while self._stream_credits.get(operation_id, 1) <= 0 and not self._credit_bypass:
+                if self._should_abort(operation_id):
+                    return False
+                self.credit_condition.wait(self.mutex, 100)
+            if operation_id in self._stream_credits:
+                self._stream_credits[operation_id] -= 1
+        return True
+    
+    # --- 投入用の公開メソッド ---
+    
     def load_file_async(self, file_path):
-        """ファイルを非同期で読み込み（パフォーマンス監視付き）"""
+        """ファイルの非同期読み込みを投入"""
+        return self.submit(self.OP_LOAD, file_path, self._load_file)
+    
+    def save_file_async(self, file_path, content):
+        """ファイルの非同期保存を投入"""
+        return self.submit(self.OP_SAVE, file_path, self._save_file, content)
+    
+    def load_file_streaming(self, file_path, credit_window=None):
+        """ファイルのストリーミング読み込みを投入
+        
+        Args:
+            credit_window (int): 受信側が確認応答（acknowledge_chunk）せずに溜められるチャンク数。
+                                 Noneの場合はフロー制御なしで送り続ける
+        """
+        return self.submit(self.OP_STREAM, file_path, self._load_file_streaming, credit_window)
+    
+    def save_files_and_wait(self, documents, timeout_ms=5000):
+        """複数のファイルを並列に保存し、期限まで完了を待って結果を返す
+        
+        結果はプールスレッドからミューテックス越しに受け取るため、イベントループを回さない
+        （終了処理中にほかのスロットが動かないように）。
+        
+        Args:
+            documents (dict): パス -> 保存する内容
+            timeout_ms (int): 完了を待つ最大時間（ミリ秒）
+            
+        Returns:
+            dict: パス -> 保存結果（期限内に完了しなかったものはNone）
+        """
+        results = dict.fromkeys(documents)
+        results_mutex = QMutex()
+        
+        def save_and_record(operation_id, file_path, content):
+            # 失敗は呼び出し側がまとめて通知するため、エラーダイアログ用のシグナルは出さない
+            success = False
+            try:
+                self.write_file(file_path, content)
+                success = True
+            except OSError as e:
+                print(f"!!! ERROR: FileIOWorker - 保存に失敗しました: {file_path}: {e}")
+            finally:
+                with QMutexLocker(results_mutex):
+                    results[file_path] = success
+            return success
+        
+        for file_path, content in documents.items():
+            self.submit(self.OP_SAVE, file_path, save_and_record, content)
+        
+        deadline = time.monotonic() + timeout_ms / 1000
+        for file_path in documents:
+            remaining_ms = max(0, int((deadline - time.monotonic()) * 1000))
+            self.wait_for_path(file_path, remaining_ms)
+        
+        # 期限後に完了したタスクが書き込んでも返した結果は変わらないようコピーを返す
+        with QMutexLocker(results_mutex):
+            return dict(results)
+    
+    def create_file_async(self, file_path):
+        """ファイルの非同期作成を投入"""
+        return self.submit(self.OP_CREATE, file_path, self._create_file)
+    
+    def build_line_index_async(self, file_path):
+        """行頭オフセットの索引作成を投入"""
+        return self.submit(self.OP_INDEX, file_path, self._build_line_index)
+    
+    def prefetch_file_async(self, file_path):
+        """内容キャッシュへの先読みを低優先度で投入"""
+        return self.submit(self.OP_PREFETCH, file_path, self._prefetch_file)
+    
+    # --- 処理本体（プールスレッド上で実行） ---
+    
+    def _load_file(self, operation_id, file_path):
+        """ファイルを読み込み（パフォーマンス監視付き）
+        
+        Returns:
+            str or None: 読み込んだ内容。エラー時はNone
+        """
         start_time = time.time() if ENABLE_ASYNC_PERFORMANCE_MONITORING else None
         
         try:
-            content = ""
-            try:
-                with open(file_path, 'r', encoding='utf-8-sig') as f:
-                    content = f.read()
-            except UnicodeDecodeError:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                except UnicodeDecodeError:
-                    with open(file_path, 'r', encoding='cp932', errors='replace') as f:
-                        content = f.read()
-                    # エンコーディング警告は別途処理
-                    self.error_occurred.emit("encoding_warning", file_path, "CP932として読み込まれました")
+            content, is_cp932_fallback = self.read_file(file_path)
+            if is_cp932_fallback:
+                # エンコーディング警告は別途処理
+                self.error_occurred.emit("encoding_warning", file_path, "CP932として読み込まれました")
             
             # パフォーマンス監視
             if ENABLE_ASYNC_PERFORMANCE_MONITORING and start_time:
                 elapsed_time = time.time() - start_time
-                file_size = len(content.encode('utf-8'))
+                # 表示用のサイズのために内容をエンコードし直さない
+                file_size = os.path.getsize(file_path)
                 print(f"⚡ 非同期読み込み完了: {os.path.basename(file_path)} "
                       f"({file_size:,} bytes, {elapsed_time:.3f}s)")
             
             self.content_loaded.emit(file_path, content)
+            return content
             
         except FileNotFoundError:
             self.error_occurred.emit("load", file_path, "ファイルが見つかりません")
@@ -186,129 +746,245 @@ class FileIOWorker(QObject):
             self.error_occurred.emit("load", file_path, "ファイルを読み込む権限がありません")
         except Exception as e:
             self.error_occurred.emit("load", file_path, f"読み込みエラー: {str(e)}")
+        return None
     
-    def save_file_async(self, file_path, content):
-        """ファイルを非同期で保存（強化版）"""
-        operation_id = f"async_save_{file_path}"
+    def read_file(self, file_path):
+        """読み込みパイプライン本体（同期・非同期共通）
         
-        # キャンセルチェックと操作登録のみロック
+        サイズと更新時刻が一致する内容がキャッシュにあれば、os.stat 1回だけで返す。
+        なければファイルを1回だけ読み、内容のダイジェストを記録する。
+        エラーは呼び出し側で処理するため例外をそのまま送出する。
+        
+        Returns:
+            tuple: (content, is_cp932_fallback)
+        """
+        path_key = normalize_path_for_comparison(file_path)
+        cached = self.content_cache.get(path_key, os.stat(file_path))
+        if cached is not None:
+            return cached
+        return self._read_into_cache(path_key, file_path)
+    
+    def _read_into_cache(self, path_key, file_path):
+        """ファイルを読んでデコードし、内容キャッシュに記録"""
+        with open(file_path, 'rb') as f:
+            file_stat = os.fstat(f.fileno())
+            data = f.read()
+        self._store_digest(file_path, file_stat, content_digest(data))
+        content, encoding = decode_memo_bytes(data, self._cached_encoding(file_path, file_stat))
+        self._store_encoding(file_path, file_stat, encoding)
+        self.content_cache.put(path_key, file_stat, content, encoding == 'cp932')
+        return content, encoding == 'cp932'
+    
+    def detect_file_encoding(self, file_path, file_stat):
+        """ファイルのエンコーディングを取得（キャッシュになければ先頭部分だけ読んで推定）"""
+        encoding = self._cached_encoding(file_path, file_stat)
+        if encoding is None:
+            with open(file_path, 'rb') as f:
+                encoding = detect_memo_encoding(f.read(ENCODING_PROBE_SIZE))
+            self._store_encoding(file_path, file_stat, encoding)
+        return encoding
+    
+    def record_encoding(self, file_path, file_stat, encoding):
+        """途中で判定し直したエンコーディングを記録（以降の読み込みはこのエンコーディングで行う）"""
+        self._store_encoding(file_path, file_stat, encoding)
+    
+    def _cached_encoding(self, file_path, file_stat):
+        """サイズと更新時刻が一致する場合のみキャッシュ済みエンコーディングを返す"""
+        path_key = normalize_path_for_comparison(file_path)
         with QMutexLocker(self.mutex):
-            if operation_id in self._canceled_operations:
-                self._canceled_operations.discard(operation_id)
-                return
-            
-            self._active_operations.add(operation_id)
+            entry = self._encoding_cache.get(path_key)
+        if entry and entry[0] == file_stat.st_size and entry[1] == file_stat.st_mtime_ns:
+            return entry[2]
+        return None
+    
+    def _store_encoding(self, file_path, file_stat, encoding):
+        """判定したエンコーディングを記録"""
+        path_key = normalize_path_for_comparison(file_path)
+        with QMutexLocker(self.mutex):
+            # 最近使ったものが末尾に来るよう入れ直す
+            self._encoding_cache.pop(path_key, None)
+            self._encoding_cache[path_key] = (file_stat.st_size, file_stat.st_mtime_ns, encoding)
+    
+    def load_encoding_cache(self, cache_path):
+        """保存済みのエンコーディングキャッシュを読み込み（壊れていれば無視）"""
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries = {
+                path_key: (int(size), int(mtime_ns), encoding)
+                for path_key, (size, mtime_ns, encoding) in data.items()
+                if encoding in ('utf-8-sig', 'cp932')
+            }
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            print(f"WARNING: エンコーディングキャッシュを読み込めませんでした: {e}")
+            return
+        with QMutexLocker(self.mutex):
+            entries.update(self._encoding_cache)
+            self._encoding_cache = entries
+    
+    def save_encoding_cache(self, cache_path):
+        """エンコーディングキャッシュを保存（古いものから上限を超えた分は捨てる）"""
+        with QMutexLocker(self.mutex):
+            items = list(self._encoding_cache.items())[-ENCODING_CACHE_MAX_ENTRIES:]
+        data = json.dumps(dict(items), ensure_ascii=False, separators=(',', ':'))
+        try:
+            atomic_write_bytes(cache_path, data.encode('utf-8'))
+        except OSError as e:
+            print(f"WARNING: エンコーディングキャッシュを保存できませんでした: {e}")
+    
+    def write_file(self, file_path, content):
+        """保存パイプライン本体（同期・非同期共通）
+        
+        エンコード（BOM付きUTF-8、改行はOSの改行）は1回だけ行い、サイズ・ダイジェスト・書き込みはすべてその結果を使う。
+        一時ファイル経由で原子的に差し替える。
+        エンコード結果がディスク上の内容と同じ場合は書き込みを省略する。
+        エラーは呼び出し側で処理するため例外をそのまま送出する。
+        
+        Returns:
+            tuple: (written_bytes, elapsed_seconds, skipped)
+        """
+        start_time = time.perf_counter()
+        content_bytes = encode_memo_content(content)
+        new_digest = content_digest(content_bytes)
+        if self._matches_disk(file_path, content_bytes, new_digest):
+            with QMutexLocker(self.mutex):
+                self._save_stats['skipped'] += 1
+            return 0, time.perf_counter() - start_time, True
+        
+        if len(content_bytes) > self.large_file_threshold:
+            self._save_file_chunked(file_path, content_bytes)
+        else:
+            atomic_write_bytes(file_path, content_bytes)
+        file_stat = os.stat(file_path)
+        self._store_digest(file_path, file_stat, new_digest)
+        self._store_encoding(file_path, file_stat, 'utf-8-sig')
+        # 書き込んだ内容をそのままキャッシュして、次の読み込みでファイルを読まない
+        self.content_cache.put(normalize_path_for_comparison(file_path), file_stat, content)
+        elapsed_time = time.perf_counter() - start_time
+        
+        self._record_save(len(content_bytes), elapsed_time)
+        self.save_latency.emit(file_path, len(content_bytes), elapsed_time)
+        return len(content_bytes), elapsed_time, False
+    
+    def _store_digest(self, file_path, file_stat, digest):
+        """ディスク上の内容のダイジェストを記録"""
+        path_key = normalize_path_for_comparison(file_path)
+        with QMutexLocker(self.mutex):
+            self._content_digests[path_key] = (file_stat.st_size, file_stat.st_mtime_ns, digest)
+    
+    def _matches_disk(self, file_path, content_bytes, new_digest):
+        """保存しようとしている内容がディスク上の内容と同じか判定"""
+        path_key = normalize_path_for_comparison(file_path)
+        with QMutexLocker(self.mutex):
+            entry = self._content_digests.get(path_key)
+        if entry is None:
+            return False
+        size, mtime_ns, digest = entry
+        if len(content_bytes) != size:
+            return False
         
+        # 他のプログラムで更新されていれば記録は使えない
         try:
-            start_time = time.time() if ENABLE_ASYNC_PERFORMANCE_MONITORING else None
-            
-            # ディレクトリ確認・作成
-            dir_path = os.path.dirname(file_path)
-            if not os.path.exists(dir_path):
-                os.makedirs(dir_path)
-            
-            # バックアップファイル作成（既存ファイルがある場合）
-            backup_path = None
-            if os.path.exists(file_path):
-                backup_path = file_path + ".backup"
-                try:
-                    shutil.copy2(file_path, backup_path)
-                except Exception as e:
-                    print(f"バックアップ作成に失敗: {e}")
-            
-            # 大容量ファイル用のチャンク保存
-            content_size = len(content.encode('utf-8'))
-            if content_size > self.large_file_threshold:
-                self._save_file_chunked(file_path, content, operation_id)
-            else:
-                # 通常の一括保存
-                with open(file_path, 'w', encoding='utf-8-sig') as f:
-                    f.write(content)
-            
-            # バックアップファイル削除
-            if backup_path and os.path.exists(backup_path):
-                try:
-                    os.remove(backup_path)
-                except Exception as e:
-                    print(f"バックアップファイル削除に失敗: {e}")
+            file_stat = os.stat(file_path)
+        except OSError:
+            return False
+        if file_stat.st_size != size or file_stat.st_mtime_ns != mtime_ns:
+            return False
+        return digest == new_digest
+    
+    def forget_path_records(self, path):
+        """パス（フォルダの場合は配下すべて）のダイジェスト・エンコーディング・行索引・内容の記録を破棄"""
+        path_key = normalize_path_for_comparison(path)
+        prefix = path_key.rstrip(os.sep) + os.sep
+        with QMutexLocker(self.mutex):
+            for records in (self._content_digests, self._encoding_cache, self._line_indexes):
+                for key in [k for k in records if k == path_key or k.startswith(prefix)]:
+                    del records[key]
+        self.content_cache.discard(path_key)
+    
+    def _record_save(self, written_bytes, elapsed_time):
+        """保存統計を更新"""
+        with QMutexLocker(self.mutex):
+            stats = self._save_stats
+            stats['count'] += 1
+            stats['bytes'] += written_bytes
+            stats['total_time'] += elapsed_time
+            stats['last_time'] = elapsed_time
+            stats['max_time'] = max(stats['max_time'], elapsed_time)
+    
+    def get_save_statistics(self):
+        """保存統計を取得
+        
+        Returns:
+            dict: count（書き込んだ件数）, skipped（変更なしで省略した件数）, bytes, last_ms, avg_ms, max_ms
+        """
+        with QMutexLocker(self.mutex):
+            stats = dict(self._save_stats)
+        count = stats['count']
+        return {
+            'count': count,
+            'skipped': stats['skipped'],
+            'bytes': stats['bytes'],
+            'last_ms': stats['last_time'] * 1000,
+            'avg_ms': (stats['total_time'] / count * 1000) if count else 0.0,
+            'max_ms': stats['max_time'] * 1000,
+        }
+    
+    def _save_file(self, operation_id, file_path, content):
+        """ファイルを保存（一時ファイル＋os.replaceによる原子的な差し替え）
+        
+        Returns:
+            bool: 保存成功フラグ
+        """
+        try:
+            content_size, elapsed_time, skipped = self.write_file(file_path, content)
             
             # パフォーマンス監視
-            if ENABLE_ASYNC_PERFORMANCE_MONITORING and start_time:
-                elapsed_time = time.time() - start_time
-                throughput = content_size / elapsed_time / 1024 / 1024  # MB/s
+            if ENABLE_ASYNC_PERFORMANCE_MONITORING and skipped:
+                print(f"💾 非同期保存省略（変更なし）: {os.path.basename(file_path)}")
+            elif ENABLE_ASYNC_PERFORMANCE_MONITORING:
+                throughput = content_size / max(elapsed_time, 1e-9) / 1024 / 1024  # MB/s
                 print(f"💾 非同期保存完了: {os.path.basename(file_path)} "
                       f"({content_size:,} bytes, {elapsed_time:.3f}s, {throughput:.2f}MB/s)")
             
             self.content_saved.emit(file_path, True)
-            
-            # アクティブ操作から削除（正常完了）
-            operation_id = f"async_save_{file_path}"
-            self._active_operations.discard(operation_id)
-            self._check_and_emit_finished()
+            return True
             
         except PermissionError:
-            # バックアップファイル復元
-            if backup_path and os.path.exists(backup_path):
-                try:
-                    shutil.move(backup_path, file_path)
-                except Exception:
-                    pass
             self.error_occurred.emit("save", file_path, "ファイルを保存する権限がありません")
             self.content_saved.emit(file_path, False)
         except OSError as e:
-            # バックアップファイル復元
-            if backup_path and os.path.exists(backup_path):
-                try:
-                    shutil.move(backup_path, file_path)
-                except Exception:
-                    pass
             self.error_occurred.emit("save", file_path, f"保存エラー: {str(e)}")
             self.content_saved.emit(file_path, False)
-        finally:
-            # 操作完了の登録もロック
-            with QMutexLocker(self.mutex):
-                self._active_operations.discard(operation_id)
-                # 停止要求がある場合の最終チェック
-                self._check_and_emit_finished()
-    
-    def _save_file_chunked(self, file_path, content, operation_id):
-        """大容量ファイルをチャンクに分けて保存（バイナリベース）"""
-        # コンテンツをUTF-8バイトデータに変換
-        content_bytes = content.encode('utf-8-sig')
-        total_bytes = len(content_bytes)
-        current_pos = 0
-        
-        with open(file_path, 'wb') as f:
-            while current_pos < total_bytes:
-                if operation_id in self._canceled_operations:
-                    self._canceled_operations.discard(operation_id)
-                    break
-                
-                end_pos = min(current_pos + self.chunk_size, total_bytes)
-                chunk_bytes = content_bytes[current_pos:end_pos]
-                f.write(chunk_bytes)
-                
-                current_pos = end_pos
+        return False
+    
+    def _save_file_chunked(self, file_path, content_bytes):
+        """大容量ファイルをチャンクに分けて保存（進捗通知付き）
+        
+        保存は途中で中断するとユーザーデータを失うため、キャンセル・停止要求では止めない。
+        """
+        throttle = ProgressThrottle()
+        
+        def on_progress(current_pos, total_bytes):
+            if throttle.ready(current_pos, total_bytes):
                 self.progress_updated.emit(file_path, current_pos, total_bytes)
-                
-                # 停止要求チェック
-                if self._stop_requested or QThread.currentThread().isInterruptionRequested():
-                    print("DEBUG: ファイル保存処理が中断されました")
-                    # アクティブ操作から削除
-                    operation_id = f"async_save_{file_path}"
-                    self._active_operations.discard(operation_id)
-                    self._check_and_emit_finished()
-                    return
-                
-                # UI応答性のため少し待機
-                QThread.msleep(1)
+        
+        atomic_write_bytes(file_path, content_bytes, self.chunk_size, on_progress)
     
-    def create_file_async(self, file_path):
-        """ファイルを非同期で作成"""
+    def _create_file(self, operation_id, file_path):
+        """ファイルを作成
+        
+        Returns:
+            bool: 作成成功フラグ
+        """
         try:
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write("")
+            self._store_digest(file_path, os.stat(file_path), content_digest(b""))
             self.file_created.emit(file_path, True)
+            return True
             
         except PermissionError:
             self.error_occurred.emit("create", file_path, "ファイルを作成する権限がありません")
@@ -316,6 +992,142 @@ class FileIOWorker(QObject):
         except OSError as e:
             self.error_occurred.emit("create", file_path, f"作成エラー: {str(e)}")
             self.file_created.emit(file_path, False)
+        return False
+    
+    def _prefetch_file(self, operation_id, file_path):
+        """メモを読み込んで内容キャッシュに載せる（通知はしない）
+        
+        Returns:
+            bool: キャッシュに載っている場合True
+        """
+        try:
+            file_stat = os.stat(file_path)
+            if file_stat.st_size > PREFETCH_MAX_FILE_SIZE:
+                return False
+            path_key = normalize_path_for_comparison(file_path)
+            if self.content_cache.contains(path_key, file_stat):
+                return True
+            if self._should_abort(operation_id):
+                return False
+            self._read_into_cache(path_key, file_path)
+            return True
+        except OSError:
+            # 先読みの失敗は実際に開いたときに報告されるので、ここでは無視する
+            return False
+    
+    def _build_line_index(self, operation_id, file_path):
+        """ファイル全体の行頭オフセットを作成
+        
+        Returns:
+            list or None: 行頭オフセット。中断・エラー時はNone
+        """
+        try:
+            start_time = time.time()
+            with open(file_path, 'rb') as f:
+                file_stat = os.fstat(f.fileno())
+                offsets = self.get_line_index(file_path, file_stat)
+                if offsets is not None:
+                    return offsets
+                if file_stat.st_size == 0:
+                    return array('Q', [0])
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    offsets = find_line_offsets(mm, should_abort=lambda: self._should_abort(operation_id))
+            if offsets is not None:
+                self._store_line_index(file_path, file_stat, offsets)
+                if ENABLE_ASYNC_PERFORMANCE_MONITORING:
+                    print(f"⚡ 行索引作成完了: {os.path.basename(file_path)} "
+                          f"({len(offsets) - 1:,} 行, {time.time() - start_time:.3f}s)")
+            return offsets
+        except FileNotFoundError:
+            self.error_occurred.emit("index", file_path, "ファイルが見つかりません")
+        except OSError as e:
+            self.error_occurred.emit("index", file_path, f"行索引作成エラー: {str(e)}")
+        return None
+    
+    def get_line_index(self, file_path, file_stat=None):
+        """サイズと更新時刻が一致する行索引を取得（メモリ → 保存済みファイルの順に探す）
+        
+        Returns:
+            array or None: 行頭オフセットの array('Q')。なければNone
+        """
+        try:
+            file_stat = file_stat or os.stat(file_path)
+        except OSError:
+            return None
+        path_key = normalize_path_for_comparison(file_path)
+        with QMutexLocker(self.mutex):
+            entry = self._line_indexes.get(path_key)
+            if entry and entry[0] == file_stat.st_size and entry[1] == file_stat.st_mtime_ns:
+                self._line_indexes.move_to_end(path_key)
+                return entry[2]
+        
+        offsets = self._read_line_index_file(path_key, file_stat)
+        if offsets is not None:
+            self._remember_line_index(path_key, file_stat, offsets)
+        return offsets
+    
+    def _store_line_index(self, file_path, file_stat, offsets):
+        """行索引をメモリに記録し、保存先があればファイルにも書き出す"""
+        path_key = normalize_path_for_comparison(file_path)
+        self._remember_line_index(path_key, file_stat, offsets)
+        self._write_line_index_file(path_key, file_stat, offsets)
+    
+    def _remember_line_index(self, path_key, file_stat, offsets):
+        with QMutexLocker(self.mutex):
+            self._line_indexes[path_key] = (file_stat.st_size, file_stat.st_mtime_ns, offsets)
+            self._line_indexes.move_to_end(path_key)
+            while len(self._line_indexes) > LINE_INDEX_MEMORY_ENTRIES:
+                self._line_indexes.popitem(last=False)
+    
+    def _line_index_file_path(self, path_key):
+        name = hashlib.blake2b(path_key.encode('utf-8'), digest_size=16).hexdigest()
+        return os.path.join(self.line_index_dir, f"{name}.lidx")
+    
+    def _read_line_index_file(self, path_key, file_stat):
+        """保存済みの行索引を読み込み（サイズ・更新時刻が一致しなければNone）"""
+        if not self.line_index_dir:
+            return None
+        try:
+            with open(self._line_index_file_path(path_key), 'rb') as f:
+                size, mtime_ns, count = LINE_INDEX_HEADER.unpack(f.read(LINE_INDEX_HEADER.size))
+                if size != file_stat.st_size or mtime_ns != file_stat.st_mtime_ns:
+                    return None
+                offsets = array('Q')
+                offsets.frombytes(f.read(count * offsets.itemsize))
+        except (OSError, struct.error, ValueError):
+            return None
+        if len(offsets) != count:
+            return None
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        return offsets
+    
+    def _write_line_index_file(self, path_key, file_stat, offsets):
+        """行索引をファイルに保存（保存先が未設定なら何もしない）"""
+        if not self.line_index_dir:
+            return
+        if sys.byteorder != 'little':
+            offsets = array('Q', offsets)
+            offsets.byteswap()
+        header = LINE_INDEX_HEADER.pack(file_stat.st_size, file_stat.st_mtime_ns, len(offsets))
+        try:
+            atomic_write_bytes(self._line_index_file_path(path_key), header + offsets.tobytes())
+            self._prune_line_index_files()
+        except OSError as e:
+            print(f"WARNING: 行索引を保存できませんでした: {e}")
+    
+    def _prune_line_index_files(self):
+        """保存済みの行索引が上限を超えたら古いものから削除"""
+        with os.scandir(self.line_index_dir) as entries:
+            index_files = [entry for entry in entries if entry.name.endswith('.lidx')]
+        if len(index_files) <= LINE_INDEX_CACHE_MAX_FILES:
+            return
+        index_files.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in index_files[:len(index_files) - LINE_INDEX_CACHE_MAX_FILES]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
     
     def _get_optimal_chunk_size(self, file_size):
         """ファイルサイズに応じた最適なチャンクサイズを計算"""
@@ -326,137 +1138,74 @@ class FileIOWorker(QObject):
         else:  # 10MB以上
             return self.max_chunk_size
     
-    def cancel_operation(self, file_path):
-        """ファイル操作のキャンセル"""
-        # 保存・読み込み両方の operation_id を追加
-        save_operation_id = f"async_save_{file_path}"
-        load_operation_id = f"stream_load_{file_path}"
-        
-        self._canceled_operations.add(file_path)  # 互換性のため
-        self._canceled_operations.add(save_operation_id)
-        self._canceled_operations.add(load_operation_id)
+    def _should_abort(self, operation_id):
+        """読み込みループを中断すべきか（キャンセル・停止要求）"""
+        return (self.is_canceled(operation_id) or self._stop_requested
+                or QThread.currentThread().isInterruptionRequested())
     
-    def load_file_streaming(self, file_path):
-        """大容量ファイルをストリーミングで読み込み（強化版）"""
-        operation_id = f"stream_load_{file_path}"
-        
-        # キャンセルチェックと操作登録のみロック
-        with QMutexLocker(self.mutex):
-            if operation_id in self._canceled_operations:
-                self._canceled_operations.discard(operation_id)
-                return
-            
-            self._active_operations.add(operation_id)
+    def _emit_chunk(self, operation_id, file_path, chunk, current_pos, total_size):
+        """チャンクを操作単位・ファイル単位の両方のシグナルで通知"""
+        self.operation_chunk.emit(operation_id, chunk, current_pos, total_size)
+        self.chunk_loaded.emit(file_path, chunk, current_pos, total_size)
+    
+    def _load_file_streaming(self, operation_id, file_path, credit_window=None):
+        """大容量ファイルをストリーミングで読み込み（強化版）
         
+        Returns:
+            bool: 最後まで読み込めた場合True
+        """
+        if credit_window:
+            with QMutexLocker(self.mutex):
+                self._stream_credits[operation_id] = credit_window
         try:
             start_time = time.time() if ENABLE_ASYNC_PERFORMANCE_MONITORING else None
             
-            # ファイルサイズをチェック
-            file_size = os.path.getsize(file_path)
+            # ファイルサイズをチェック（ダイジェスト記録用に読み込み前の状態を保持）
+            file_stat = os.stat(file_path)
+            file_size = file_stat.st_size
             
             if file_size <= self.large_file_threshold:
-                # 小さいファイルは通常読み込み（操作を削除してから）
-                with QMutexLocker(self.mutex):
-                    self._active_operations.discard(operation_id)
-                self.load_file_async(file_path)
-                return
+                # 小さいファイルは通常読み込みして1チャンクとして通知
+                content = self._load_file(operation_id, file_path)
+                if content is None:
+                    return False
+                self._emit_chunk(operation_id, file_path, content, 0, file_size)
+                self.streaming_completed.emit(file_path)
+                return True
             
             # 最適なチャンクサイズを決定
             optimal_chunk_size = self._get_optimal_chunk_size(file_size)
             
-            # ストリーミング読み込み
-            encoding_used = 'utf-8-sig'
-            chunks_processed = 0
-            
+            # エンコーディングは先頭部分（またはキャッシュ）から決め、ファイル全体の試し読みはしない
+            encoding_used = self.detect_file_encoding(file_path, file_stat)
             try:
-                with open(file_path, 'r', encoding=encoding_used) as f:
-                    while True:
-                        # キャンセルチェック
-                        if operation_id in self._canceled_operations:
-                            self._canceled_operations.discard(operation_id)
-                            break
-                        
-                        # バイナリファイルでファイル位置を取得（正確な進捗計算）
-                        current_pos = f.tell()
-                        if current_pos >= file_size:
-                            break
-                        
-                        chunk = f.read(optimal_chunk_size // 4)  # 文字単位のため4で割る（UTF-8想定）
-                        if not chunk:
-                            break
-                        
-                        # ファイル位置を再取得（読み込み後の正確な位置）
-                        new_pos = f.tell()
-                        self.chunk_loaded.emit(file_path, chunk, current_pos, file_size)
-                        self.progress_updated.emit(file_path, new_pos, file_size)
-                        chunks_processed += 1
-                        
-                        # 停止要求チェック
-                        if self._stop_requested or QThread.currentThread().isInterruptionRequested():
-                            print("DEBUG: ファイル読み込み処理が中断されました")
-                            # アクティブ操作から削除
-                            operation_id = f"async_load_{file_path}"
-                            self._active_operations.discard(operation_id)
-                            self._check_and_emit_finished()
-                            return
-                        
-                        # 大容量ファイルでは適度に待機（UI応答性向上）
-                        if chunks_processed % 10 == 0:
-                            QThread.msleep(2)
-                        else:
-                            QThread.msleep(1)
-                
-                # パフォーマンス監視
-                if ENABLE_ASYNC_PERFORMANCE_MONITORING and start_time:
-                    elapsed_time = time.time() - start_time
-                    throughput = file_size / elapsed_time / 1024 / 1024  # MB/s
-                    print(f"⚡ ストリーミング読み込み完了: {os.path.basename(file_path)} "
-                          f"({file_size:,} bytes, {elapsed_time:.3f}s, {throughput:.2f}MB/s)")
-                
-                self.streaming_completed.emit(file_path)
-                
+                stream_result = self._stream_text_chunks(operation_id, file_path, encoding_used, file_size, optimal_chunk_size)
             except UnicodeDecodeError:
-                    # エンコーディングを変更して再試行
-                    encoding_used = 'cp932'
-                    
-                    try:
-                        with open(file_path, 'r', encoding=encoding_used, errors='replace') as f:
-                            while True:
-                                if operation_id in self._canceled_operations:
-                                    self._canceled_operations.discard(operation_id)
-                                    break
-                                
-                                # ファイル位置を取得（正確な進捗計算）
-                                current_pos = f.tell()
-                                if current_pos >= file_size:
-                                    break
-                                
-                                chunk = f.read(optimal_chunk_size // 4)
-                                if not chunk:
-                                    break
-                                
-                                # ファイル位置を再取得（読み込み後の正確な位置）
-                                new_pos = f.tell()
-                                self.chunk_loaded.emit(file_path, chunk, current_pos, file_size)
-                                self.progress_updated.emit(file_path, new_pos, file_size)
-                                
-                                # 停止要求チェック
-                                if self._stop_requested or QThread.currentThread().isInterruptionRequested():
-                                    print("DEBUG: ストリーミング読み込み処理が中断されました")
-                                    # アクティブ操作から削除
-                                    operation_id = f"stream_load_{file_path}"
-                                    self._active_operations.discard(operation_id)
-                                    self._check_and_emit_finished()
-                                    return
-                                
-                                QThread.msleep(1)
-                            
-                            self.error_occurred.emit("encoding_warning", file_path, "CP932として読み込まれました")
-                            self.streaming_completed.emit(file_path)
-                    
-                    except Exception:
-                        self.error_occurred.emit("stream", file_path, "エンコーディングエラー")
-                
+                # 推定範囲より後ろに不正なバイトがあった場合のみCP932で読み直す
+                encoding_used = 'cp932'
+                self._store_encoding(file_path, file_stat, encoding_used)
+                stream_result = self._stream_text_chunks(operation_id, file_path, encoding_used, file_size, optimal_chunk_size)
+            
+            if stream_result is None:
+                print("DEBUG: ストリーミング読み込み処理が中断されました")
+                return False
+            
+            if encoding_used == 'cp932':
+                self.error_occurred.emit("encoding_warning", file_path, "CP932として読み込まれました")
+            
+            # パフォーマンス監視
+            if ENABLE_ASYNC_PERFORMANCE_MONITORING and start_time:
+                elapsed_time = max(time.time() - start_time, 1e-9)
+                throughput = file_size / elapsed_time / 1024 / 1024  # MB/s
+                print(f"⚡ ストリーミング読み込み完了: {os.path.basename(file_path)} "
+                      f"({file_size:,} bytes, {elapsed_time:.3f}s, {throughput:.2f}MB/s)")
+            
+            digest, line_offsets = stream_result
+            self._store_digest(file_path, file_stat, digest)
+            self._store_line_index(file_path, file_stat, line_offsets)
+            self.streaming_completed.emit(file_path)
+            return True
+            
         except FileNotFoundError:
             self.error_occurred.emit("stream", file_path, "ファイルが見つかりません")
         except PermissionError:
@@ -464,9 +1213,50 @@ class FileIOWorker(QObject):
         except Exception as e:
             self.error_occurred.emit("stream", file_path, f"ストリーミング読み込みエラー: {str(e)}")
         finally:
-            # 操作完了の登録もロック
             with QMutexLocker(self.mutex):
-                self._active_operations.discard(operation_id)
+                self._stream_credits.pop(operation_id, None)
+        return False
+    
+    def _stream_text_chunks(self, operation_id, file_path, encoding, file_size, chunk_size):
+        """ファイルをメモリマップし、バイト範囲ごとにインクリメンタルデコードして通知
+        
+        進捗はデコード済みのバイト位置から正確に求める。改行はテキストモード読み込みと同様に\nへ統一する。
+        
+        同じ読み込みで行頭オフセットの索引も作る。
+        
+        Returns:
+            tuple or None: 最後まで読み込めた場合は (内容のダイジェスト, 行頭オフセット)、中断された場合None
+        """
+        errors = 'replace' if encoding == 'cp932' else 'strict'
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(errors=errors), translate=True)
+        hasher = hashlib.blake2b(digest_size=16)
+        line_offsets = array('Q', [0])
+        throttle = ProgressThrottle()
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 読み込み中に伸びた分は対象外（開始時のサイズまで）
+            total_size = min(file_size, len(mm))
+            current_pos = 0
+            while current_pos < total_size:
+                # キャンセル・停止要求チェック
+                if self._should_abort(operation_id):
+                    return None
+                
+                end_pos = min(current_pos + chunk_size, total_size)
+                block = mm[current_pos:end_pos]
+                hasher.update(block)
+                append_line_starts(line_offsets, block, current_pos)
+                chunk = decoder.decode(block, final=end_pos >= total_size)
+                if chunk:
+                    # 受信側の処理が追いつくまで待つ（一定時間の待機ではなくクレジットで調整）
+                    if not self._acquire_credit(operation_id):
+                        return None
+                    self._emit_chunk(operation_id, file_path, chunk, current_pos, total_size)
+                if throttle.ready(end_pos, total_size):
+                    self.progress_updated.emit(file_path, end_pos, total_size)
+                current_pos = end_pos
+        if line_offsets[-1] != total_size:
+            line_offsets.append(total_size)
+        return hasher.digest(), line_offsets
     
     def get_file_size(self, file_path):
         """ファイルサイズを取得"""
@@ -632,63 +1422,325 @@ class AsyncFileSystemManager(IFileSystemManager):
             print(f"ファイル保存エラー: {e}")
             return False
 
+# --- 保存スケジューラ ---
+
+class SaveScheduler(QObject):
+    """保存要求をパスごとにまとめて書き込むスケジューラ
+    
+    同じパスへの要求はdebounce_msの間まとめて1回の書き込みにし、最初の要求から
+    max_latency_msを超えて未保存のままにはしない。内容は書き込む直前にcontent_providerから取得し、
+    書き込みはFileSystemManagerの非同期保存（スレッドプール）で行う。
+    """
+    
+    def __init__(self, fs_manager, debounce_ms=AUTOSAVE_DEBOUNCE_MS, max_latency_ms=AUTOSAVE_MAX_LATENCY_MS):
+        super().__init__()
+        self.fs_manager = fs_manager
+        self.debounce_ms = debounce_ms
+        self.max_latency_ms = max_latency_ms
+        self._pending = {}  # 正規化パス -> 保留中の保存要求
+        self._in_flight = 0
+        self._stats = {'requests': 0, 'coalesced': 0, 'writes': 0, 'failures': 0,
+                       'last_latency': 0.0, 'max_latency': 0.0}
+    
+    def schedule(self, file_path, content_provider, callback=None):
+        """保存を予約（同じパスの保留中の要求があればまとめる）
+        
+        Args:
+            file_path (str): 保存先のパス
+            content_provider (callable): 保存する内容を返す関数（保存不要ならNone）
+            callback (callable): 書き込み完了時に callback(success) を呼ぶ
+        """
+        path_key = normalize_path_for_comparison(file_path)
+        now = time.monotonic()
+        self._stats['requests'] += 1
+        entry = self._pending.get(path_key)
+        if entry is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.timeout.connect(lambda key=path_key: self._flush_key(key))
+            entry = {'file_path': file_path, 'timer': timer, 'first_request': now, 'callbacks': []}
+            self._pending[path_key] = entry
+        else:
+            self._stats['coalesced'] += 1
+        entry['content_provider'] = content_provider
+        if callback:
+            entry['callbacks'].append(callback)
+        
+        # 入力が続いても最初の要求からmax_latency_ms以内には書き込む
+        remaining_ms = self.max_latency_ms - (now - entry['first_request']) * 1000
+        entry['timer'].start(int(max(0, min(self.debounce_ms, remaining_ms))))
+    
+    def flush(self, file_path=None):
+        """保留中の保存をすぐに書き込み（file_path省略時はすべて）"""
+        if file_path is None:
+            path_keys = list(self._pending)
+        else:
+            path_keys = [normalize_path_for_comparison(file_path)]
+        for path_key in path_keys:
+            self._flush_key(path_key)
+    
+    def cancel(self, path):
+        """保留中の保存を書き込まずに破棄（フォルダの場合は配下すべて）"""
+        path_key = normalize_path_for_comparison(path)
+        prefix = path_key.rstrip(os.sep) + os.sep
+        for key in [k for k in self._pending if k == path_key or k.startswith(prefix)]:
+            entry = self._pending.pop(key)
+            entry['timer'].stop()
+            entry['timer'].deleteLater()
+    
+    def has_pending(self, file_path=None):
+        """保留中の保存があるか"""
+        if file_path is None:
+            return bool(self._pending)
+        return normalize_path_for_comparison(file_path) in self._pending
+    
+    def get_statistics(self):
+        """保存キューの統計を取得
+        
+        Returns:
+            dict: pending（保留中）, in_flight（書き込み中）, requests, coalesced（まとめた要求数）,
+                  writes, failures, last_latency_ms / max_latency_ms（最初の要求から書き込み完了まで）
+        """
+        return {
+            'pending': len(self._pending),
+            'in_flight': self._in_flight,
+            'requests': self._stats['requests'],
+            'coalesced': self._stats['coalesced'],
+            'writes': self._stats['writes'],
+            'failures': self._stats['failures'],
+            'last_latency_ms': self._stats['last_latency'] * 1000,
+            'max_latency_ms': self._stats['max_latency'] * 1000,
+        }
+    
+    def _flush_key(self, path_key):
+        """保留中の保存要求を書き込みに回す"""
+        entry = self._pending.pop(path_key, None)
+        if entry is None:
+            return
+        entry['timer'].stop()
+        entry['timer'].deleteLater()
+        
+        content = entry['content_provider']()
+        if content is None:
+            # 保存済み・別のメモへの切り替えなどで書き込む必要がなくなった
+            for callback in entry['callbacks']:
+                callback(True)
+            return
+        
+        def on_saved(success):
+            self._in_flight -= 1
+            latency = time.monotonic() - entry['first_request']
+            self._stats['writes'] += 1
+            if not success:
+                self._stats['failures'] += 1
+            self._stats['last_latency'] = latency
+            self._stats['max_latency'] = max(self._stats['max_latency'], latency)
+            if ENABLE_DEBUG_OUTPUT:
+                print(f"DEBUG: 自動保存 {os.path.basename(entry['file_path'])} "
+                      f"(要求から{latency * 1000:.0f}ms, 保留 {len(self._pending)}件, 書き込み中 {self._in_flight}件)")
+            for callback in entry['callbacks']:
+                callback(success)
+        
+        self._in_flight += 1
+        self.fs_manager.save_memo_content_async(entry['file_path'], content, on_saved)
+
+class MemoPrefetcher(QObject):
+    """次に開かれそうなメモを低優先度で先読みし、内容キャッシュに載せる
+    
+    ユーザー操作による読み込みが来たら先読みはすぐにキャンセルする。
+    先読みしたメモが実際に開かれた割合を記録し、候補の選び方を評価できるようにする。
+    """
+    
+    def __init__(self, fs_manager, delay_ms=PREFETCH_DELAY_MS):
+        super().__init__()
+        self.worker = fs_manager.worker
+        self.delay_ms = delay_ms
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._start)
+        self._candidates = []
+        self._operations = {}  # operation_id -> 正規化パス
+        self._warmed = OrderedDict()  # 先読みしてまだ開かれていないメモ（正規化パス）
+        self._stats = {'requested': 0, 'warmed': 0, 'canceled': 0, 'loads': 0, 'used': 0}
+    
+    def prefetch(self, file_paths):
+        """先読みする候補を設定（前の候補と実行中の先読みは破棄）"""
+        self.cancel()
+        for file_path in file_paths:
+            if file_path and file_path not in self._candidates:
+                self._candidates.append(file_path)
+        del self._candidates[PREFETCH_MAX_CANDIDATES:]
+        if self._candidates:
+            self._timer.start(self.delay_ms)
+    
+    def cancel(self):
+        """予定中・実行中の先読みをキャンセル"""
+        self._timer.stop()
+        self._candidates = []
+        if self._operations:
+            self.worker.cancel_prefetch()
+    
+    def note_user_load(self, file_path):
+        """ユーザー操作による読み込みを記録（先読みはキャンセルしてI/Oを譲る）"""
+        self.cancel()
+        self._stats['loads'] += 1
+        if self._warmed.pop(normalize_path_for_comparison(file_path), None) is not None:
+            self._stats['used'] += 1
+    
+    def handles(self, operation_id):
+        """先読みの操作IDか"""
+        return operation_id in self._operations
+    
+    def on_finished(self, operation_id, result):
+        path_key = self._operations.pop(operation_id, None)
+        if path_key is None or not result:
+            return
+        self._stats['warmed'] += 1
+        self._warmed[path_key] = True
+        self._warmed.move_to_end(path_key)
+        while len(self._warmed) > PREFETCH_MAX_CANDIDATES * 16:
+            self._warmed.popitem(last=False)
+    
+    def on_canceled(self, operation_id):
+        if self._operations.pop(operation_id, None) is not None:
+            self._stats['canceled'] += 1
+    
+    def get_statistics(self):
+        """先読みの統計を取得
+        
+        Returns:
+            dict: requested, warmed（キャッシュに載せた件数）, canceled, loads（ユーザー操作の読み込み数）,
+                  used（先読み済みのメモが開かれた数）, hit_rate（used / loads）, accuracy（used / warmed）
+        """
+        stats = dict(self._stats)
+        stats['hit_rate'] = stats['used'] / stats['loads'] if stats['loads'] else 0.0
+        stats['accuracy'] = stats['used'] / stats['warmed'] if stats['warmed'] else 0.0
+        return stats
+    
+    def _start(self):
+        for file_path in self._candidates:
+            operation_id = self.worker.prefetch_file_async(file_path)
+            self._operations[operation_id] = normalize_path_for_comparison(file_path)
+            self._stats['requested'] += 1
+        self._candidates = []
+
+# --- 変更通知 ---
+
+class FileChangeNotifier(QObject):
+    """FileSystemManagerが行ったメモ・フォルダの変更を通知する（検索索引などの差分更新用）
+    
+    通知はGUIスレッドで行う。保存は実際に書き込んだときだけ通知し、内容が変わらず省略した保存は通知しない。
+    """
+    
+    SAVED = "saved"
+    CREATED = "created"
+    RENAMED = "renamed"
+    DELETED = "deleted"
+    
+    file_changed = pyqtSignal(str, str, str)  # 種類, パス, 変更前のパス（RENAMED以外は空文字列）
+    
+    def notify(self, kind, path, old_path=""):
+        self.file_changed.emit(kind, path, old_path)
+
 # --- ファイル・フォルダ操作 --- 
 
 class FileSystemManager(IFileSystemManager):
     def __init__(self, parent_widget=None):
         self.parent = parent_widget
         
-        # シンプルな同期処理のみ使用（QThreadエラー回避）
-        print("DEBUG: FileSystemManager - QThreadを使用しない同期版で初期化")
-        self.worker_thread = None  # QThreadを作らない
-        self.worker = None  # Workerも作らない
+        # ファイルI/OはFileIOWorkerのスレッドプールで実行し、結果はシグナルでGUIスレッドに戻す
+        self.worker_thread = None  # 専用QThreadは使わない（スレッドプールに移行）
+        self.worker = FileIOWorker()
         
-        # コールバック管理
+        # コールバック管理（operation_id -> callback）
         self._load_callbacks = {}
         self._save_callbacks = {}
+        self._streaming_callbacks = {}
+        self._index_callbacks = {}
         
-        # QThreadを使わないため、シグナル接続は不要
-        # self.worker.content_loaded.connect(self._on_content_loaded)
-        # self.worker.content_saved.connect(self._on_content_saved)
-        # self.worker.chunk_loaded.connect(self._on_chunk_loaded)
-        # self.worker.streaming_completed.connect(self._on_streaming_completed)
-        # self.worker.progress_updated.connect(lambda f, c, t: None)  # プログレス更新シグナル
+        # ストリーミング読み込み用バッファ（operation_id -> チャンクのリスト）
+        self._streaming_buffers = {}
         
-        # QThreadを使わないため、終了処理設定は不要
-        # self.worker.finished.connect(self.worker_thread.quit)
-        # self.worker.finished.connect(self.worker.deleteLater)
-        # self.worker_thread.finished.connect(self.worker_thread.deleteLater)
+        # このサイズ以上のファイルは全体を読み込まず、行単位の閲覧モードで開く
+        self.windowed_view_threshold = WINDOWED_VIEW_THRESHOLD_MB * 1024 * 1024
         
-        # QThreadを使わないため、スレッド開始は不要
-        # self.worker_thread.start()
-        self._streaming_callbacks = {}
+        # 編集中のメモの保存要求をまとめて書き込む
+        self.save_scheduler = SaveScheduler(self)
         
-        # ストリーミング読み込み用バッファ
-        self._streaming_buffers = {}
+        # 次に開かれそうなメモを内容キャッシュに先読みする
+        self.prefetcher = MemoPrefetcher(self)
+        
+        # 保存・作成・名前変更・削除を通知する
+        self.change_notifier = FileChangeNotifier()
         
-        # シグナル接続は既に上で実施済み
+        # ワーカーはプールスレッドからemitするため、GUIスレッドへはキュー接続で受け取る
+        queued = Qt.ConnectionType.QueuedConnection
+        self.worker.operation_chunk.connect(self._on_chunk_loaded, queued)
+        self.worker.operation_finished.connect(self._on_operation_finished, queued)
+        self.worker.operation_canceled.connect(self._on_operation_canceled, queued)
+        self.worker.error_occurred.connect(self._on_worker_error, queued)
+        self.worker.save_latency.connect(self._on_file_written, queued)
     
-    def _on_content_loaded(self, file_path, content):
+    def _on_operation_finished(self, operation_id, result):
+        """非同期操作完了時のコールバック振り分け"""
+        if operation_id in self._load_callbacks:
+            self._on_content_loaded(operation_id, result)
+        elif operation_id in self._save_callbacks:
+            self._on_content_saved(operation_id, bool(result))
+        elif operation_id in self._streaming_callbacks:
+            self._on_streaming_completed(operation_id, bool(result))
+        elif operation_id in self._index_callbacks:
+            callback = self._index_callbacks.pop(operation_id)
+            if callback:
+                callback(result)
+        elif self.prefetcher.handles(operation_id):
+            self.prefetcher.on_finished(operation_id, result)
+    
+    def _on_file_written(self, file_path, written_bytes, elapsed):
+        """実際に書き込んだ保存を変更として通知"""
+        self.change_notifier.notify(FileChangeNotifier.SAVED, file_path)
+    
+    def _on_operation_canceled(self, operation_id):
+        """キャンセルされた操作のコールバックを破棄"""
+        self._load_callbacks.pop(operation_id, None)
+        self._save_callbacks.pop(operation_id, None)
+        self._streaming_callbacks.pop(operation_id, None)
+        self._streaming_buffers.pop(operation_id, None)
+        self._index_callbacks.pop(operation_id, None)
+        self.prefetcher.on_canceled(operation_id)
+    
+    def _on_content_loaded(self, operation_id, content):
         """非同期読み込み完了時のコールバック"""
-        callback = self._load_callbacks.pop(file_path, None)
+        callback = self._load_callbacks.pop(operation_id, None)
         if callback:
             callback(content)
     
-    def _on_content_saved(self, file_path, success):
+    def _on_content_saved(self, operation_id, success):
         """非同期保存完了時のコールバック"""
-        callback = self._save_callbacks.pop(file_path, None)
+        callback = self._save_callbacks.pop(operation_id, None)
         if callback:
             callback(success)
     
-    def _on_chunk_loaded(self, file_path, chunk_content, current_pos, total_size):
-        """ストリーミング読み込みチャンク受信時のコールバック"""
-        if file_path not in self._streaming_buffers:
-            self._streaming_buffers[file_path] = ""
+    def _on_chunk_loaded(self, operation_id, chunk_content, current_pos, total_size):
+        """ストリーミング読み込みチャンク受信時のコールバック（処理後にワーカーへ確認応答を返す）"""
+        try:
+            self._deliver_chunk(operation_id, chunk_content, current_pos, total_size)
+        finally:
+            self.worker.acknowledge_chunk(operation_id)
+    
+    def _deliver_chunk(self, operation_id, chunk_content, current_pos, total_size):
+        if operation_id not in self._streaming_callbacks:
+            return
         
-        self._streaming_buffers[file_path] += chunk_content
+        buffer = self._streaming_buffers.get(operation_id)
+        if buffer is not None:
+            if current_pos == 0:
+                # 先頭からの読み直し（エンコーディング変更時）ではそれまでのチャンクを捨てる
+                buffer.clear()
+            buffer.append(chunk_content)
         
         # プログレス情報を提供
-        callback = self._streaming_callbacks.get(file_path)
+        callback = self._streaming_callbacks.get(operation_id)
         if callback and hasattr(callback, '__call__'):
             # コールバックが呼び出し可能で、引数が3つ以上受け入れられる場合
             try:
@@ -697,18 +1749,49 @@ class FileSystemManager(IFileSystemManager):
                 # 引数数が合わない場合は従来の方式
                 callback(chunk_content)
     
-    def _on_streaming_completed(self, file_path):
+    def _on_streaming_completed(self, operation_id, success):
         """ストリーミング読み込み完了時のコールバック"""
-        complete_content = self._streaming_buffers.pop(file_path, "")
-        callback = self._streaming_callbacks.pop(file_path, None)
+        chunks = self._streaming_buffers.pop(operation_id, None)
+        callback = self._streaming_callbacks.pop(operation_id, None)
+        if not success:
+            complete_content = None
+        else:
+            # チャンクを蓄積しない読み込みでは成功を空文字列で通知
+            complete_content = ''.join(chunks) if chunks is not None else ''
         
         if callback:
             if hasattr(callback, '__call__'):
                 try:
-                    # 完了時は完全なコンテンツを渡す
+                    # 完了時は完全なコンテンツを渡す（失敗時はNone）
                     callback(complete_content, -1, -1)  # -1, -1 で完了を示す
                 except TypeError:
                     callback(complete_content)
+    
+    def _on_worker_error(self, operation, file_path, error_message):
+        """ワーカーからのエラー通知（GUIスレッドでダイアログ表示）"""
+        file_name = os.path.basename(file_path)
+        if operation == "encoding_warning":
+            QMessageBox.warning(self.parent, strings.TITLE_ENCODING_WARNING, strings.FS_MSG_ENCODING_WARNING.format(file_path=file_path))
+            return
+        
+        print(f"!!! ERROR: {operation} {file_path}: {error_message}")
+        if operation in ("load", "stream"):
+            if "権限" in error_message:
+                QMessageBox.critical(self.parent, "権限エラー", safe_error_message(strings.FS_MSG_LOAD_MEMO_PERMISSION_ERROR.format(file_name=file_name), error_message))
+            elif "見つかりません" in error_message:
+                QMessageBox.critical(self.parent, strings.TITLE_ERROR, safe_error_message(strings.FS_MSG_LOAD_MEMO_NOT_FOUND.format(file_name=file_name), error_message))
+            else:
+                QMessageBox.critical(self.parent, strings.TITLE_READ_ERROR, safe_error_message(strings.FS_MSG_LOAD_MEMO_FAILED.format(file_name=file_name), error_message))
+        elif operation == "save":
+            if "権限" in error_message:
+                QMessageBox.critical(self.parent, "権限エラー", safe_error_message(strings.FS_MSG_SAVE_MEMO_PERMISSION_ERROR, f"ファイルパス: {file_path}"))
+            else:
+                QMessageBox.critical(self.parent, "OSエラー", safe_error_message(strings.FS_MSG_SAVE_MEMO_OS_ERROR, f"{error_message}\nファイルパス: {file_path}"))
+        elif operation == "create":
+            if "権限" in error_message:
+                QMessageBox.warning(self.parent, "権限エラー", safe_error_message(strings.FS_MSG_CREATE_MEMO_PERMISSION_ERROR.format(file_name=file_name), error_message))
+            else:
+                QMessageBox.warning(self.parent, "OSエラー", safe_error_message(strings.FS_MSG_CREATE_MEMO_OS_ERROR.format(file_name=file_name), error_message))
 
     def create_new_folder(self, default_name="新しいフォルダ", use_default_on_empty=False):
         folder_name, ok = QInputDialog.getText(self.parent, strings.TITLE_NEW_FOLDER, strings.MSG_INPUT_FOLDER_NAME, QLineEdit.EchoMode.Normal, default_name)
@@ -734,6 +1817,7 @@ class FileSystemManager(IFileSystemManager):
                 print(f"DEBUG: Attempting to create folder: {new_folder_path}")
                 os.makedirs(new_folder_path)
                 print(f"フォルダ作成成功: {new_folder_path}")
+                self.change_notifier.notify(FileChangeNotifier.CREATED, new_folder_path)
                 return final_folder_name, new_folder_path
             except PermissionError as e:
                 error_msg = safe_error_message(
@@ -785,6 +1869,7 @@ class FileSystemManager(IFileSystemManager):
                 new_file_path = os.path.abspath(os.path.join(current_folder_path, final_file_name))
             try:
                 with open(new_file_path, 'w', encoding='utf-8') as f: f.write("")
+                self.change_notifier.notify(FileChangeNotifier.CREATED, new_file_path)
                 return new_file_path
             except PermissionError as e:
                 error_msg = safe_error_message(
@@ -814,7 +1899,12 @@ class FileSystemManager(IFileSystemManager):
             new_folder_path = os.path.abspath(os.path.join(BASE_MEMO_DIR, new_name))
             if not os.path.exists(new_folder_path):
                 try:
+                    # フォルダ内への保留中の保存が旧パスに書き込まれないよう完了を待つ
+                    self.flush_saves()
+                    self.wait_for_pending_operations()
                     os.rename(old_folder_path, new_folder_path)
+                    self.worker.forget_path_records(old_folder_path)
+                    self.change_notifier.notify(FileChangeNotifier.RENAMED, new_folder_path, old_folder_path)
                     return new_name, new_folder_path
                 except PermissionError as e:
                     error_msg = safe_error_message("フォルダ名の変更に必要な権限がありません。", f"エラー詳細: {e}\n{traceback.format_exc()}")
@@ -842,7 +1932,12 @@ class FileSystemManager(IFileSystemManager):
         msg_box.exec()
         if msg_box.clickedButton() == delete_button:
             try:
+                # 削除したフォルダに保存が書き込まれて再作成されないよう予約を破棄
+                self.save_scheduler.cancel(folder_path)
+                self.wait_for_pending_operations()
                 shutil.rmtree(folder_path)
+                self.worker.forget_path_records(folder_path)
+                self.change_notifier.notify(FileChangeNotifier.DELETED, folder_path)
                 return True
             except PermissionError as e:
                 error_msg = safe_error_message(
@@ -884,7 +1979,12 @@ class FileSystemManager(IFileSystemManager):
             new_file_path = os.path.abspath(os.path.join(folder_path, new_file_name))
             if not os.path.exists(new_file_path):
                 try:
+                    # 保留中の保存が旧パスに書き込まれないよう完了を待つ
+                    self.flush_saves(old_file_path)
+                    self.wait_for_pending_operations(old_file_path)
                     os.rename(old_file_path, new_file_path)
+                    self.worker.forget_path_records(old_file_path)
+                    self.change_notifier.notify(FileChangeNotifier.RENAMED, new_file_path, old_file_path)
                     return new_file_path
                 except PermissionError as e:
                     error_msg = safe_error_message("メモ名の変更に必要な権限がありません。", f"エラー詳細: {e}\n{traceback.format_exc()}")
@@ -904,8 +2004,12 @@ class FileSystemManager(IFileSystemManager):
         reply = QMessageBox.question(self.parent, strings.TITLE_DELETE_MEMO, f"メモ '{file_name}' を削除しますか？\n{strings.MSG_CANNOT_UNDO}", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
             try:
+                self.save_scheduler.cancel(file_path)
+                self.wait_for_pending_operations(file_path)
                 if os.path.exists(file_path):
                     os.remove(file_path)
+                self.worker.forget_path_records(file_path)
+                self.change_notifier.notify(FileChangeNotifier.DELETED, file_path)
                 return True
             except PermissionError as e:
                 error_msg = safe_error_message(f"メモ '{file_name}' を削除する権限がありません。", f"エラー詳細: {e}\n{traceback.format_exc()}")
@@ -941,18 +2045,11 @@ class FileSystemManager(IFileSystemManager):
     def _load_memo_content_sync(self, file_path):
         """メモ内容を同期で読み込み（内部使用）"""
         try:
-            content = ""
-            try:
-                with open(file_path, 'r', encoding='utf-8-sig') as f:
-                    content = f.read()
-            except UnicodeDecodeError:
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                except UnicodeDecodeError:
-                    with open(file_path, 'r', encoding='cp932', errors='replace') as f:
-                        content = f.read()
-                    QMessageBox.warning(self.parent, strings.TITLE_ENCODING_WARNING, f"ファイルを CP932 (Shift-JIS) として読み込みました。文字化けしている可能性があります。UTF-8 で保存し直すことを推奨します。{file_path}")
+            # 保留中の非同期保存を反映した内容を読むため完了を待つ
+            self.wait_for_pending_operations(file_path)
+            content, is_cp932_fallback = self.worker.read_file(file_path)
+            if is_cp932_fallback:
+                QMessageBox.warning(self.parent, strings.TITLE_ENCODING_WARNING, f"ファイルを CP932 (Shift-JIS) として読み込みました。文字化けしている可能性があります。UTF-8 で保存し直すことを推奨します。{file_path}")
             return content
         except FileNotFoundError:
             error_message = safe_error_message(f"メモファイルが見つかりません: {os.path.basename(file_path)}")
@@ -989,13 +2086,11 @@ class FileSystemManager(IFileSystemManager):
         return True
     
     def _save_memo_content_sync(self, file_path, content):
-        """メモ内容を同期で保存（内部使用）"""
+        """メモ内容を同期で保存（内部使用、非同期保存と同じパイプラインを使用）"""
         try:
-            dir_path = os.path.dirname(file_path)
-            if not os.path.exists(dir_path):
-                os.makedirs(dir_path)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            # 先行する非同期保存が後から上書きしないよう完了を待つ
+            self.wait_for_pending_operations(file_path)
+            self.worker.write_file(file_path, content)
             return True
         except PermissionError:
             error_message = safe_error_message("メモを保存する権限がありません。", f"ファイルパス: {file_path}\n{traceback.format_exc()}")
@@ -1009,49 +2104,120 @@ class FileSystemManager(IFileSystemManager):
             return False
     
     def load_memo_content_async(self, file_path, callback=None):
-        """メモ内容を同期で読み込み（非同期メソッド名だが実際は同期）
+        """メモ内容をスレッドプールで非同期に読み込み
         
         Args:
             file_path (str): 読み込むファイルのパス
             callback (callable): 読み込み完了時のコールバック関数 callback(content)
+                                 GUIスレッドで呼ばれる。エラー時はcontent=None
+                                 
+        Returns:
+            str: operation_id
         """
-        # 同期処理で直接読み込み
-        content = self.load_memo_content(file_path)
-        
-        # コールバックがあれば実行
-        if callback:
-            callback(content)
+        self.prefetcher.note_user_load(file_path)
+        operation_id = self.worker.load_file_async(file_path)
+        # 完了通知はキュー経由でGUIスレッドに届くため、ここでの登録が先になる
+        self._load_callbacks[operation_id] = callback
+        return operation_id
     
     def save_memo_content_async(self, file_path, content, callback=None):
-        """メモ内容を同期で保存（非同期メソッド名だが実際は同期）
+        """メモ内容をスレッドプールで非同期に保存
+        
+        同じパスへの読み込み・保存は投入順に実行される。
         
         Args:
             file_path (str): 保存するファイルのパス
             content (str): 保存する内容
             callback (callable): 保存完了時のコールバック関数 callback(success)
+            
+        Returns:
+            str: operation_id
         """
-        # 同期処理で直接保存
-        success = self.save_memo_content(file_path, content)
-        
-        # コールバックがあれば実行
-        if callback:
-            callback(success)
+        operation_id = self.worker.save_file_async(file_path, content)
+        self._save_callbacks[operation_id] = callback
+        return operation_id
     
-    def load_memo_content_streaming(self, file_path, callback=None):
-        """メモ内容を同期読み込み（ストリーミング名だが実際は一括読み込み）
+    def load_memo_content_streaming(self, file_path, callback=None, accumulate=True):
+        """メモ内容をスレッドプールでストリーミング読み込み
         
         Args:
             file_path (str): 読み込むファイルのパス
             callback (callable): チャンク受信時のコールバック関数
                                  callback(chunk_content, current_pos, total_size)
                                  完了時は callback(complete_content, -1, -1)
+                                 （エラー時は complete_content=None）
+                                 current_pos=0 のチャンクは先頭からの読み直しを意味する
+            accumulate (bool): Falseの場合はチャンクを保持せず、完了時のcomplete_contentは空文字列
+                               （チャンクを逐次表示する呼び出し側でメモリを二重に使わないため）
+                                 
+        Returns:
+            str: operation_id
         """
-        # 同期処理で一括読み込み
-        content = self.load_memo_content(file_path)
+        self.prefetcher.note_user_load(file_path)
+        operation_id = self.worker.load_file_streaming(file_path, STREAM_CREDIT_WINDOW)
+        self._streaming_callbacks[operation_id] = callback
+        if accumulate:
+            self._streaming_buffers[operation_id] = []
+        return operation_id
+    
+    def build_line_index_async(self, file_path, callback=None):
+        """ファイル全体の行頭オフセットをスレッドプールで作成
         
-        # コールバックがあれば完了として実行
-        if callback:
-            callback(content, -1, -1)  # 完了時の形式
+        Args:
+            file_path (str): 対象ファイルのパス
+            callback (callable): callback(offsets)（エラー時は offsets=None）
+            
+        Returns:
+            str: operation_id
+        """
+        operation_id = self.worker.build_line_index_async(file_path)
+        self._index_callbacks[operation_id] = callback
+        return operation_id
+    
+    def enable_line_index_cache(self, cache_dir=LINE_INDEX_CACHE_DIR):
+        """行索引をファイルに保存し、次回以降の作成を省略する"""
+        self.worker.line_index_dir = cache_dir
+    
+    def get_line_index(self, file_path):
+        """作成済みの行索引を取得（サイズ・更新時刻が変わっていればNone）"""
+        return self.worker.get_line_index(file_path)
+    
+    def scan_line_offsets(self, file_path, limit_bytes):
+        """ファイル先頭limit_bytes内の完全な行の行頭オフセットを取得（閲覧モードの初期表示用）"""
+        with open(file_path, 'rb') as f:
+            data = f.read(limit_bytes)
+            is_whole_file = not f.read(1)
+        return find_line_offsets(data, is_complete=is_whole_file)
+    
+    def detect_encoding(self, file_path):
+        """ファイルのエンコーディングを取得（'utf-8-sig' または 'cp932'）"""
+        return self.worker.detect_file_encoding(file_path, os.stat(file_path))
+    
+    def read_text_range(self, file_path, start_offset, end_offset, encoding=None):
+        """ファイルの指定バイト範囲を文字列として読み込み（閲覧モード用）
+        
+        範囲は行頭オフセットで区切られている前提。末尾の改行1つは取り除く。
+        encoding省略時はキャッシュ済み（なければ先頭部分から推定した）エンコーディングで読む。
+        先頭部分の推定より後ろにUTF-8として不正なバイトがあればCP932で読み直し、
+        以降の範囲もCP932で読むようエンコーディングキャッシュに記録する。
+        """
+        with open(file_path, 'rb') as f:
+            file_stat = os.fstat(f.fileno())
+            if encoding is None:
+                encoding = self.worker.detect_file_encoding(file_path, file_stat)
+            f.seek(start_offset)
+            data = f.read(end_offset - start_offset)
+        text = None
+        if encoding != 'cp932':
+            try:
+                # BOMはファイル先頭にしかない
+                text = data.decode(encoding if start_offset == 0 else 'utf-8')
+            except UnicodeDecodeError:
+                self.worker.record_encoding(file_path, file_stat, 'cp932')
+        if text is None:
+            text = data.decode('cp932', errors='replace')
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text[:-1] if text.endswith('\n') else text
     
     def get_file_size(self, file_path):
         """ファイルサイズを取得（同期処理）
@@ -1080,22 +2246,106 @@ class FileSystemManager(IFileSystemManager):
         return self.get_file_size(file_path) >= (512 * 1024)
     
     def cancel_file_operation(self, file_path):
-        """進行中のファイル操作をキャンセル（同期版では不要）
+        """進行中・待機中の読み込み操作をキャンセル
+        
+        キャンセルされた操作のコールバックは呼ばれない。保存はキャンセルしない。
         
         Args:
             file_path (str): キャンセルするファイルのパス
         """
-        # 同期処理のため、キャンセルする操作はない
-        print(f"DEBUG: cancel_file_operation called for {file_path} (同期版では不要)")
+        self.worker.cancel_operation(file_path)
     
     def get_active_operations(self):
-        """進行中の操作一覧を取得（同期版では常に空）
+        """進行中・待機中の操作一覧を取得
         
         Returns:
             set: 進行中の操作ID
         """
-        # 同期処理のため、常に空のセットを返す
-        return set()
+        return self.worker.get_active_operations()
+    
+    def load_encoding_cache(self, cache_path=ENCODING_CACHE_FILE):
+        """前回終了時に保存したエンコーディングキャッシュを読み込み"""
+        self.worker.load_encoding_cache(cache_path)
+    
+    def save_encoding_cache(self, cache_path=ENCODING_CACHE_FILE):
+        """エンコーディングキャッシュを保存（次回起動時の推定を省略するため）"""
+        self.worker.save_encoding_cache(cache_path)
+    
+    def schedule_save(self, file_path, content_provider, callback=None):
+        """保存を予約（入力が止まるか最大待ち時間に達したら、まとめて1回書き込む）
+        
+        Args:
+            file_path (str): 保存先のパス
+            content_provider (callable): 書き込み直前に呼ばれ、保存する内容を返す（保存不要ならNone）
+            callback (callable): 書き込み完了時に callback(success) を呼ぶ
+        """
+        self.save_scheduler.schedule(file_path, content_provider, callback)
+    
+    def flush_saves(self, file_path=None):
+        """予約中の保存をすぐに書き込みに回す（file_path省略時はすべて）"""
+        self.save_scheduler.flush(file_path)
+    
+    def flush_documents(self, documents, deadline_ms=SHUTDOWN_FLUSH_DEADLINE_MS):
+        """複数のメモを並列に保存し、期限まで完了を待つ（終了時に使用）
+        
+        パスごとに別のプールスレッドで書き込むため、合計時間は最も遅い1件でほぼ決まる。
+        
+        Args:
+            documents (dict): パス -> 保存する内容
+            deadline_ms (int): 完了を待つ最大時間（ミリ秒）
+            
+        Returns:
+            dict: パス -> 保存結果（期限内に完了しなかったものはNone）
+        """
+        for file_path in documents:
+            # 同じ内容を二重に書かないよう、予約中の保存はここで渡された内容に置き換える
+            self.save_scheduler.cancel(file_path)
+        self.flush_saves()
+        # 終了を取りやめた場合に開いているメモの読み込みが途切れないよう、キャンセルするのは先読みだけ
+        self.prefetcher.cancel()
+        
+        results = self.worker.save_files_and_wait(documents, deadline_ms)
+        if None in results.values():
+            print(f"WARNING: FileSystemManager - {deadline_ms}ms以内に保存が完了しませんでした")
+        return results
+    
+    def get_save_queue_statistics(self):
+        """保存キューの統計（保留中・書き込み中の件数、要求から書き込み完了までの時間）を取得"""
+        return self.save_scheduler.get_statistics()
+    
+    def get_save_statistics(self):
+        """保存パフォーマンス統計を取得（書き込み/省略件数・直近/平均/最大の所要時間ms）"""
+        return self.worker.get_save_statistics()
+    
+    def prefetch_memos(self, file_paths):
+        """次に開かれそうなメモを内容キャッシュに先読み（前の候補は破棄）"""
+        self.prefetcher.prefetch(file_paths)
+    
+    def get_prefetch_statistics(self):
+        """先読みの統計（先読み件数、先読みしたメモが開かれた割合）を取得"""
+        return self.prefetcher.get_statistics()
+    
+    def set_content_cache_budget(self, budget_bytes):
+        """メモ内容キャッシュの上限（バイト）を設定（0でキャッシュを無効化）"""
+        self.worker.content_cache.set_budget(budget_bytes)
+    
+    def get_content_cache_statistics(self):
+        """メモ内容キャッシュの統計（ヒット/ミス/追い出し件数、件数、使用バイト数）を取得"""
+        return self.worker.content_cache.get_statistics()
+    
+    def wait_for_pending_operations(self, file_path=None, timeout_ms=5000):
+        """保留中の操作の完了を待機（リネーム・削除・終了前に使用）
+        
+        Args:
+            file_path (str): 対象パス。Noneの場合はすべての操作
+            timeout_ms (int): 最大待機時間（ミリ秒）
+            
+        Returns:
+            bool: タイムアウト前に完了した場合True
+        """
+        if file_path is None:
+            return self.worker.wait_for_done(timeout_ms)
+        return self.worker.wait_for_path(file_path, timeout_ms)
     
     def get_file_load_strategy(self, file_path):
         """ファイル読み込み戦略を判定
@@ -1104,7 +2354,7 @@ class FileSystemManager(IFileSystemManager):
             file_path (str): チェックするファイルのパス
             
         Returns:
-            str: 'sync' | 'async' | 'streaming'
+            str: 'sync' | 'async' | 'streaming' | 'windowed'
         """
         if not os.path.exists(file_path):
             return 'sync'  # 存在しないファイル
@@ -1115,8 +2365,10 @@ class FileSystemManager(IFileSystemManager):
             return 'sync'
         elif file_size < 512 * 1024:  # 512KB未満
             return 'async'
-        else:  # 512KB以上
+        elif file_size < self.windowed_view_threshold:
             return 'streaming'
+        else:  # 閲覧モードのしきい値以上
+            return 'windowed'
     
     def auto_load_memo_content(self, file_path, callback=None):
         """ファイルサイズに応じて最適な方法で読み込み
@@ -1143,10 +2395,16 @@ class FileSystemManager(IFileSystemManager):
             self.load_memo_content_streaming(file_path, callback)
     
     def cleanup(self):
-        """リソースクリーンアップ（同期版）"""
-        print("DEBUG: FileSystemManager クリーンアップ開始（同期版）")
+        """リソースクリーンアップ（読み込みはキャンセルし、保存の完了を待つ）"""
+        print("DEBUG: FileSystemManager クリーンアップ開始")
+        
+        # 予約中の保存は破棄せず書き込みに回す
+        self.flush_saves()
+        self.prefetcher.cancel()
+        self._cancel_all_operations()
+        if not self.wait_for_pending_operations():
+            print("WARNING: FileSystemManager - 保留中のファイル操作が時間内に完了しませんでした")
         
-        # QThreadを使わないので、特にクリーンアップするものはない
         if hasattr(self, '_load_callbacks'):
             self._load_callbacks.clear()
         if hasattr(self, '_save_callbacks'):
@@ -1156,18 +2414,13 @@ class FileSystemManager(IFileSystemManager):
         if hasattr(self, '_streaming_buffers'):
             self._streaming_buffers.clear()
             
-        print("DEBUG: FileSystemManager クリーンアップ完了（同期版）")
+        print("DEBUG: FileSystemManager クリーンアップ完了")
     
     def _cancel_all_operations(self):
-        """実行中の操作をすべてキャンセル"""
+        """実行中の読み込み操作をすべてキャンセル"""
         try:
             if hasattr(self, 'worker') and self.worker:
-                # 進行中の操作があれば停止フラグを設定
-                if hasattr(self.worker, '_stop_requested'):
-                    self.worker._stop_requested = True
-                # キャンセル可能な操作を停止
-                for file_path in list(self._load_callbacks.keys()):
-                    self.cancel_operation(file_path)
+                self.worker.cancel_all_operations()
                 print("DEBUG: すべての操作をキャンセルしました")
         except Exception as e:
             print(f"操作キャンセルエラー: {e}")
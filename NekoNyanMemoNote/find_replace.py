@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+
+import re
+import time
+from array import array
+from bisect import bisect_left
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QTextCursor
+
+from .constants import FIND_THREADS, FIND_ABORT_CHECK_MATCHES, ENABLE_DEBUG_OUTPUT
+from .grep_search import compile_grep_query
+from .text_fold import ASTRAL_PATTERN
+
+def compile_find_pattern(query, is_regex=False, case_sensitive=False):
+    """検索語を正規表現にする（grep検索と同じ解釈。^と$は行頭・行末に一致する）
+    
+    Raises:
+        re.error: 正規表現が正しくない場合
+    """
+    return compile_grep_query(query, is_regex, case_sensitive)[0]
+
+def replacement_template(replacement, is_regex=False):
+    """置換後の文字列をre.sub()に渡す形にする（正規表現でなければ\\も文字としてそのまま使う）"""
+    return replacement if is_regex else replacement.replace('\\', '\\\\')
+
+class DocumentPositions:
+    """文字列の位置をQTextDocumentの位置に変換する
+    
+    ドキュメントの位置はUTF-16で数えるため、基本多言語面の外の文字（絵文字など）は2文字になる。
+    """
+    
+    def __init__(self, text):
+        self.astral = array('i', (match.start() for match in ASTRAL_PATTERN.finditer(text)))
+    
+    def to_document(self, position):
+        if not self.astral:
+            return position
+        return position + bisect_left(self.astral, position)
+
+def find_matches(text, pattern, should_abort=None):
+    """文字列のすべての一致の範囲を求める（呼び出したスレッドで実行）
+    
+    Returns:
+        tuple: (開始位置のarray, 終了位置のarray) ドキュメントの位置で、開始位置の順に並ぶ。
+               中断した場合はNone
+    """
+    positions = DocumentPositions(text)
+    to_document = positions.to_document
+    starts, ends = array('i'), array('i')
+    for count, match in enumerate(pattern.finditer(text), 1):
+        if positions.astral:
+            starts.append(to_document(match.start()))
+            ends.append(to_document(match.end()))
+        else:
+            starts.append(match.start())
+            ends.append(match.end())
+        if count % FIND_ABORT_CHECK_MATCHES == 0 and should_abort and should_abort():
+            return None
+    return starts, ends
+
+class _ReplaceAborted(Exception):
+    """置換の中断（re.subn()の途中から抜けるために使う）"""
+
+def replace_in_text(text, pattern, template, should_abort=None):
+    """すべての一致を置換し、置換で変わる範囲（最初の一致から最後の一致まで）だけを返す
+    
+    置換しながら最初と最後の一致の位置を記録するため、正規表現で文字列をたどるのは1回だけ。
+    
+    Returns:
+        tuple: (置換した数, 範囲の開始, 範囲の終了, 範囲を置き換える文字列) 位置は元の文字列での位置。
+               中断した場合はNone
+    
+    Raises:
+        re.error: 置換後の文字列が正しくない場合（存在しないグループの参照など）
+    """
+    first_start = None
+    last_end = 0
+    matched = 0
+    # グループの参照もエスケープもない置換後の文字列は展開せずにそのまま使う
+    is_literal = '\\' not in template
+    
+    def expand(match):
+        nonlocal first_start, last_end, matched
+        if first_start is None:
+            first_start = match.start()
+        last_end = match.end()
+        matched += 1
+        if matched % FIND_ABORT_CHECK_MATCHES == 0 and should_abort and should_abort():
+            raise _ReplaceAborted()
+        return template if is_literal else match.expand(template)
+    
+    try:
+        replaced, count = pattern.subn(expand, text)
+    except _ReplaceAborted:
+        return None
+    if count == 0:
+        return 0, 0, 0, ""
+    # 最後の一致より後ろは置換しても変わらない
+    tail = len(text) - last_end
+    return count, first_start, last_end, replaced[first_start:len(replaced) - tail]
+
+def apply_replacement(editor, start, end, text):
+    """エディタのドキュメントの範囲を文字列で置き換える（1つの編集にまとめるためUndo 1回で元に戻せる。GUIスレッドで実行）
+    
+    置き換える間はドキュメントをエディタから切り離してレイアウトを捨て、編集のたびにレイアウトをやり直させない
+    （付け直したときにレイアウトが作り直され、表示範囲から順に配置される）。
+    
+    Args:
+        start (int): 範囲の開始（ドキュメントの位置）
+        end (int): 範囲の終了（ドキュメントの位置）
+    """
+    document = editor.document()
+    # 切り離したドキュメントの編集はエディタに通知されないため、ずれる強調表示は先に消す
+    editor.set_find_matches(None, None)
+    cursor = editor.textCursor()
+    if cursor.selectionEnd() > start and cursor.selectionStart() < end:
+        # 置き換える範囲にあるカーソルは範囲の先頭に移す
+        cursor.setPosition(start)
+        editor.setTextCursor(cursor)
+        editor.highlight_current_line()
+    detached = editor.hibernate_document()
+    if detached:
+        document.setDocumentLayout(None)
+    try:
+        cursor = QTextCursor(document)
+        cursor.beginEditBlock()
+        # 範囲の後ろに挿入してから元の範囲を消す（先に消すと、範囲の先頭にあるカーソルが挿入した文字列の
+        # 後ろへ押し流され、付け直したときにそこまでのレイアウトを待つことになる）
+        cursor.setPosition(end)
+        cursor.insertText(text)
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        cursor.endEditBlock()
+    finally:
+        if detached:
+            editor.wake_document()
+
+class FindTask(QRunnable):
+    """スナップショットのすべての一致を求めるタスク"""
+    
+    def __init__(self, finder, generation, text, pattern):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.finder = finder
+        self.generation = generation
+        self.text = text
+        self.pattern = pattern
+    
+    def run(self):
+        started = time.perf_counter()
+        matches = find_matches(self.text, self.pattern, lambda: self.finder.generation != self.generation)
+        if matches is None or self.finder.generation != self.generation:
+            return
+        starts, ends = matches
+        self.finder._matches_ready.emit(self.generation, {
+            'starts': starts, 'ends': ends, 'elapsed': time.perf_counter() - started})
+
+class ReplaceAllTask(QRunnable):
+    """スナップショットのすべての一致を置換した結果を求めるタスク（ドキュメントへの反映はGUIスレッドで行う）"""
+    
+    def __init__(self, finder, generation, text, pattern, template):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.finder = finder
+        self.generation = generation
+        self.text = text
+        self.pattern = pattern
+        self.template = template
+    
+    def run(self):
+        started = time.perf_counter()
+        try:
+            result = replace_in_text(self.text, self.pattern, self.template,
+                                     lambda: self.finder.generation != self.generation)
+        except re.error as e:
+            self.finder._replacement_ready.emit(self.generation, {'error': f"置換後の文字列が正しくありません: {e}"})
+            return
+        if result is None or self.finder.generation != self.generation:
+            return
+        count, start, end, replaced = result
+        positions = DocumentPositions(self.text)
+        self.finder._replacement_ready.emit(self.generation, {
+            'count': count, 'start': positions.to_document(start), 'end': positions.to_document(end),
+            'text': replaced, 'started': started})
+
+class DocumentFinder(QObject):
+    """開いているメモの検索と置換を、GUIスレッドを止めずに行う
+    
+    ドキュメントのテキストをスナップショットして一致をスレッドプールで求め、結果をシグナルで通知する。
+    スナップショットは同じドキュメントの同じ版なら使い回すため、検索語を打ち直すたびに読み直すことはない。
+    すべて置換は置換後の文字列もスレッドで求め、最初の一致から最後の一致までを1つの編集にまとめて反映する
+    （Undo 1回で元に戻せる）。反映する間はドキュメントをエディタから切り離し、編集のたびにレイアウトを
+    やり直させない。新しい検索を始めるかcancel()すると世代が変わり、古い世代の結果は捨てる。
+    """
+    
+    matches_found = pyqtSignal(object)  # dict(editor, starts, ends, elapsed)
+    replace_finished = pyqtSignal(object)  # dict(editor, count, elapsed) または dict(editor, error)
+    _matches_ready = pyqtSignal(int, object)  # 以下は作業スレッドからGUIスレッドへの受け渡し用
+    _replacement_ready = pyqtSignal(int, object)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(FIND_THREADS)
+        self.generation = 0
+        self._target = None  # 実行中の検索・置換の (エディタ, ドキュメント, 版)
+        self._snapshot = None  # (ドキュメント, 版, テキスト)
+        self._matches_ready.connect(self._on_matches_ready)
+        self._replacement_ready.connect(self._on_replacement_ready)
+    
+    @property
+    def is_busy(self):
+        return self._target is not None
+    
+    def start_find(self, editor, query, is_regex=False, case_sensitive=False):
+        """エディタのメモのすべての一致を探し始める（実行中の検索・置換は取り消す）
+        
+        Raises:
+            re.error: 正規表現が正しくない場合
+        """
+        self.cancel()
+        pattern = compile_find_pattern(query, is_regex, case_sensitive)
+        text = self._take_snapshot(editor)
+        self.thread_pool.start(FindTask(self, self.generation, text, pattern))
+    
+    def start_replace_all(self, editor, query, replacement, is_regex=False, case_sensitive=False):
+        """エディタのメモのすべての一致を置換し始める（実行中の検索・置換は取り消す）
+        
+        Returns:
+            bool: 始めた場合True（読み取り専用・読み込み中のメモは置換しない）
+        
+        Raises:
+            re.error: 正規表現が正しくない場合
+        """
+        self.cancel()
+        if editor.isReadOnly() or editor.progressive_loader.is_loading:
+            return False
+        pattern = compile_find_pattern(query, is_regex, case_sensitive)
+        text = self._take_snapshot(editor)
+        self.thread_pool.start(ReplaceAllTask(self, self.generation, text, pattern,
+                                              replacement_template(replacement, is_regex)))
+        return True
+    
+    def replace_selection(self, editor, query, replacement, is_regex=False, case_sensitive=False):
+        """選択範囲が検索語に一致していれば置換する（1件ずつの置換用。GUIスレッドで実行）
+        
+        Returns:
+            bool: 置換した場合True
+        
+        Raises:
+            re.error: 正規表現・置換後の文字列が正しくない場合
+        """
+        cursor = editor.textCursor()
+        if editor.isReadOnly() or not cursor.hasSelection():
+            return False
+        pattern = compile_find_pattern(query, is_regex, case_sensitive)
+        # selectedText()は改行をU+2029で返す
+        match = pattern.fullmatch(cursor.selectedText().replace('\u2029', '\n'))
+        if match is None:
+            return False
+        cursor.insertText(match.expand(replacement_template(replacement, is_regex)))
+        return True
+    
+    def cancel(self):
+        """実行中の検索・置換を取り消す（GUIスレッドで呼ぶ）"""
+        self.generation += 1
+        self.thread_pool.clear()
+        self._target = None
+    
+    def release_snapshot(self):
+        """使い回すために保持しているスナップショットを手放す（検索ダイアログを閉じたときなど）"""
+        self._snapshot = None
+    
+    def wait(self, timeout_ms=-1):
+        """実行中のタスクの終了を待つ
+        
+        Returns:
+            bool: 終了した場合True
+        """
+        return self.thread_pool.waitForDone(timeout_ms)
+    
+    def _take_snapshot(self, editor):
+        """エディタのドキュメントのテキストを取得（同じ版なら前回の取得分を使い回す）"""
+        document = editor.document()
+        revision = document.revision()
+        if self._snapshot is None or self._snapshot[0] is not document or self._snapshot[1] != revision:
+            self._snapshot = (document, revision, document.toPlainText())
+        self._target = (editor, document, revision)
+        return self._snapshot[2]
+    
+    def _is_target_current(self):
+        """検索・置換を始めた時点からエディタのドキュメントが変わっていないか"""
+        editor, document, revision = self._target
+        try:
+            return editor.document() is document and document.revision() == revision
+        except RuntimeError:
+            # エディタ（タブ）が閉じられた
+            return False
+    
+    def _on_matches_ready(self, generation, result):
+        if generation != self.generation or self._target is None:
+            return
+        editor = self._target[0]
+        is_current = self._is_target_current()
+        self._target = None
+        if is_current:
+            result['editor'] = editor
+            self.matches_found.emit(result)
+    
+    def _on_replacement_ready(self, generation, result):
+        if generation != self.generation or self._target is None:
+            return
+        editor = self._target[0]
+        is_current = self._is_target_current()
+        self._target = None
+        result['editor'] = editor
+        if 'error' in result:
+            self.replace_finished.emit(result)
+            return
+        if not is_current:
+            self.replace_finished.emit({'editor': editor, 'error': "置換中にメモが変更されたため、置換を中止しました"})
+            return
+        
+        if result['count']:
+            apply_replacement(editor, result['start'], result['end'], result['text'])
+        stats = {'editor': editor, 'count': result['count'], 'elapsed': time.perf_counter() - result['started']}
+        if ENABLE_DEBUG_OUTPUT:
+            print(f"DEBUG: すべて置換しました: {stats['count']}件 ({stats['elapsed'] * 1000:.0f}ms)")
+        self.replace_finished.emit(stats)
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+
+import mmap
+import os
+import re
+import time
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .constants import (
+    GREP_THREADS, GREP_CHUNK_FILES, GREP_BLOCK_SIZE, GREP_MAX_HITS_PER_FILE, GREP_CONTEXT_CHARS,
+    ENABLE_DEBUG_OUTPUT
+)
+from .file_system import decode_memo_bytes, detect_memo_encoding, ENCODING_PROBE_SIZE
+from .search_index import iter_memo_paths, SNIPPET_OPEN, SNIPPET_CLOSE, SNIPPET_ELLIPSIS
+
+MEMO_ENCODINGS = ('utf-8', 'cp932')
+
+def compile_grep_query(query, is_regex=False, case_sensitive=False):
+    """検索語を照合用の正規表現と、デコードせずにメモを読み飛ばすためのバイト列の正規表現にする
+    
+    文字列の検索では、検索語をUTF-8とCP932でエンコードしたものがどちらも含まれないメモ（の範囲）は
+    デコードせずに飛ばす。バイト列の正規表現はASCIIの大文字・小文字しか同一視できないため、
+    大文字・小文字を区別しない検索で、ASCII以外に大文字・小文字のある文字を含む場合は飛ばさない。
+    
+    Returns:
+        tuple: (正規表現, バイト列の正規表現のリスト（空なら読み飛ばさない）)
+    
+    Raises:
+        re.error: 正規表現が正しくない場合
+    """
+    flags = re.MULTILINE | (0 if case_sensitive else re.IGNORECASE)
+    pattern = re.compile(query if is_regex else re.escape(query), flags)
+    needles = []
+    if not is_regex and (case_sensitive or all(char.isascii() or char.lower() == char.upper() for char in query)):
+        for encoding in MEMO_ENCODINGS:
+            try:
+                needle = query.encode(encoding)
+            except UnicodeEncodeError:
+                continue  # CP932で表せない語は、CP932のメモには現れない
+            needles.append(re.compile(re.escape(needle), 0 if case_sensitive else re.IGNORECASE))
+    return pattern, needles
+
+def make_line_snippet(line, start, end, context_chars=GREP_CONTEXT_CHARS):
+    """一致した行の一致箇所の前後を切り出して一致箇所を括弧で囲む"""
+    snippet_start = max(0, start - context_chars)
+    snippet_end = min(len(line), end + context_chars)
+    return ((SNIPPET_ELLIPSIS if snippet_start > 0 else "")
+            + line[snippet_start:start] + SNIPPET_OPEN + line[start:end] + SNIPPET_CLOSE + line[end:snippet_end]
+            + (SNIPPET_ELLIPSIS if snippet_end < len(line) else ""))
+
+def grep_lines(text, pattern, first_line=1, max_hits=GREP_MAX_HITS_PER_FILE):
+    """文字列から一致する行を探す（1行に複数の一致があっても最初の1つだけ）
+    
+    Returns:
+        list: (行番号, 抜粋) のリスト
+    """
+    hits = []
+    line_number = first_line
+    counted = 0
+    position = 0
+    # 末尾の改行の後ろは行ではないので探さない（空文字列に一致する正規表現で存在しない行が出ないように）
+    while len(hits) < max_hits and position < len(text):
+        match = pattern.search(text, position)
+        if match is None or (match.start() == len(text) and text.endswith('\n')):
+            break
+        line_start = text.rfind('\n', 0, match.start()) + 1
+        line_end = text.find('\n', match.start())
+        if line_end < 0:
+            line_end = len(text)
+        line_number += text.count('\n', counted, line_start)
+        counted = line_start
+        line = text[line_start:line_end]
+        hits.append((line_number, make_line_snippet(line, match.start() - line_start,
+                                                    min(match.end(), line_end) - line_start)))
+        position = line_end + 1
+    return hits
+
+def count_lines(block):
+    """バイト列の改行の数（decode_memo_bytes()と同じく、CRLF・CRも1つの改行と数える）"""
+    return block.count(b'\n') + block.count(b'\r') - block.count(b'\r\n')
+
+def grep_file(file_path, grep_query, should_abort=None, max_hits=GREP_MAX_HITS_PER_FILE, block_size=GREP_BLOCK_SIZE):
+    """メモをメモリマップして検索し、一致した行を返す（呼び出したスレッドで実行）
+    
+    メモは行の区切りでblock_sizeずつに分けて、検索語を含みうる範囲だけをデコードする。
+    文字コードは先頭から推定し（_load_memo_content_sync()と同じ）、途中で不正なバイトがあれば
+    それ以降はCP932として読む。行をまたぐ一致は探さない。
+    
+    Args:
+        grep_query (tuple): compile_grep_query()の戻り値
+        should_abort (callable): Trueを返したら中断する（その時点までの一致を返す）
+    
+    Returns:
+        list: dict(path, title, line, snippet) のリスト
+    
+    Raises:
+        OSError: メモを読めない場合
+    """
+    pattern, needles = grep_query
+    title = os.path.splitext(os.path.basename(file_path))[0]
+    hits = []
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return hits
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if needles and not any(needle.search(buffer) for needle in needles):
+                return hits
+            encoding = detect_memo_encoding(buffer[:ENCODING_PROBE_SIZE])
+            line_number = 1
+            start = 0
+            while start < size and len(hits) < max_hits:
+                if should_abort and should_abort():
+                    break
+                end = size
+                if start + block_size < size:
+                    newline = buffer.rfind(b'\n', start, start + block_size)
+                    if newline < 0:
+                        # 1行がblock_sizeより長い場合は行末まで含める
+                        newline = buffer.find(b'\n', start + block_size)
+                    if newline >= 0:
+                        end = newline + 1
+                block = buffer[start:end]
+                if needles and not any(needle.search(buffer, start, end) for needle in needles):
+                    line_number += count_lines(block)
+                else:
+                    text, encoding = decode_memo_bytes(block, encoding)
+                    for line, snippet in grep_lines(text, pattern, line_number, max_hits - len(hits)):
+                        hits.append({'path': file_path, 'title': title, 'line': line, 'snippet': f"{line}行: {snippet}"})
+                    line_number += text.count('\n')
+                start = end
+    return hits
+
+class GrepWalkTask(QRunnable):
+    """メモの一覧を走査し、見つけた分から照合のタスクを投入するタスク"""
+    
+    def __init__(self, searcher, generation, grep_query):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.searcher = searcher
+        self.generation = generation
+        self.grep_query = grep_query
+    
+    def run(self):
+        chunks = 0
+        chunk = []
+        for file_path in iter_memo_paths(self.searcher.root):
+            if self.searcher.generation != self.generation:
+                return
+            chunk.append(file_path)
+            if len(chunk) >= GREP_CHUNK_FILES:
+                self.searcher.thread_pool.start(GrepFilesTask(self.searcher, self.generation, self.grep_query, chunk))
+                chunks += 1
+                chunk = []
+        if chunk:
+            self.searcher.thread_pool.start(GrepFilesTask(self.searcher, self.generation, self.grep_query, chunk))
+            chunks += 1
+        self.searcher._walk_done.emit(self.generation, chunks)
+
+class GrepFilesTask(QRunnable):
+    """メモをいくつか照合し、一致した行をメモごとに送るタスク"""
+    
+    def __init__(self, searcher, generation, grep_query, file_paths):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.searcher = searcher
+        self.generation = generation
+        self.grep_query = grep_query
+        self.file_paths = file_paths
+    
+    def is_stale(self):
+        return self.searcher.generation != self.generation
+    
+    def run(self):
+        files = 0
+        for file_path in self.file_paths:
+            if self.is_stale():
+                return
+            try:
+                hits = grep_file(file_path, self.grep_query, self.is_stale)
+            except (OSError, ValueError) as e:
+                print(f"WARNING: grep検索でメモを読めませんでした: {file_path}: {e}")
+                hits = []
+            files += 1
+            if hits and not self.is_stale():
+                self.searcher._hits_ready.emit(self.generation, hits)
+        self.searcher._chunk_done.emit(self.generation, files)
+
+class GrepSearcher(QObject):
+    """全メモのgrep検索をスレッドプールで実行し、一致した行を見つかった順に通知する
+    
+    一覧の走査と照合を並行させ、照合はGREP_CHUNK_FILES件ずつのタスクに分ける。遅いメモがあっても、
+    他のメモの一致はそのメモの照合が終わった時点で届く。新しい検索を始めるかcancel()すると世代が変わり、
+    未着手のタスクは捨て、実行中のタスクは次のメモ（大きなメモは次のブロック）で止まる。
+    古い世代の結果はGUIスレッドで捨てるため、取り消した後にシグナルが届くことはない。
+    正規表現の照合はGILを手放さないため、スレッドはファイルの読み込みを重ねる分だけ速くなる。
+    """
+    
+    hits_found = pyqtSignal(object)  # grep_file()の戻り値（一致があったメモ1件分）
+    search_finished = pyqtSignal(object)  # dict(files, hits, elapsed)
+    _hits_ready = pyqtSignal(int, object)  # 以下は作業スレッドからGUIスレッドへの受け渡し用
+    _chunk_done = pyqtSignal(int, int)
+    _walk_done = pyqtSignal(int, int)
+    
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(GREP_THREADS)
+        self.generation = 0
+        self._progress = None  # 実行中の検索の集計
+        self._hits_ready.connect(self._on_hits_ready)
+        self._chunk_done.connect(self._on_chunk_done)
+        self._walk_done.connect(self._on_walk_done)
+    
+    @property
+    def is_searching(self):
+        return self._progress is not None
+    
+    def start(self, query, is_regex=False, case_sensitive=False):
+        """検索を開始（実行中の検索は取り消す）
+        
+        Raises:
+            re.error: 正規表現が正しくない場合（実行中の検索は取り消される）
+        """
+        self.cancel()
+        grep_query = compile_grep_query(query, is_regex, case_sensitive)
+        self._progress = {'started': time.perf_counter(), 'files': 0, 'hits': 0, 'chunks': None, 'chunks_done': 0}
+        self.thread_pool.start(GrepWalkTask(self, self.generation, grep_query))
+    
+    def cancel(self):
+        """実行中の検索を取り消す（GUIスレッドで呼ぶ）"""
+        self.generation += 1
+        self.thread_pool.clear()
+        self._progress = None
+    
+    def wait(self, timeout_ms=-1):
+        """実行中のタスクの終了を待つ
+        
+        Returns:
+            bool: 終了した場合True
+        """
+        return self.thread_pool.waitForDone(timeout_ms)
+    
+    def _on_hits_ready(self, generation, hits):
+        if generation == self.generation and self._progress is not None:
+            self._progress['hits'] += len(hits)
+            self.hits_found.emit(hits)
+    
+    def _on_chunk_done(self, generation, files):
+        if generation == self.generation and self._progress is not None:
+            self._progress['files'] += files
+            self._progress['chunks_done'] += 1
+            self._finish_if_done()
+    
+    def _on_walk_done(self, generation, chunks):
+        if generation == self.generation and self._progress is not None:
+            self._progress['chunks'] = chunks
+            self._finish_if_done()
+    
+    def _finish_if_done(self):
+        progress = self._progress
+        if progress['chunks'] is None or progress['chunks_done'] < progress['chunks']:
+            return
+        self._progress = None
+        stats = {'files': progress['files'], 'hits': progress['hits'],
+                 'elapsed': time.perf_counter() - progress['started']}
+        if ENABLE_DEBUG_OUTPUT:
+            print(f"DEBUG: grep検索が完了しました: {stats['files']}件中 {stats['hits']}行が一致 ({stats['elapsed'] * 1000:.0f}ms)")
+        self.search_finished.emit(stats)
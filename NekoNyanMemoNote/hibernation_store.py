@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import zlib
+from collections import OrderedDict
+
+from .constants import HIBERNATION_MEMORY_BUDGET_MB
+
+def compression_level_for_size(raw_size):
+    """内容のサイズに応じたzlibの圧縮レベル（大きいものほど速度を優先）"""
+    if raw_size < 256 * 1024:
+        return 6
+    if raw_size < 4 * 1024 * 1024:
+        return 3
+    return 1
+
+class HibernationStore:
+    """非アクティブなタブの内容を圧縮して保持するストア
+    
+    内容はUTF-8にエンコードしてzlibで圧縮し、カーソル・スクロール位置などの状態と一緒に持つ。
+    圧縮後の合計がメモリ上限を超えたら、最も前に退避したものから一時ファイルに書き出す。
+    GUIスレッドからのみ使う。
+    """
+    
+    def __init__(self, memory_budget_bytes=HIBERNATION_MEMORY_BUDGET_MB * 1024 * 1024):
+        self.memory_budget_bytes = memory_budget_bytes
+        self._entries = OrderedDict()  # ファイルパス -> エントリ（古いものが先頭）
+        self._memory_bytes = 0
+        self._spill_file = None
+        self._spill_live_bytes = 0
+    
+    def __contains__(self, file_path):
+        return file_path in self._entries
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def __delitem__(self, file_path):
+        self.discard(file_path)
+    
+    def put(self, file_path, content, cursor_pos=0, scroll_pos=0, modified=False):
+        """タブの内容と状態を圧縮して退避"""
+        self.discard(file_path)
+        raw = content.encode('utf-8')
+        data = zlib.compress(raw, compression_level_for_size(len(raw)))
+        self._entries[file_path] = {
+            'data': data,  # 一時ファイルに書き出した場合はNone
+            'offset': 0,
+            'length': len(data),
+            'raw_size': len(raw),
+            'cursor_pos': cursor_pos,
+            'scroll_pos': scroll_pos,
+            'modified': modified,
+        }
+        self._memory_bytes += len(data)
+        self._spill_over_budget()
+    
+    def take(self, file_path):
+        """退避した内容と状態を取り出して削除
+        
+        Returns:
+            dict or None: content, cursor_pos, scroll_pos, modified
+        """
+        state = self.peek(file_path)
+        if state is not None:
+            self.discard(file_path)
+        return state
+    
+    def peek(self, file_path):
+        """退避した内容と状態を削除せずに取得
+        
+        Returns:
+            dict or None: content, cursor_pos, scroll_pos, modified
+        """
+        entry = self._entries.get(file_path)
+        if entry is None:
+            return None
+        return {
+            'content': self._decompress(entry),
+            'cursor_pos': entry['cursor_pos'],
+            'scroll_pos': entry['scroll_pos'],
+            'modified': entry['modified'],
+        }
+    
+    def paths(self):
+        """退避中のファイルパスの一覧"""
+        return list(self._entries)
+    
+    def modified_paths(self):
+        """未保存の変更を含む退避中のファイルパスの一覧"""
+        return [file_path for file_path, entry in self._entries.items() if entry['modified']]
+    
+    def mark_saved(self, file_path):
+        """退避中の内容を保存済みとして記録"""
+        entry = self._entries.get(file_path)
+        if entry is not None:
+            entry['modified'] = False
+    
+    def discard(self, file_path):
+        """退避した内容を破棄"""
+        entry = self._entries.pop(file_path, None)
+        if entry is None:
+            return
+        if entry['data'] is not None:
+            self._memory_bytes -= entry['length']
+        else:
+            self._spill_live_bytes -= entry['length']
+            if not self._spill_live_bytes:
+                # 書き出したものがすべて不要になったら一時ファイルを空にする
+                self._spill_file.truncate(0)
+    
+    def clear(self):
+        """すべて破棄し、一時ファイルを閉じる"""
+        self._entries.clear()
+        self._memory_bytes = 0
+        self._spill_live_bytes = 0
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+    
+    def get_statistics(self):
+        """使用量の統計を取得
+        
+        Returns:
+            dict: entries, raw_bytes（圧縮前）, compressed_bytes（圧縮後の合計）,
+                  memory_bytes（メモリ上）, spilled_bytes / spilled_entries（一時ファイル上）
+        """
+        entries = self._entries.values()
+        return {
+            'entries': len(self._entries),
+            'raw_bytes': sum(entry['raw_size'] for entry in entries),
+            'compressed_bytes': sum(entry['length'] for entry in entries),
+            'memory_bytes': self._memory_bytes,
+            'spilled_bytes': self._spill_live_bytes,
+            'spilled_entries': sum(1 for entry in entries if entry['data'] is None),
+        }
+    
+    def _decompress(self, entry):
+        data = entry['data']
+        if data is None:
+            self._spill_file.seek(entry['offset'])
+            data = self._spill_file.read(entry['length'])
+        return zlib.decompress(data).decode('utf-8')
+    
+    def _spill_over_budget(self):
+        """メモリ上限を超えた分を古いものから一時ファイルに書き出す"""
+        for entry in self._entries.values():
+            if self._memory_bytes <= self.memory_budget_bytes:
+                break
+            if entry['data'] is None:
+                continue
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile(prefix="nekonyan_hibernation_")
+            self._spill_file.seek(0, os.SEEK_END)
+            entry['offset'] = self._spill_file.tell()
+            self._spill_file.write(entry['data'])
+            self._spill_file.flush()
+            entry['data'] = None
+            self._memory_bytes -= entry['length']
+            self._spill_live_bytes += entry['length']
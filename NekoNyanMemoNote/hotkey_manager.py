@@ -218,7 +218,19 @@ class HotkeyManager(QObject):
         self.hotkey_worker.start()
         print("グローバルホットキーが有効になりました (Ctrl+Shift+M)")
     
-    def stop_hotkey_listener(self):
+    def request_stop(self):
+        """ホットキーリスナーに停止要求だけを送る（終了を待たない）
+        
+        終了処理で他の後始末と並行してスレッドを止めるために使い、
+        その後stop_hotkey_listener()で終了を待つ。
+        """
+        if self.hotkey_worker:
+            try:
+                self.hotkey_worker.stop()
+            except Exception as e:
+                print(f"HotkeyWorker停止要求エラー: {e}")
+    
+    def stop_hotkey_listener(self, timeout_ms=2000):
         """ホットキーリスナーの停止（QThread版）"""
         print("DEBUG: ホットキーリスナーの停止を開始...")
         
@@ -228,8 +240,8 @@ class HotkeyManager(QObject):
                 # ワーカーに停止要求を送信
                 self.hotkey_worker.stop()
                 
-                # QThreadの終了を待機（長めに設定）
-                if self.hotkey_worker.wait(2000):  # 2秒待機
+                # QThreadの終了を待機
+                if self.hotkey_worker.wait(timeout_ms):
                     print("DEBUG: HotkeyWorkerが正常に終了しました")
                 else:
                     print("WARNING: HotkeyWorkerが指定時間内に終了しませんでした。強制終了します。")
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import os
+from collections import OrderedDict, deque
+
+from .constants import TAB_MEMORY_BUDGET_MB, DOCUMENT_BLOCK_OVERHEAD_BYTES, MEMORY_GOVERNOR_HISTORY
+
+def estimate_document_bytes(document):
+    """ドキュメントが使うメモリの概算（文字はUTF-16で2バイト、ブロックごとに管理領域を見込む）"""
+    return document.characterCount() * 2 + document.blockCount() * DOCUMENT_BLOCK_OVERHEAD_BYTES
+
+class MemoryGovernor:
+    """すべてのタブのドキュメントが使うメモリを上限内に保つ
+    
+    タブごとのドキュメントの大きさと最後に表示した順番を記録し、合計が上限を超えたら
+    最も長く表示していないタブから追い出す。
+      - 未保存の変更がある: 内容を圧縮してHibernationStoreに退避
+      - 変更がない: ドキュメントを捨て、次に表示したときにディスクから読み直す
+    GUIスレッドからのみ使う。
+    """
+    
+    def __init__(self, store, budget_bytes=TAB_MEMORY_BUDGET_MB * 1024 * 1024):
+        self.store = store
+        self.budget_bytes = budget_bytes  # 0で無制限
+        self._recent = OrderedDict()  # エディタ -> 推定バイト数（最近表示したものが末尾）
+        self._dropped = {}  # エディタ -> 読み直すときに戻すカーソル・スクロール位置
+        self._tracked_bytes = 0
+        self.decisions = deque(maxlen=MEMORY_GOVERNOR_HISTORY)  # (ファイル名, 'compressed' / 'dropped', 解放したバイト数)
+        self.compressed_count = 0
+        self.dropped_count = 0
+    
+    def set_budget(self, budget_bytes):
+        """上限を変更（次のenforce()から反映）"""
+        self.budget_bytes = max(0, budget_bytes)
+    
+    def touch(self, editor):
+        """タブが表示されたことを記録"""
+        self._recent[editor] = estimate_document_bytes(editor.content_document())
+        self._recent.move_to_end(editor)
+    
+    def is_dropped(self, editor):
+        return editor in self._dropped
+    
+    def take_dropped(self, editor):
+        """破棄したタブの読み直しに使う状態を取り出す
+        
+        Returns:
+            dict or None: cursor_pos, scroll_pos
+        """
+        return self._dropped.pop(editor, None)
+    
+    def enforce(self, editors, current=None):
+        """合計が上限を超えていれば、最も長く表示していないタブから追い出す
+        
+        Args:
+            editors (list): 現在タブにあるエディタ（ここにないエディタの記録は捨てる）
+            current (MemoTextEdit): 表示中のエディタ（追い出さない）
+        
+        Returns:
+            list: 今回の判断 (ファイル名, 'compressed' / 'dropped', 解放したバイト数)
+        """
+        live = set(editors)
+        for editor in [editor for editor in self._recent if editor not in live]:
+            del self._recent[editor]
+        for editor in [editor for editor in self._dropped if editor not in live]:
+            del self._dropped[editor]
+        
+        for editor in editors:
+            if editor not in self._recent:
+                # まだ表示していないタブは最も古い扱いにする
+                self._recent[editor] = 0
+                self._recent.move_to_end(editor, last=False)
+            self._recent[editor] = estimate_document_bytes(editor.content_document())
+        self._tracked_bytes = sum(self._recent.values())
+        
+        decisions = []
+        if not self.budget_bytes or self._tracked_bytes <= self.budget_bytes:
+            return decisions
+        for editor in list(self._recent):
+            if self._tracked_bytes <= self.budget_bytes:
+                break
+            if editor is current or editor.content_document().isEmpty():
+                continue
+            decision = self._evict(editor)
+            if decision is None:
+                continue
+            freed = self._recent[editor] - estimate_document_bytes(editor.content_document())
+            self._recent[editor] -= freed
+            self._tracked_bytes -= freed
+            decisions.append((decision[0], decision[1], freed))
+            self.decisions.append(decisions[-1])
+        return decisions
+    
+    def _evict(self, editor):
+        """タブのドキュメントを追い出す（読み込み中・閲覧モード中・ファイルのないタブは対象外）"""
+        file_path = editor.file_path
+        if not file_path:
+            return None
+        if not editor.is_hibernated and not editor.hibernate_document():
+            return None
+        state = editor.release_document()
+        if state['modified']:
+            self.store.put(file_path, state['content'], state['cursor_pos'], state['scroll_pos'], True)
+            self.compressed_count += 1
+            action = 'compressed'
+        else:
+            self._dropped[editor] = {'cursor_pos': state['cursor_pos'], 'scroll_pos': state['scroll_pos']}
+            self.dropped_count += 1
+            action = 'dropped'
+        return os.path.basename(file_path), action
+    
+    def get_statistics(self):
+        """直近のenforce()時点の使用量と追い出しの統計を取得
+        
+        Returns:
+            dict: budget_bytes, tracked_bytes, tabs, dropped_tabs, compressed, dropped, last_decision
+        """
+        return {
+            'budget_bytes': self.budget_bytes,
+            'tracked_bytes': self._tracked_bytes,
+            'tabs': len(self._recent),
+            'dropped_tabs': len(self._dropped),
+            'compressed': self.compressed_count,
+            'dropped': self.dropped_count,
+            'last_decision': self.decisions[-1] if self.decisions else None,
+        }
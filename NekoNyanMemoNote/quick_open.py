@@ -0,0 +1,371 @@
+# -*- coding: utf-8 -*-
+
+import heapq
+import os
+import time
+from bisect import bisect_right
+from itertools import accumulate, chain, repeat
+from operator import add
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from .constants import (
+    QUICK_OPEN_RESULT_LIMIT, QUICK_OPEN_MAX_CANDIDATES, QUICK_OPEN_MAX_FILTERED, QUICK_OPEN_SCAN_REBUILD_CHANGES,
+    ENABLE_DEBUG_OUTPUT
+)
+from .file_system import normalize_path_for_comparison, FileChangeNotifier
+from .search_index import collect_memo_paths, MEMO_EXTENSIONS
+from .text_fold import fold_text
+
+EMPTY_POSTING = frozenset()
+
+def name_trigrams(name):
+    """名前の3文字ずつの組（重複なし）"""
+    return {name[i:i + 3] for i in range(len(name) - 2)}
+
+def name_grams(name):
+    """名前の2文字・3文字ずつの組（重複なし、索引の見出し）"""
+    return {name[i:i + size] for size in (2, 3) for i in range(len(name) - size + 1)}
+
+def is_subsequence(token, name):
+    """tokenの文字がこの順でnameに現れるか（間が空いてもよい）"""
+    position = 0
+    for char in token:
+        position = name.find(char, position) + 1
+        if not position:
+            return False
+    return True
+
+def score_match(name, token):
+    """メモ名と検索語1つの一致度（大きいほど上位）"""
+    position = name.find(token)
+    if position == 0:
+        return 300 if len(name) == len(token) else 200
+    if position > 0:
+        # 区切り文字の直後の一致は単語の先頭として扱う
+        return 150 if not name[position - 1].isalnum() else 100
+    # 部分一致しない場合（タイプミス・語順違い）は共通する3文字の組の割合で評価する
+    grams = name_trigrams(token)
+    shared = sum(1 for gram in grams if gram in name) / len(grams) if grams else 0.0
+    return 60 * shared + (20 if is_subsequence(token, name) else 0)
+
+class MemoNameIndex:
+    """メモ名のtrigram索引（メモリ上）
+    
+    名前（拡張子なし、fold_text()で折りたたんだもの）を2文字・3文字ずつに分けて、組ごとにそれを含むメモのIDを持つ。
+    3文字以上の検索語はすべての3文字の組を含むメモ、2文字の語はその組を含むメモに集合演算で絞ってから
+    順位を付ける。1文字の語は短い順に並べてつないだ名前を先頭から探し、一定数で打ち切る。
+    つないだ名前は追加・削除のたびには作り直さず、その後に追加したメモは別に照合し、削除したメモは読み飛ばす
+    （変更がQUICK_OPEN_SCAN_REBUILD_CHANGESを超えたら、検索のときではなく変更を反映するときに作り直す）。
+    IDは削除したメモの分を使い回し、名前の配列は詰めない。
+    """
+    
+    def __init__(self):
+        self._paths = []  # ID -> パス（削除済みはNone）
+        self._titles = []  # ID -> 表示用のメモ名
+        self._names = []  # ID -> 照合用のメモ名（折りたたんだもの、削除済みは空文字列）
+        self._ids = {}  # 正規化パス -> ID
+        self._free_ids = []
+        self._postings = {}  # 2文字・3文字の組 -> IDのset
+        self._lengths = {}  # 名前の長さ -> IDのset（候補が多すぎる場合に短い名前から選ぶ）
+        self._initials = {}  # 名前の先頭の1文字 -> IDのset
+        self._scan_text = None  # 1文字の語の検索用（つないだ名前, 各名前の開始位置, ID）
+        self._scan_added = set()  # つないだ名前を作った後に追加したメモのID
+        self._scan_removed = set()  # つないだ名前のうち、削除した（IDを使い回した）メモのID
+    
+    def __len__(self):
+        return len(self._ids)
+    
+    def build(self, root, should_abort=None):
+        """フォルダ以下のメモをすべて登録
+        
+        Args:
+            root (str): メモのルートフォルダ
+            should_abort (callable): Trueを返したら中断する
+        
+        Returns:
+            dict: memos, elapsed, aborted
+        """
+        started = time.perf_counter()
+        stats = {'memos': 0, 'elapsed': 0.0, 'aborted': False}
+        for file_path in collect_memo_paths(root):
+            if should_abort and should_abort():
+                stats['aborted'] = True
+                break
+            self.add(file_path)
+        self._prepare_scan()
+        stats['memos'] = len(self._ids)
+        stats['elapsed'] = time.perf_counter() - started
+        return stats
+    
+    def add(self, file_path):
+        """メモを登録（登録済みなら何もしない）"""
+        if not file_path.lower().endswith(MEMO_EXTENSIONS):
+            return
+        path_key = normalize_path_for_comparison(file_path)
+        if path_key in self._ids:
+            return
+        title = os.path.splitext(os.path.basename(file_path))[0]
+        name, _ = fold_text(title)
+        if self._free_ids:
+            memo_id = self._free_ids.pop()
+            self._paths[memo_id], self._titles[memo_id], self._names[memo_id] = file_path, title, name
+        else:
+            memo_id = len(self._paths)
+            self._paths.append(file_path)
+            self._titles.append(title)
+            self._names.append(name)
+        self._ids[path_key] = memo_id
+        for gram in name_grams(name):
+            self._postings.setdefault(gram, set()).add(memo_id)
+        self._lengths.setdefault(len(name), set()).add(memo_id)
+        if name:
+            self._initials.setdefault(name[0], set()).add(memo_id)
+        if self._scan_text is not None:
+            self._scan_added.add(memo_id)
+            self._rebuild_scan_if_stale()
+    
+    def remove(self, path):
+        """メモを削除（フォルダならその下のメモをすべて削除）
+        
+        Returns:
+            int: 削除したメモの数
+        """
+        path_keys = self._keys_under(normalize_path_for_comparison(path))
+        for path_key in path_keys:
+            memo_id = self._ids.pop(path_key)
+            name = self._names[memo_id]
+            for gram in name_grams(name):
+                self._discard(self._postings, gram, memo_id)
+            self._discard(self._lengths, len(name), memo_id)
+            if name:
+                self._discard(self._initials, name[0], memo_id)
+            self._paths[memo_id], self._titles[memo_id], self._names[memo_id] = None, "", ""
+            self._free_ids.append(memo_id)
+            if self._scan_text is not None:
+                self._scan_added.discard(memo_id)
+                self._scan_removed.add(memo_id)
+        if path_keys and self._scan_text is not None:
+            self._rebuild_scan_if_stale()
+        return len(path_keys)
+    
+    def rename(self, old_path, new_path):
+        """名前変更を反映（フォルダの場合は名前が変わらないため、パスだけを書き換える）"""
+        old_key = normalize_path_for_comparison(old_path)
+        if old_key in self._ids:
+            self.remove(old_path)
+            self.add(new_path)
+            return
+        new_key = normalize_path_for_comparison(new_path)
+        for path_key in self._keys_under(old_key):
+            memo_id = self._ids.pop(path_key)
+            path = self._paths[memo_id]
+            # 正規化しても長さは変わらないため、末尾の相対部分を元のパスから切り出せる
+            self._paths[memo_id] = new_path + path[len(path) - (len(path_key) - len(old_key)):]
+            self._ids[new_key + path_key[len(old_key):]] = memo_id
+    
+    def apply_change(self, kind, path, old_path=""):
+        """FileChangeNotifierの通知を反映"""
+        if kind == FileChangeNotifier.DELETED:
+            self.remove(path)
+        elif kind == FileChangeNotifier.RENAMED:
+            self.rename(old_path, path)
+        elif os.path.isdir(path):
+            for file_path in collect_memo_paths(path):
+                self.add(file_path)
+        else:
+            self.add(path)
+    
+    def search(self, query, limit=QUICK_OPEN_RESULT_LIMIT):
+        """メモ名をあいまい検索し、一致度の高い順に返す
+        
+        空白区切りの語はすべて含むもの（AND）を長い語から探す。3文字以上の語はtrigramで候補を絞り、
+        1件もなければ組の半分以上を含む名前（タイプミスなど）を候補にする。
+        
+        Returns:
+            list: dict(path, title, snippet) のリスト（snippetは空文字列。全文検索の結果と同じ形）
+        """
+        tokens = fold_text(query)[0].split()
+        if not tokens:
+            return []
+        candidates = None
+        for token in sorted(tokens, key=len, reverse=True):
+            candidates = self._match_token(token, candidates)
+            if not candidates:
+                return []
+        if len(candidates) > QUICK_OPEN_MAX_CANDIDATES:
+            # 候補が多すぎる場合（ありふれた語など）は短い名前から順位を付ける
+            candidates = self._shortest(candidates, QUICK_OPEN_MAX_CANDIDATES)
+        
+        names = self._names
+        ranked = heapq.nsmallest(limit, ((-sum(score_match(names[memo_id], token) for token in tokens),
+                                          len(names[memo_id]), names[memo_id], memo_id)
+                                         for memo_id in candidates))
+        return [{'path': self._paths[memo_id], 'title': self._titles[memo_id], 'snippet': ""}
+                for _, _, _, memo_id in ranked]
+    
+    def _match_token(self, token, candidates):
+        """語を含む（3文字以上ならあいまいに一致する）メモのIDを絞り込む"""
+        if len(token) == 1:
+            if candidates is None:
+                return self._scan_char(token, QUICK_OPEN_MAX_CANDIDATES)
+            if len(candidates) > QUICK_OPEN_MAX_FILTERED:
+                candidates = self._shortest(candidates, QUICK_OPEN_MAX_FILTERED)
+            return {memo_id for memo_id in candidates if token in self._names[memo_id]}
+        if len(token) == 2:
+            matched = self._postings.get(token, EMPTY_POSTING)
+            return set(matched) if candidates is None else candidates & matched
+        
+        postings = sorted((self._postings.get(gram, EMPTY_POSTING) for gram in name_trigrams(token)), key=len)
+        matched = set(postings[0]).intersection(*postings[1:])
+        if candidates is not None:
+            matched &= candidates
+        if not matched and len(postings) >= 2:
+            # 一致しない場合は、組の半分以上を含む名前（タイプミスなど）を候補にする。
+            # 半分以上を含む名前は、含むメモの少ない組から（組の数 - 必要な数 + 1）個のどれかを必ず含む
+            required = (len(postings) + 1) // 2
+            pool = set().union(*postings[:len(postings) - required + 1])
+            if candidates is not None:
+                pool &= candidates
+            if len(pool) > QUICK_OPEN_MAX_FILTERED:
+                pool = self._shortest(pool, QUICK_OPEN_MAX_FILTERED)
+            grams = name_trigrams(token)
+            matched = {memo_id for memo_id in pool if sum(gram in self._names[memo_id] for gram in grams) >= required}
+        return matched
+    
+    def _prepare_scan(self):
+        """1文字の語の検索用に、名前を短い順に改行でつないだ文字列と各名前の開始位置を作る"""
+        ids = list(chain.from_iterable(self._lengths[length] for length in sorted(self._lengths)))
+        names = list(map(self._names.__getitem__, ids))
+        starts = list(accumulate(map(add, map(len, names), repeat(1)), initial=1))[:-1]
+        self._scan_text = ("\n" + "\n".join(names), starts, ids)
+        self._scan_added = set()
+        self._scan_removed = set()
+    
+    def _rebuild_scan_if_stale(self):
+        """つないだ名前を作った後の追加・削除が多くなったら作り直す"""
+        if len(self._scan_added) + len(self._scan_removed) > max(QUICK_OPEN_SCAN_REBUILD_CHANGES, len(self._ids) // 8):
+            self._prepare_scan()
+    
+    def _scan_char(self, token, count):
+        """1文字の語を含む名前を、先頭で一致するもの・短いものから最大count件集める"""
+        found = set(self._initials.get(token, EMPTY_POSTING))
+        if len(found) >= count:
+            return self._shortest(found, count)
+        if self._scan_text is None:
+            self._prepare_scan()
+        text, starts, ids = self._scan_text
+        removed = self._scan_removed
+        position = text.find(token)
+        while position >= 0 and len(found) < count:
+            index = bisect_right(starts, position) - 1
+            if ids[index] not in removed:
+                found.add(ids[index])
+            # 同じ名前の中で続けて一致しても1件なので、次の名前から探す
+            next_start = starts[index + 1] if index + 1 < len(starts) else len(text)
+            position = text.find(token, next_start)
+        if self._scan_added:
+            found.update(memo_id for memo_id in self._scan_added if token in self._names[memo_id])
+            if len(found) > count:
+                found = self._shortest(found, count)
+        return found
+    
+    def _shortest(self, ids, count):
+        """IDのうち名前の短いものからcount件を選ぶ"""
+        picked = []
+        for length in sorted(self._lengths):
+            picked.extend(self._lengths[length] & ids)
+            if len(picked) >= count:
+                break
+        return set(picked[:count])
+    
+    def _discard(self, postings, key, memo_id):
+        posting = postings[key]
+        posting.discard(memo_id)
+        if not posting:
+            del postings[key]
+    
+    def _keys_under(self, path_key):
+        """パス（フォルダならその下のメモも含む）の正規化パスを列挙"""
+        if path_key in self._ids:
+            return [path_key]
+        prefix = path_key.rstrip(os.sep) + os.sep
+        return [key for key in self._ids if key.startswith(prefix)]
+
+class MemoNameIndexBuildTask(QRunnable):
+    """メモ名の索引の作成をスレッドプール上で実行するタスク"""
+    
+    def __init__(self, indexer):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.indexer = indexer
+    
+    def run(self):
+        index = MemoNameIndex()
+        stats = index.build(self.indexer.root, lambda: self.indexer._abort_requested)
+        if not stats['aborted']:
+            self.indexer._build_done.emit(index, stats)
+
+class MemoNameIndexer(QObject):
+    """クイックオープン用のメモ名の索引を保持し、変更の通知で更新する
+    
+    起動時の作成だけを専用のスレッドで行い、できた索引をGUIスレッドで差し替える。
+    作成中に届いた変更は差し替えた後に反映する。以後はFileChangeNotifierの通知だけで更新し、走査し直さない。
+    """
+    
+    build_finished = pyqtSignal(object)  # MemoNameIndex.build()の統計
+    _build_done = pyqtSignal(object, object)  # 作成スレッドからGUIスレッドへの受け渡し用
+    
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.index = MemoNameIndex()
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+        self.is_building = False
+        self._abort_requested = False
+        self._pending_changes = []
+        self._build_done.connect(self._on_build_done)
+    
+    def start_build(self):
+        """索引の作成を開始（作成中なら何もしない）
+        
+        Returns:
+            bool: 開始した場合True
+        """
+        if self.is_building:
+            return False
+        self.is_building = True
+        self.thread_pool.start(MemoNameIndexBuildTask(self))
+        return True
+    
+    def cancel(self):
+        """作成を中断（終了時用）"""
+        self._abort_requested = True
+    
+    def wait(self, timeout_ms=-1):
+        """作成の終了を待つ
+        
+        Returns:
+            bool: 終了した場合True
+        """
+        return self.thread_pool.waitForDone(timeout_ms)
+    
+    def on_file_changed(self, kind, path, old_path=""):
+        """FileChangeNotifier.file_changedを受けて索引を更新（GUIスレッドで呼ぶ）"""
+        if self.is_building:
+            self._pending_changes.append((kind, path, old_path))
+        else:
+            self.index.apply_change(kind, path, old_path)
+    
+    def search(self, query, limit=QUICK_OPEN_RESULT_LIMIT):
+        return self.index.search(query, limit)
+    
+    def _on_build_done(self, index, stats):
+        self.index = index
+        self.is_building = False
+        for change in self._pending_changes:
+            index.apply_change(*change)
+        self._pending_changes = []
+        if ENABLE_DEBUG_OUTPUT:
+            print(f"DEBUG: メモ名の索引を作成しました: {stats['memos']}件 ({stats['elapsed']:.2f}秒)")
+        self.build_finished.emit(stats)
@@ -0,0 +1,564 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import os
+import sqlite3
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from .constants import (
+    SEARCH_INDEX_MAX_FILE_SIZE, SEARCH_INDEX_BATCH_SIZE, SEARCH_INDEX_UPDATE_DELAY_MS,
+    SEARCH_INDEX_PARALLEL_MIN_FILES, SEARCH_INDEX_SCAN_PROCESSES, SEARCH_INDEX_SCAN_CHUNK,
+    SEARCH_RESULT_LIMIT, SEARCH_SNIPPET_TOKENS, ENABLE_DEBUG_OUTPUT
+)
+from .file_system import decode_memo_bytes, normalize_path_for_comparison, FileChangeNotifier, ProgressThrottle
+from .text_fold import fold_text, original_position
+
+SEARCH_INDEX_SCHEMA_VERSION = 2
+MEMO_EXTENSIONS = ('.txt',)
+SNIPPET_OPEN = "【"
+SNIPPET_CLOSE = "】"
+SNIPPET_ELLIPSIS = "…"
+
+def fts5_trigram_available():
+    """このPythonのSQLiteでFTS5のtrigramトークナイザ（SQLite 3.34以降）が使えるか"""
+    try:
+        with closing(sqlite3.connect(":memory:")) as connection:
+            connection.execute("CREATE VIRTUAL TABLE probe USING fts5(body, tokenize='trigram')")
+        return True
+    except sqlite3.Error:
+        return False
+
+def build_search_terms(query):
+    """検索語をFTS5の検索式とLIKEのパターンに分ける
+    
+    trigramは3文字以上の語でしか索引を引けないため、2文字以下の語はLIKEで絞り込む。
+    空白区切りの語はすべて含むもの（AND）を探す。
+    
+    Returns:
+        tuple: (FTS5の検索式 or None, LIKEのパターンのリスト, 2文字以下の語のリスト)
+    """
+    phrases, patterns, short_terms = [], [], []
+    for term in query.split():
+        if len(term) >= 3:
+            phrases.append('"' + term.replace('"', '""') + '"')
+        else:
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            patterns.append(f"%{escaped}%")
+            short_terms.append(term)
+    return (" AND ".join(phrases) or None), patterns, short_terms
+
+def iter_memo_paths(root):
+    """フォルダ以下のメモのパスを見つけた順に返すジェネレータ（隠しファイル・隠しフォルダは除く）"""
+    for dir_path, dir_names, file_names in os.walk(root):
+        dir_names[:] = [name for name in dir_names if not name.startswith(".")]
+        for name in file_names:
+            if name.lower().endswith(MEMO_EXTENSIONS) and not name.startswith("."):
+                yield os.path.join(dir_path, name)
+
+def collect_memo_paths(root):
+    """フォルダ以下のメモのパスを集める（隠しファイル・隠しフォルダは除く）"""
+    return list(iter_memo_paths(root))
+
+def read_memo_for_index(file_path):
+    """索引用にメモを読んでデコードし、検索用に折りたたんだ本文も作る（ワーカープロセスからも呼ぶ）
+    
+    Returns:
+        tuple: (パス, サイズ, 更新時刻, 本文, 折りたたんだ本文と位置の対応, エラー)
+               読めなかった場合は本文がNoneでエラーに理由が入る
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            file_stat = os.fstat(f.fileno())
+            body = ""
+            if file_stat.st_size <= SEARCH_INDEX_MAX_FILE_SIZE:
+                body, _ = decode_memo_bytes(f.read())
+        folded, offsets = fold_text(body)
+        return file_path, file_stat.st_size, file_stat.st_mtime_ns, body, (folded, offsets and offsets.tobytes()), None
+    except OSError as e:
+        return file_path, 0, 0, None, None, str(e)
+
+def read_memo_batch(file_paths):
+    """ワーカープロセスでまとめてメモを読む（プロセス間の受け渡しを減らすため数百件ずつ）"""
+    return [read_memo_for_index(file_path) for file_path in file_paths]
+
+def default_scan_processes():
+    """メモを読むプロセス数（GUIと索引の書き込み用に1コア残す）"""
+    return max(1, min(SEARCH_INDEX_SCAN_PROCESSES, (os.cpu_count() or 1) - 1))
+
+def read_memos_in_processes(file_paths, processes, chunk_size=SEARCH_INDEX_SCAN_CHUNK):
+    """複数のプロセスでメモを読み、読めた順にread_memo_for_index()と同じ形で返すジェネレータ
+    
+    デコードはCPUを使うため、スレッドではなくプロセスに分ける。途中で閉じると未着手の分は取り消す。
+    プロセスを起動できない・異常終了した場合は、残りをこのスレッドで読む。
+    """
+    remaining = set(file_paths)
+    # GUIのスレッドが動いているプロセスをforkしないよう、どのOSでもspawnで起動する
+    executor = None
+    try:
+        executor = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+        futures = [executor.submit(read_memo_batch, file_paths[i:i + chunk_size])
+                   for i in range(0, len(file_paths), chunk_size)]
+        for future in as_completed(futures):
+            for result in future.result():
+                remaining.discard(result[0])
+                yield result
+    except (OSError, BrokenProcessPool) as e:
+        print(f"WARNING: 複数プロセスでの読み込みに失敗したため、残り{len(remaining)}件を順に読みます: {e}")
+        for file_path in file_paths:
+            if file_path in remaining:
+                yield read_memo_for_index(file_path)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def make_snippet(text, folded, offsets, terms, context_chars=SEARCH_SNIPPET_TOKENS // 2):
+    """折りたたんだ本文で最初に現れる語の前後を決め、元の本文の対応する箇所を切り出して語を括弧で囲む
+    
+    Args:
+        text (str): 元の本文
+        folded (str): fold_text()で折りたたんだ本文
+        offsets (array): fold_text()が返した位置の対応
+        terms (list): 折りたたんだ検索語
+    """
+    found = [(position, term) for position, term in ((folded.find(term), term) for term in terms) if position >= 0]
+    if not found:
+        # ファイル名だけで一致した場合は本文の先頭を返す
+        return text[:context_chars * 2]
+    position, term = min(found)
+    start = max(0, position - context_chars)
+    end = min(len(folded), position + len(term) + context_chars)
+    
+    # 抜粋の範囲にある語をすべて括弧で囲む（重なる語はまとめる）
+    spans = []
+    for term in terms:
+        hit = folded.find(term, start, end)
+        while hit >= 0:
+            spans.append((hit, hit + len(term)))
+            hit = folded.find(term, hit + len(term), end)
+    merged = []
+    for hit_start, hit_end in sorted(spans):
+        if merged and hit_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], hit_end)
+        else:
+            merged.append([hit_start, hit_end])
+    
+    snippet_start = original_position(offsets, start)
+    snippet_end = original_position(offsets, end, is_end=True)
+    pieces = [SNIPPET_ELLIPSIS if snippet_start > 0 else ""]
+    cursor = snippet_start
+    for hit_start, hit_end in merged:
+        hit_start = original_position(offsets, hit_start)
+        hit_end = original_position(offsets, hit_end, is_end=True)
+        pieces += [text[cursor:hit_start], SNIPPET_OPEN, text[hit_start:hit_end], SNIPPET_CLOSE]
+        cursor = hit_end
+    pieces += [text[cursor:snippet_end], SNIPPET_ELLIPSIS if snippet_end < len(text) else ""]
+    return "".join(pieces)
+
+class SearchIndex:
+    """メモの全文検索索引（SQLite FTS5、trigramトークナイザ）
+    
+    ファイル名（拡張子なし）と本文を索引し、空白で区切らない日本語も部分一致で検索できる。
+    索引するのはfold_text()で折りたたんだ影の文字列で、全角・半角、ひらがな・カタカナ、大文字・小文字を
+    区別せずに一致する。元の本文と位置の対応は別のテーブルに持ち、抜粋は元の本文から切り出す。
+    メモごとにサイズと更新時刻を記録し、変わったものだけを索引し直す。
+    起動時はbuild()で全体を突き合わせ、その後はapply_changes()で変更されたメモだけを反映する。
+    接続はスレッドごとに作る（検索はGUIスレッド、作成はSearchIndexerのスレッド）。
+    WALモードのため、作成中も検索できる。
+    """
+    
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._connection = None  # GUIスレッドでの検索用
+    
+    def connect(self):
+        """索引のデータベースに接続し、必要ならテーブルを作る"""
+        connection = sqlite3.connect(self.db_path, timeout=5)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        if connection.execute("PRAGMA user_version").fetchone()[0] != SEARCH_INDEX_SCHEMA_VERSION:
+            # 形式が変わった索引は作り直す（内容はメモから再作成できる）
+            with connection:
+                connection.execute("DROP TABLE IF EXISTS memos")
+                connection.execute("DROP TABLE IF EXISTS memo_text")
+                connection.execute("DROP TABLE IF EXISTS memo_source")
+                connection.execute(
+                    "CREATE TABLE memos (id INTEGER PRIMARY KEY, path_key TEXT UNIQUE NOT NULL,"
+                    " path TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL)")
+                connection.execute("CREATE VIRTUAL TABLE memo_text USING fts5(title, body, tokenize='trigram')")
+                # 抜粋用の元の本文（短い語をLIKEで探すときに読まずに済むよう、索引とは分ける）
+                connection.execute("CREATE TABLE memo_source (id INTEGER PRIMARY KEY, body TEXT NOT NULL, offsets BLOB)")
+                connection.execute(f"PRAGMA user_version={SEARCH_INDEX_SCHEMA_VERSION}")
+        return connection
+    
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+    
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """メモを検索し、関連度の高い順に返す
+        
+        Returns:
+            list: dict(path, title, snippet) のリスト
+        """
+        # 検索語だけを折りたたむ（メモは索引するときに折りたたみ済み）
+        folded_query, _ = fold_text(query)
+        match, patterns, _ = build_search_terms(folded_query)
+        if match is None and not patterns:
+            return []
+        if self._connection is None:
+            self._connection = self.connect()
+        
+        conditions, params = [], []
+        if match is not None:
+            conditions.append("memo_text MATCH ?")
+            params.append(match)
+        for pattern in patterns:
+            conditions.append("(memo_text.title LIKE ? ESCAPE '\\' OR memo_text.body LIKE ? ESCAPE '\\')")
+            params.extend((pattern, pattern))
+        # タイトルの一致を本文より重く見る。索引を引けない短い語だけの場合は新しいメモから返す
+        order = "bm25(memo_text, 5.0, 1.0)" if match is not None else "memos.mtime_ns DESC"
+        sql = ("SELECT memos.path, memo_text.body, memo_source.body, memo_source.offsets"
+               " FROM memo_text JOIN memos ON memos.id = memo_text.rowid JOIN memo_source ON memo_source.id = memos.id"
+               f" WHERE {' AND '.join(conditions)} ORDER BY {order} LIMIT ?")
+        params.append(limit)
+        
+        terms = folded_query.split()
+        results = []
+        for path, folded_body, body, offsets in self._connection.execute(sql, params):
+            snippet = make_snippet(body, folded_body, offsets and array('i', offsets), terms)
+            results.append({'path': path, 'title': os.path.splitext(os.path.basename(path))[0],
+                            'snippet': snippet.replace("\n", " ")})
+        return results
+    
+    def get_statistics(self):
+        """索引の統計を取得
+        
+        Returns:
+            dict: memos（索引済みのメモ数）, db_bytes（データベースのサイズ）
+        """
+        if self._connection is None:
+            self._connection = self.connect()
+        memos = self._connection.execute("SELECT count(*) FROM memos").fetchone()[0]
+        db_bytes = sum(os.path.getsize(self.db_path + suffix)
+                       for suffix in ("", "-wal") if os.path.exists(self.db_path + suffix))
+        return {'memos': memos, 'db_bytes': db_bytes}
+    
+    def build(self, root, should_abort=None, progress_callback=None, processes=None):
+        """フォルダ以下のメモと索引を突き合わせ、変わったメモだけを索引し直す（呼び出したスレッドで実行）
+        
+        まずサイズと更新時刻だけで変わったメモを選び、それが多い場合（初回の作成など）は
+        複数のプロセスで読んでデコードする。索引への書き込みはこのスレッドでまとめて行う。
+        
+        Args:
+            root (str): メモのルートフォルダ
+            should_abort (callable): Trueを返したら中断する（それまでの分は確定済みで、次回はその続きから）
+            progress_callback (callable): progress_callback(処理済みのメモ数, 全体のメモ数)
+            processes (int): メモを読むプロセス数（省略時は読み直すメモの数とCPUのコア数から決める）
+        
+        Returns:
+            dict: files, indexed, removed, elapsed, aborted, processes
+        """
+        started = time.perf_counter()
+        paths = collect_memo_paths(root)
+        stats = {'files': len(paths), 'indexed': 0, 'removed': 0, 'elapsed': 0.0, 'aborted': False, 'processes': 1}
+        
+        with closing(self.connect()) as connection:
+            known = {path_key: (memo_id, size, mtime_ns) for memo_id, path_key, size, mtime_ns
+                     in connection.execute("SELECT id, path_key, size, mtime_ns FROM memos")}
+            targets = {}  # 読み直すメモのパス -> (正規化パス, 記録のID)
+            for file_path in paths:
+                if should_abort and should_abort():
+                    stats['aborted'] = True
+                    break
+                path_key = normalize_path_for_comparison(file_path)
+                # 残ったものがなくなったメモになる
+                record = known.pop(path_key, None)
+                try:
+                    file_stat = os.stat(file_path)
+                except OSError as e:
+                    print(f"WARNING: 検索索引に追加できませんでした: {file_path}: {e}")
+                    continue
+                if record is None or record[1:] != (file_stat.st_size, file_stat.st_mtime_ns):
+                    targets[file_path] = (path_key, record and record[0])
+            
+            if not stats['aborted'] and targets:
+                if processes is None:
+                    processes = default_scan_processes() if len(targets) >= SEARCH_INDEX_PARALLEL_MIN_FILES else 1
+                stats['processes'] = processes
+                if processes > 1:
+                    results = read_memos_in_processes(list(targets), processes)
+                else:
+                    results = map(read_memo_for_index, targets)
+                done = len(paths) - len(targets)
+                pending = 0
+                try:
+                    for file_path, size, mtime_ns, body, shadow, error in results:
+                        if should_abort and should_abort():
+                            stats['aborted'] = True
+                            break
+                        done += 1
+                        if error is not None:
+                            print(f"WARNING: 検索索引に追加できませんでした: {file_path}: {error}")
+                        else:
+                            path_key, memo_id = targets[file_path]
+                            self._store_memo(connection, file_path, path_key, memo_id, size, mtime_ns, body, shadow)
+                            stats['indexed'] += 1
+                            pending += 1
+                        if pending >= SEARCH_INDEX_BATCH_SIZE:
+                            connection.commit()
+                            pending = 0
+                        if progress_callback:
+                            progress_callback(done, len(paths))
+                finally:
+                    if hasattr(results, 'close'):
+                        # 中断した場合は、まだ読んでいない分を取り消す
+                        results.close()
+            if not stats['aborted']:
+                # なくなったメモを索引から消す
+                for memo_id, _, _ in known.values():
+                    self._delete_memo(connection, memo_id)
+                    stats['removed'] += 1
+            connection.commit()
+        stats['elapsed'] = time.perf_counter() - started
+        return stats
+    
+    def apply_changes(self, changes):
+        """FileChangeNotifierの通知を索引に反映（呼び出したスレッドで実行）
+        
+        保存・作成されたメモはサイズか更新時刻が変わっていれば読み直す。名前変更は本文を読み直さず
+        パスとタイトルだけを書き換え、フォルダの削除・名前変更はその下のメモにもまとめて反映する。
+        
+        Args:
+            changes (list): (種類, パス, 変更前のパス) のリスト（通知された順）
+        
+        Returns:
+            dict: indexed, renamed, removed, elapsed
+        """
+        started = time.perf_counter()
+        stats = {'indexed': 0, 'renamed': 0, 'removed': 0, 'elapsed': 0.0}
+        with closing(self.connect()) as connection:
+            for kind, path, old_path in changes:
+                try:
+                    if kind == FileChangeNotifier.DELETED:
+                        stats['removed'] += self._remove_path(connection, path)
+                        continue
+                    if kind == FileChangeNotifier.RENAMED:
+                        stats['renamed'] += self._rename_path(connection, old_path, path)
+                    # 名前変更でも、まだ索引していなかったメモはここで追加する
+                    stats['indexed'] += self._update_path(connection, path)
+                except OSError as e:
+                    print(f"WARNING: 検索索引を更新できませんでした: {path}: {e}")
+            connection.commit()
+        stats['elapsed'] = time.perf_counter() - started
+        return stats
+    
+    def _records_under(self, connection, path_key):
+        """パス（フォルダならその下のメモも含む）の索引の記録を取得"""
+        prefix = path_key.rstrip(os.sep) + os.sep
+        return connection.execute(
+            "SELECT id, path_key, path FROM memos WHERE path_key = ? OR substr(path_key, 1, ?) = ?",
+            (path_key, len(prefix), prefix)).fetchall()
+    
+    def _remove_path(self, connection, path):
+        records = self._records_under(connection, normalize_path_for_comparison(path))
+        for memo_id, _, _ in records:
+            self._delete_memo(connection, memo_id)
+        return len(records)
+    
+    def _rename_path(self, connection, old_path, new_path):
+        """索引の記録のパスを書き換え（本文はそのまま）"""
+        old_key = normalize_path_for_comparison(old_path)
+        new_key = normalize_path_for_comparison(new_path)
+        if new_key != old_key:
+            # 変更先に古い記録が残っていると一意制約に反するため先に消す
+            self._remove_path(connection, new_path)
+        records = self._records_under(connection, old_key)
+        for memo_id, path_key, record_path in records:
+            # 正規化しても長さは変わらないため、末尾の相対部分を元のパスから切り出せる
+            relative_length = len(path_key) - len(old_key)
+            relative_path = record_path[len(record_path) - relative_length:] if relative_length else ""
+            connection.execute("UPDATE memos SET path_key = ?, path = ? WHERE id = ?",
+                               (new_key + path_key[len(old_key):], new_path + relative_path, memo_id))
+            if not relative_length:
+                title = os.path.splitext(os.path.basename(new_path))[0]
+                connection.execute("UPDATE memo_text SET title = ? WHERE rowid = ?", (fold_text(title)[0], memo_id))
+        return len(records)
+    
+    def _update_path(self, connection, path):
+        """メモ（フォルダならその下のメモ）のうち、サイズか更新時刻が変わったものを索引し直す"""
+        if os.path.isdir(path):
+            paths = collect_memo_paths(path)
+        elif os.path.isfile(path) and path.lower().endswith(MEMO_EXTENSIONS):
+            paths = [path]
+        else:
+            # 既になくなっていれば、後に続く削除・名前変更の通知で反映される
+            return 0
+        indexed = 0
+        for file_path in paths:
+            path_key = normalize_path_for_comparison(file_path)
+            file_stat = os.stat(file_path)
+            record = connection.execute("SELECT id, size, mtime_ns FROM memos WHERE path_key = ?",
+                                        (path_key,)).fetchone()
+            if record is None or record[1:] != (file_stat.st_size, file_stat.st_mtime_ns):
+                _, size, mtime_ns, body, shadow, error = read_memo_for_index(file_path)
+                if error is not None:
+                    raise OSError(error)
+                self._store_memo(connection, file_path, path_key, record and record[0], size, mtime_ns, body, shadow)
+                indexed += 1
+        return indexed
+    
+    def _store_memo(self, connection, file_path, path_key, memo_id, size, mtime_ns, body, shadow):
+        """読んだメモを索引に追加（memo_idがあれば置き換え）
+        
+        shadowはread_memo_for_index()が作った (折りたたんだ本文, 位置の対応のバイト列 or None)
+        """
+        title = os.path.splitext(os.path.basename(file_path))[0]
+        folded_body, offsets = shadow
+        if memo_id is None:
+            memo_id = connection.execute(
+                "INSERT INTO memos (path_key, path, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                (path_key, file_path, size, mtime_ns)).lastrowid
+        else:
+            connection.execute("UPDATE memos SET path = ?, size = ?, mtime_ns = ? WHERE id = ?",
+                               (file_path, size, mtime_ns, memo_id))
+            connection.execute("DELETE FROM memo_text WHERE rowid = ?", (memo_id,))
+        connection.execute("INSERT INTO memo_text (rowid, title, body) VALUES (?, ?, ?)",
+                           (memo_id, fold_text(title)[0], folded_body))
+        connection.execute("INSERT OR REPLACE INTO memo_source (id, body, offsets) VALUES (?, ?, ?)",
+                           (memo_id, body, offsets))
+    
+    def _delete_memo(self, connection, memo_id):
+        connection.execute("DELETE FROM memo_text WHERE rowid = ?", (memo_id,))
+        connection.execute("DELETE FROM memo_source WHERE id = ?", (memo_id,))
+        connection.execute("DELETE FROM memos WHERE id = ?", (memo_id,))
+
+class SearchIndexBuildTask(QRunnable):
+    """索引の作成をスレッドプール上で実行するタスク"""
+    
+    def __init__(self, indexer):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.indexer = indexer
+    
+    def run(self):
+        self.indexer._run_build()
+
+class SearchIndexUpdateTask(QRunnable):
+    """通知された変更の索引への反映をスレッドプール上で実行するタスク"""
+    
+    def __init__(self, indexer, changes):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.indexer = indexer
+        self.changes = changes
+    
+    def run(self):
+        self.indexer._run_update(self.changes)
+
+class SearchIndexer(QObject):
+    """検索索引の作成・更新をバックグラウンドで実行する
+    
+    起動を妨げないよう専用のスレッドで1件ずつ索引し、進捗と完了をシグナルで通知する。
+    起動後の変更はFileChangeNotifierの通知を少しの間まとめ、変更されたメモだけを同じスレッドで反映する
+    （スレッドが1本のため、作成中に届いた変更は作成の後に反映される）。
+    """
+    
+    build_progress = pyqtSignal(int, int)  # 処理済みのメモ数, 全体のメモ数
+    build_finished = pyqtSignal(object)  # SearchIndex.build()の統計（失敗時はNone）
+    index_updated = pyqtSignal(object)  # SearchIndex.apply_changes()の統計（失敗時はNone）
+    
+    def __init__(self, index, root, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.root = root
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+        self.is_building = False
+        self._abort_requested = False
+        
+        # 保存などの通知をまとめて反映する
+        self._pending_changes = []
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(SEARCH_INDEX_UPDATE_DELAY_MS)
+        self.update_timer.timeout.connect(self._submit_changes)
+    
+    def start_build(self):
+        """索引の作成を開始（作成中なら何もしない）
+        
+        Returns:
+            bool: 開始した場合True
+        """
+        if self.is_building:
+            return False
+        self.is_building = True
+        self._abort_requested = False
+        self.thread_pool.start(SearchIndexBuildTask(self))
+        return True
+    
+    def on_file_changed(self, kind, path, old_path=""):
+        """FileChangeNotifier.file_changedを受けて索引の更新を予約（GUIスレッドで呼ぶ）"""
+        if self._abort_requested:
+            return
+        self._pending_changes.append((kind, path, old_path))
+        if not self.update_timer.isActive():
+            self.update_timer.start()
+    
+    def cancel(self):
+        """作成を中断（索引済みの分は残り、次回はその続きから）
+        
+        反映していない変更は捨てる（次回起動時の突き合わせで索引される）。
+        """
+        self._abort_requested = True
+        self.update_timer.stop()
+        self._pending_changes = []
+    
+    def wait(self, timeout_ms=-1):
+        """作成の終了を待つ
+        
+        Returns:
+            bool: 終了した場合True
+        """
+        return self.thread_pool.waitForDone(timeout_ms)
+    
+    def _submit_changes(self):
+        changes, self._pending_changes = self._pending_changes, []
+        if changes and not self._abort_requested:
+            self.thread_pool.start(SearchIndexUpdateTask(self, changes))
+    
+    def _run_update(self, changes):
+        stats = None
+        try:
+            stats = self.index.apply_changes(changes)
+            if ENABLE_DEBUG_OUTPUT:
+                print(f"DEBUG: 検索索引に変更を反映しました: {stats['indexed']}件を索引, {stats['renamed']}件を名前変更,"
+                      f" {stats['removed']}件を削除 ({stats['elapsed'] * 1000:.1f}ms)")
+        except sqlite3.Error as e:
+            print(f"!!! ERROR: 検索索引の更新に失敗しました: {e}")
+        finally:
+            self.index_updated.emit(stats)
+    
+    def _run_build(self):
+        throttle = ProgressThrottle()
+        
+        def report(current, total):
+            if throttle.ready(current, total):
+                self.build_progress.emit(current, total)
+        
+        stats = None
+        try:
+            stats = self.index.build(self.root, lambda: self._abort_requested, report)
+            if ENABLE_DEBUG_OUTPUT:
+                print(f"DEBUG: 検索索引を更新しました: {stats['files']}件中 {stats['indexed']}件を索引,"
+                      f" {stats['removed']}件を削除 ({stats['elapsed']:.2f}秒, {stats['processes']}プロセス)")
+        except (OSError, sqlite3.Error) as e:
+            print(f"!!! ERROR: 検索索引の作成に失敗しました: {e}")
+        finally:
+            self.is_building = False
+            self.build_finished.emit(stats)
@@ -3,7 +3,7 @@
 import json
 from PyQt6.QtCore import QSettings
 from PyQt6.QtWidgets import QApplication
-from .constants import APP_NAME, DEFAULT_FONT_SIZE
+from .constants import APP_NAME, DEFAULT_FONT_SIZE, WINDOWED_VIEW_THRESHOLD_MB, SHUTDOWN_FLUSH_DEADLINE_MS, CONTENT_CACHE_BUDGET_MB, HIBERNATION_MODE, HIBERNATION_MODES, TAB_MEMORY_BUDGET_MB
 from .config_validator import ConfigValidator
 from .interfaces import ISettingsManager
 
@@ -89,6 +89,47 @@ class SettingsManager(ISettingsManager):
         """テーマモードの設定"""
         self.settings.setValue("themeMode", mode)
     
+    def get_windowed_view_threshold_mb(self):
+        """閲覧モードで開くファイルサイズのしきい値（MB）の取得"""
+        return max(1, self.settings.value("largeFile/windowedViewThresholdMB", WINDOWED_VIEW_THRESHOLD_MB, type=int))
+    
+    def set_windowed_view_threshold_mb(self, threshold_mb):
+        """閲覧モードで開くファイルサイズのしきい値（MB）の設定"""
+        self.settings.setValue("largeFile/windowedViewThresholdMB", threshold_mb)
+    
+    def get_shutdown_flush_deadline_ms(self):
+        """終了時に未保存のメモの書き込みを待つ最大時間（ミリ秒）の取得"""
+        return max(0, self.settings.value("shutdown/flushDeadlineMS", SHUTDOWN_FLUSH_DEADLINE_MS, type=int))
+    
+    def set_shutdown_flush_deadline_ms(self, deadline_ms):
+        """終了時に未保存のメモの書き込みを待つ最大時間（ミリ秒）の設定"""
+        self.settings.setValue("shutdown/flushDeadlineMS", deadline_ms)
+    
+    def get_content_cache_budget_mb(self):
+        """メモ内容キャッシュの上限（MB、0で無効）の取得"""
+        return max(0, self.settings.value("cache/contentCacheBudgetMB", CONTENT_CACHE_BUDGET_MB, type=int))
+    
+    def set_content_cache_budget_mb(self, budget_mb):
+        """メモ内容キャッシュの上限（MB）の設定"""
+        self.settings.setValue("cache/contentCacheBudgetMB", budget_mb)
+    
+    def get_hibernation_mode(self):
+        """非アクティブなタブの休止方式（'swap' または 'compress'）の取得"""
+        mode = self.settings.value("memory/hibernationMode", HIBERNATION_MODE, type=str)
+        return mode if mode in HIBERNATION_MODES else HIBERNATION_MODE
+    
+    def set_hibernation_mode(self, mode):
+        """非アクティブなタブの休止方式の設定"""
+        self.settings.setValue("memory/hibernationMode", mode)
+    
+    def get_tab_memory_budget_mb(self):
+        """タブのドキュメントに使うメモリの上限（MB、0で無制限）の取得"""
+        return max(0, self.settings.value("memory/tabBudgetMB", TAB_MEMORY_BUDGET_MB, type=int))
+    
+    def set_tab_memory_budget_mb(self, budget_mb):
+        """タブのドキュメントに使うメモリの上限（MB）の設定"""
+        self.settings.setValue("memory/tabBudgetMB", budget_mb)
+    
     def load_json_setting(self, key: str, schema_name: str, default_value=None):
         """
         安全なJSON設定読み込み（スキーマ検証付き）
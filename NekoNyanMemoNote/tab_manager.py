@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import os
-from PyQt6.QtWidgets import QTabWidget, QWidget, QMessageBox
+from PyQt6.QtWidgets import QTabWidget, QWidget, QMessageBox, QSplitter
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from .widgets import MemoTextEdit, CustomTabBar
-from .constants import PLUS_TAB_PROPERTY
+from .constants import PLUS_TAB_PROPERTY, HIBERNATION_MODE
+from .hibernation_store import HibernationStore
+from .memory_governor import MemoryGovernor
 from .interfaces import ITabManager
 
 class TabManager(ITabManager):
@@ -16,8 +18,10 @@ class TabManager(ITabManager):
         self._last_selected_normal_tab_index = 0
         
         # メモリ最適化のための非アクティブタブ管理
-        self.inactive_tab_content = {}  # ファイルパス -> {"content": str, "cursor_pos": int, "scroll_pos": int}
+        self.inactive_tab_content = HibernationStore()  # ファイルパス -> 圧縮した内容とカーソル・スクロール位置
         self.memory_optimization_enabled = True  # メモリ最適化の有効/無効フラグ
+        self.hibernation_mode = HIBERNATION_MODE  # 'swap': ドキュメントを切り離す / 'compress': 内容を圧縮して退避
+        self.memory_governor = MemoryGovernor(self.inactive_tab_content)  # タブ全体のメモリ上限を超えたら古いタブから追い出す
     
     def create_tab_widget(self):
         """タブウィジェットの作成"""
@@ -96,8 +100,10 @@ class TabManager(ITabManager):
                 del self.inactive_tab_content[file_path]
                 print(f"DEBUG: タブクローズ - キャッシュ削除: {os.path.basename(file_path)}")
             
-        # 変更があるかチェック
-        if hasattr(widget, 'document') and widget.document().isModified():
+        # 変更があるかチェック（休止中のタブは切り離したドキュメントを見る）
+        editor = self._editor_for(widget)
+        document = editor.content_document() if editor else getattr(widget, 'document', lambda: None)()
+        if document is not None and document.isModified():
             reply = QMessageBox.question(
                 self.parent,
                 "保存確認",
@@ -126,10 +132,10 @@ class TabManager(ITabManager):
             return
             
         # 前のタブを非アクティブ化（メモリ解放）
+        widget = self.tab_widget.widget(index)
         if self.memory_optimization_enabled:
-            self._deactivate_previous_tab()
+            self._deactivate_previous_tab(widget)
             
-        widget = self.tab_widget.widget(index)
         if not widget:
             return
             
@@ -142,9 +148,10 @@ class TabManager(ITabManager):
         # 通常のタブの場合
         self._last_selected_normal_tab_index = index
         
-        # 現在のタブをアクティブ化（メモリ復元）
+        # 現在のタブをアクティブ化（メモリ復元）し、上限を超えていれば古いタブを追い出す
         if self.memory_optimization_enabled:
             self._activate_current_tab(widget)
+            self.enforce_memory_budget()
         
         # ファイルパスをステータスバーに表示
         if hasattr(widget, 'file_path') and hasattr(self.parent, 'status_bar'):
@@ -183,7 +190,15 @@ class TabManager(ITabManager):
         while self.tab_widget.count() > 1:  # "+" タブを残す
             self.close_tab(0)
     
-    def _deactivate_previous_tab(self):
+    def _editor_for(self, widget):
+        """タブのウィジェットからメモのエディタを取得（フォルダタブはスプリッターの右側）"""
+        if isinstance(widget, MemoTextEdit):
+            return widget
+        if isinstance(widget, QSplitter) and widget.count() > 1 and isinstance(widget.widget(1), MemoTextEdit):
+            return widget.widget(1)
+        return None
+    
+    def _deactivate_previous_tab(self, next_widget=None):
         """前のアクティブタブを非アクティブ化（メモリ解放）"""
         if not hasattr(self, '_last_active_index'):
             return
@@ -192,55 +207,105 @@ class TabManager(ITabManager):
         if 0 <= prev_index < self.tab_widget.count():
             prev_widget = self.tab_widget.widget(prev_index)
             
-            # 前のタブが通常のタブ（+タブでない）場合のみ処理
-            if prev_widget and not prev_widget.property(PLUS_TAB_PROPERTY):
-                if isinstance(prev_widget, MemoTextEdit) and hasattr(prev_widget, 'file_path'):
-                    file_path = prev_widget.file_path
-                    if file_path:
-                        # 現在の状態を保存
-                        content = prev_widget.toPlainText()
-                        cursor_pos = prev_widget.textCursor().position()
-                        scroll_pos = prev_widget.verticalScrollBar().value()
-                        
-                        self.inactive_tab_content[file_path] = {
-                            'content': content,
-                            'cursor_pos': cursor_pos,
-                            'scroll_pos': scroll_pos,
-                            'modified': prev_widget.document().isModified()
-                        }
-                        
-                        # メモリ解放（内容をクリア）
-                        prev_widget.clear()
-                        print(f"DEBUG: タブ非アクティブ化 - メモリ解放: {os.path.basename(file_path)}")
+            # 前のタブが通常のタブ（+タブでない）で、これから表示するタブと違う場合のみ処理
+            if not prev_widget or prev_widget is next_widget or prev_widget.property(PLUS_TAB_PROPERTY):
+                return
+            editor = self._editor_for(prev_widget)
+            if not editor or not editor.file_path or editor.is_hibernated:
+                return
+            file_path = editor.file_path
+            
+            if self.hibernation_mode == 'swap':
+                # ドキュメントごと切り離す（テキストの取り出し・再構築をしない）
+                if editor.hibernate_document():
+                    print(f"DEBUG: タブ非アクティブ化 - ドキュメント休止: {os.path.basename(file_path)}")
+                return
+            
+            if editor.windowed_view is not None or editor.progressive_loader.is_loading:
+                return
+            # 現在の状態を保存
+            content = editor.toPlainText()
+            cursor_pos = editor.textCursor().position()
+            scroll_pos = editor.verticalScrollBar().value()
+            
+            self.inactive_tab_content.put(file_path, content, cursor_pos, scroll_pos,
+                                          editor.document().isModified())
+            
+            # メモリ解放（内容をクリア）。空の内容が自動保存されないように保存を止めておく
+            previous_ignore_save = getattr(self.parent, 'ignore_save', False)
+            if self.parent is not None:
+                self.parent.ignore_save = True
+            try:
+                editor.clear()
+            finally:
+                if self.parent is not None:
+                    self.parent.ignore_save = previous_ignore_save
+            print(f"DEBUG: タブ非アクティブ化 - メモリ解放: {os.path.basename(file_path)}")
     
     def _activate_current_tab(self, widget):
         """現在のタブをアクティブ化（メモリ復元）"""
-        if isinstance(widget, MemoTextEdit) and hasattr(widget, 'file_path'):
-            file_path = widget.file_path
-            if file_path and file_path in self.inactive_tab_content:
-                # 保存された状態を復元
-                saved_state = self.inactive_tab_content[file_path]
-                
-                widget.setPlainText(saved_state['content'])
-                
-                # カーソル位置を復元
-                cursor = widget.textCursor()
-                cursor.setPosition(saved_state['cursor_pos'])
-                widget.setTextCursor(cursor)
-                
-                # スクロール位置を復元
-                widget.verticalScrollBar().setValue(saved_state['scroll_pos'])
-                
-                # 変更状態を復元
-                widget.document().setModified(saved_state['modified'])
-                
-                # キャッシュから削除
-                del self.inactive_tab_content[file_path]
-                print(f"DEBUG: タブアクティブ化 - メモリ復元: {os.path.basename(file_path)}")
+        editor = self._editor_for(widget)
+        if editor and editor.is_hibernated:
+            editor.wake_document()
+            print(f"DEBUG: タブアクティブ化 - ドキュメント復帰: {os.path.basename(editor.file_path or '')}")
+        elif editor and editor.file_path and editor.file_path in self.inactive_tab_content:
+            file_path = editor.file_path
+            # 保存された状態を復元（ストアからは取り出した時点で削除される）
+            saved_state = self.inactive_tab_content.take(file_path)
+            
+            previous_ignore_save = getattr(self.parent, 'ignore_save', False)
+            if self.parent is not None:
+                self.parent.ignore_save = True
+            try:
+                editor.setPlainText(saved_state['content'])
+            finally:
+                if self.parent is not None:
+                    self.parent.ignore_save = previous_ignore_save
+            
+            # カーソル位置を復元
+            cursor = editor.textCursor()
+            cursor.setPosition(min(saved_state['cursor_pos'], len(saved_state['content'])))
+            editor.setTextCursor(cursor)
+            
+            # スクロール位置を復元
+            editor.verticalScrollBar().setValue(saved_state['scroll_pos'])
+            
+            # 変更状態を復元
+            editor.document().setModified(saved_state['modified'])
+            
+            print(f"DEBUG: タブアクティブ化 - メモリ復元: {os.path.basename(file_path)}")
+        elif editor and self.memory_governor.is_dropped(editor):
+            # メモリ上限で破棄したドキュメントはディスクから読み直す
+            saved_state = self.memory_governor.take_dropped(editor)
+            if hasattr(self.parent, 'reload_evicted_memo'):
+                self.parent.reload_evicted_memo(editor, saved_state)
+            print(f"DEBUG: タブアクティブ化 - 再読み込み: {os.path.basename(editor.file_path or '')}")
         
         # 現在のインデックスを更新
         self._last_active_index = self.tab_widget.currentIndex()
     
+    def enforce_memory_budget(self):
+        """すべてのタブのドキュメントが上限を超えていれば、最も長く表示していないタブから追い出す
+        
+        Returns:
+            list: 今回の判断 (ファイル名, 'compressed' / 'dropped', 解放したバイト数)
+        """
+        editors = []
+        for i in range(self.tab_widget.count()):
+            editor = self._editor_for(self.tab_widget.widget(i))
+            if editor:
+                editors.append(editor)
+        current = self._editor_for(self.tab_widget.currentWidget())
+        if current:
+            self.memory_governor.touch(current)
+        decisions = self.memory_governor.enforce(editors, current)
+        for file_name, action, freed in decisions:
+            label = "圧縮退避" if action == 'compressed' else "破棄"
+            print(f"DEBUG: メモリ上限によりタブを追い出し({label}): {file_name} ({freed / (1024 * 1024):.1f}MB)")
+        if hasattr(self.parent, 'update_memory_status'):
+            self.parent.update_memory_status()
+        return decisions
+    
     def get_memory_usage_info(self):
         """メモリ使用状況の情報を取得"""
         active_tabs = 0
@@ -252,11 +317,16 @@ class TabManager(ITabManager):
                 if isinstance(widget, MemoTextEdit) and widget.toPlainText():
                     active_tabs += 1
         
+        hibernation_stats = self.inactive_tab_content.get_statistics()
         return {
             'active_tabs': active_tabs,
             'inactive_cached_tabs': inactive_cached_tabs,
             'total_tabs': self.get_tab_count(),
-            'optimization_enabled': self.memory_optimization_enabled
+            'hibernated_raw_bytes': hibernation_stats['raw_bytes'],
+            'hibernated_compressed_bytes': hibernation_stats['compressed_bytes'],
+            'hibernated_spilled_bytes': hibernation_stats['spilled_bytes'],
+            'optimization_enabled': self.memory_optimization_enabled,
+            'governor': self.memory_governor.get_statistics()
         }
     
     def toggle_memory_optimization(self):
@@ -271,7 +341,8 @@ class TabManager(ITabManager):
     
     def _restore_all_cached_content(self):
         """キャッシュされたすべての内容を復元"""
-        for file_path, saved_state in self.inactive_tab_content.items():
+        for file_path in self.inactive_tab_content.paths():
+            saved_state = self.inactive_tab_content.peek(file_path)
             tab_index = self.find_tab_by_file_path(file_path)
             if tab_index != -1:
                 widget = self.tab_widget.widget(tab_index)
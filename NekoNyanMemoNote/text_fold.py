@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+import re
+import unicodedata
+from array import array
+from bisect import bisect_right
+
+# カタカナ（半角はNFKCで全角になってから）をひらがなに寄せる
+KATAKANA_TO_HIRAGANA = {code: code - 0x60 for code in range(0x30A1, 0x30F7)}
+KATAKANA_TO_HIRAGANA.update({0x30FD: 0x309D, 0x30FE: 0x309E})
+ASTRAL_PATTERN = re.compile("[\U00010000-\U0010ffff]")  # 基本多言語面の外の文字（絵文字など）
+
+def fold_char(char):
+    """1文字を検索用に折りたたむ（NFKC、小文字、カタカナをひらがなに）"""
+    return unicodedata.normalize('NFKC', char).lower().translate(KATAKANA_TO_HIRAGANA)
+
+def is_special_fold(folded):
+    """折りたたんだ結果が1文字にならない・前の文字と合成されるか（位置がずれる文字）"""
+    return len(folded) != 1 or unicodedata.combining(folded) != 0
+
+def char_class(codes):
+    """文字コードの集合を正規表現の文字クラスの中身にする（連続する範囲はまとめる）"""
+    ranges = []
+    for code in sorted(codes):
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return "".join(re.escape(chr(first)) if first == last else f"{re.escape(chr(first))}-{re.escape(chr(last))}"
+                   for first, last in ranges)
+
+class FoldTable:
+    """1文字ずつの変換表（str.translateに渡す）
+    
+    基本多言語面の文字は最初に使うときにまとめて求めてリストにし（辞書より速く引ける）、
+    折りたたむと変わる文字を探す正規表現も作る。それ以外の文字（絵文字など）は初めて見たときに求めて覚える。
+    位置がずれる文字は表では変換せずにspecial_foldsに入れ、special_patternで探せるようにする。
+    """
+    
+    def __init__(self):
+        self.basic = None  # 基本多言語面の文字コード -> 折りたたんだ文字列
+        self.astral = {}  # それ以外の文字コード -> 折りたたんだ文字列（見た文字だけ）
+        self.special_folds = {}  # 位置がずれる文字 -> 折りたたんだ文字列
+        self.changing_pattern = None  # 折りたたむと変わる（かもしれない）文字の正規表現
+        self.special_pattern = None  # 位置がずれる文字の正規表現
+        self.segment_pattern = None  # 位置がずれる文字（濁点などは直前の1文字も含める）の正規表現
+    
+    def prepare(self):
+        """基本多言語面の文字の変換をまとめて求める（2回目以降は何もしない）"""
+        if self.basic is not None:
+            return
+        basic, changing = [], []
+        for code in range(0x10000):
+            char = chr(code)
+            # サロゲートは単独では現れないため変換しない
+            folded = char if 0xD800 <= code < 0xE000 else fold_char(char)
+            if is_special_fold(folded):
+                self.special_folds[char] = folded
+                folded = char
+                changing.append(code)
+            elif folded != char:
+                changing.append(code)
+            basic.append(folded)
+        self._compile_special_pattern()
+        # 基本多言語面の外の文字はまだ分からないため、すべて変わるかもしれない文字として扱う
+        self.changing_pattern = re.compile(f"[{char_class(changing)}\U00010000-\U0010ffff]")
+        self.basic = basic
+    
+    def translate(self, text):
+        """1文字ずつ変換（位置がずれる文字はそのまま残す）"""
+        if ASTRAL_PATTERN.search(text) is None:
+            return text.translate(self.basic)
+        return text.translate(self)
+    
+    def __getitem__(self, code):
+        if code < 0x10000:
+            return self.basic[code]
+        folded = self.astral.get(code)
+        if folded is None:
+            char = chr(code)
+            folded = fold_char(char)
+            if is_special_fold(folded):
+                self.special_folds[char] = folded
+                self._compile_special_pattern()
+                folded = char
+            self.astral[code] = folded
+        return folded
+    
+    def _compile_special_pattern(self):
+        marks = {ord(char) for char, folded in self.special_folds.items() if unicodedata.combining(folded[:1] or " ")}
+        others = {ord(char) for char in self.special_folds} - marks
+        self.special_pattern = re.compile(f"[{char_class(marks | others)}]")
+        self.segment_pattern = re.compile("|".join(([f".?[{char_class(marks)}]"] if marks else [])
+                                                   + ([f"[{char_class(others)}]"] if others else [])))
+
+FOLD_TABLE = FoldTable()
+
+def _fold_segment(segment):
+    """位置がずれる文字を含む短い区間を1文字ずつ折りたたみ、濁点などは直前の文字と合成する"""
+    folded = []
+    for char in segment:
+        for part in FOLD_TABLE.special_folds.get(char) or FOLD_TABLE.translate(char):
+            if folded and unicodedata.combining(part):
+                composed = unicodedata.normalize('NFC', folded[-1] + part)
+                if len(composed) == 1:
+                    folded[-1] = composed
+                    continue
+            folded.append(part)
+    return "".join(folded)
+
+def fold_text(text):
+    """文字列を検索用に折りたたみ（全角・半角、ひらがな・カタカナ、大文字・小文字を区別しない形）、
+    元の文字列との位置の対応を返す
+    
+    文字ごとの変換は表にまとめて求めておき、変わる文字がある場合だけstr.translateで変換する。
+    長さの変わる文字（「…」→「...」、半角の「ｶﾞ」→「が」など）がある場合だけ、その箇所を
+    1文字ずつ変換し直して前後の位置を記録する。
+    
+    Returns:
+        tuple: (折りたたんだ文字列, 位置の対応 or None) 対応はoriginal_position()に渡す
+               （Noneなら位置は元の文字列と同じ）
+    """
+    FOLD_TABLE.prepare()
+    # 小文字にするのはまとめて行う（長さが変わる文字があれば1文字ずつの変換に任せる）
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        lowered = text
+    if FOLD_TABLE.changing_pattern.search(lowered) is None:
+        return lowered, None
+    # 位置がずれる文字はそのまま残るため、translatedの位置は元の文字列と同じ
+    translated = FOLD_TABLE.translate(lowered)
+    if FOLD_TABLE.special_pattern.search(lowered) is None:
+        return translated, None
+    
+    parts = []
+    offsets = array('i')  # 長さの変わる区間の (折りたたんだ位置, 元の位置) の組を、区間の前後について並べる
+    last = 0
+    shift = 0
+    for match in FOLD_TABLE.segment_pattern.finditer(lowered):
+        start, end = match.span()
+        parts.append(translated[last:start])
+        segment = _fold_segment(match.group())
+        parts.append(segment)
+        if len(segment) != end - start:
+            if not offsets or offsets[-1] != start:
+                offsets.extend((start + shift, start))
+            shift += len(segment) - (end - start)
+            offsets.extend((end + shift, end))
+        last = end
+    parts.append(translated[last:])
+    return "".join(parts), (offsets or None)
+
+def original_position(offsets, position, is_end=False):
+    """折りたたんだ文字列での位置を元の文字列での位置に変換
+    
+    Args:
+        offsets (array): fold_text()が返した位置の対応（Noneなら位置はそのまま）
+        position (int): 折りたたんだ文字列での位置
+        is_end (bool): 範囲の終わりの位置（1文字が複数の文字になった区間の途中なら、その文字の後ろにする）
+    """
+    if offsets is None:
+        return position
+    index = bisect_right(offsets[0::2], position) - 1
+    if index < 0:
+        return position
+    folded_start, start = offsets[index * 2], offsets[index * 2 + 1]
+    if index * 2 + 2 >= len(offsets):
+        return start + position - folded_start
+    folded_end, end = offsets[index * 2 + 2], offsets[index * 2 + 3]
+    if folded_end - folded_start == end - start:
+        return start + position - folded_start
+    return end if is_end and position > folded_start else start
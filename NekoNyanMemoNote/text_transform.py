@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+
+import re
+import time
+import unicodedata
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QTextCursor
+
+from .constants import TRANSFORM_CHUNK_CHARS, ENABLE_DEBUG_OUTPUT
+from .find_replace import DocumentPositions, apply_replacement
+
+COMPARE_BLOCK_CHARS = 64 * 1024  # 変換前後で変わらない先頭・末尾を探すときに一度に比べる文字数
+# 全角の英数字・記号・空白を半角に（str.translateは日本語を含む文字列では遅いため、該当する箇所だけ変換する）
+FULLWIDTH_TO_HALFWIDTH = {code: code - 0xFEE0 for code in range(0xFF01, 0xFF5F)}
+FULLWIDTH_TO_HALFWIDTH[0x3000] = 0x20
+FULLWIDTH_PATTERN = re.compile("[\uff01-\uff5e\u3000]+")
+HALFWIDTH_KANA_PATTERN = re.compile("[\uff61-\uff9f]+")  # 半角カナ（濁点・句読点を含む）
+
+class TransformAborted(Exception):
+    """変換が取り消された"""
+    pass
+
+class TextTransform:
+    """テキスト変換の基底クラス
+    
+    テキストは行のリストに分けて少しずつfeed()に渡し、最後にfinish()を呼ぶ。
+    どちらも次の変換に渡す行のリストを返す（まとめて処理する変換はfinish()まで溜めておく）。
+    """
+    
+    name = None  # register_transform()で登録する名前
+    label = None  # メニューに表示する名前
+    joins_lines = False  # 行をつなげる変換（以降の変換には行の区切りのない断片が渡る）
+    needs_whole_line = False  # 行全体を見る変換（行をつなげた後なら、つなげ終わった1行を渡す）
+    
+    def feed(self, lines):
+        return lines
+    
+    def finish(self):
+        return []
+
+class RemoveTabsAndNewlines(TextTransform):
+    name = 'remove_tabs_newlines'
+    label = "タブ・改行を削除"
+    joins_lines = True
+    
+    def feed(self, lines):
+        return ["".join(lines).replace('\t', '').replace('\r', '')]
+
+class TrimLines(TextTransform):
+    name = 'trim'
+    label = "行の前後の空白を削除"
+    needs_whole_line = True
+    
+    def feed(self, lines):
+        return [line.strip() for line in lines]
+
+class ConvertWidth(TextTransform):
+    name = 'convert_width'
+    label = "英数字・記号を半角、カナを全角に"
+    cache_limit = 65536  # 変換した箇所を覚えておく数（同じ語は何度も現れるため、変換し直さずに済む）
+    
+    def __init__(self):
+        self.cache = {}
+    
+    def feed(self, lines):
+        # 1行ずつ正規表現を呼ぶより、つなげて1回で置換してから分け直す方が速い
+        text = FULLWIDTH_PATTERN.sub(self._convert, "\n".join(lines))
+        return HALFWIDTH_KANA_PATTERN.sub(self._convert, text).split('\n')
+    
+    def _convert(self, match):
+        run = match.group()
+        converted = self.cache.get(run)
+        if converted is None:
+            if len(self.cache) >= self.cache_limit:
+                self.cache.clear()
+            if run[0] >= '\uff61':
+                # 半角カナは全角に（半角の濁点・半濁点は直前のカナと合成する）
+                converted = unicodedata.normalize('NFKC', run)
+            else:
+                converted = run.translate(FULLWIDTH_TO_HALFWIDTH)
+            self.cache[run] = converted
+        return converted
+
+class DedupeLines(TextTransform):
+    name = 'dedupe'
+    label = "重複した行を削除"
+    needs_whole_line = True
+    
+    def __init__(self):
+        self.seen = set()
+    
+    def feed(self, lines):
+        unique = []
+        for line in lines:
+            if line not in self.seen:
+                self.seen.add(line)
+                unique.append(line)
+        return unique
+
+class SortLines(TextTransform):
+    name = 'sort'
+    label = "行を並べ替え"
+    needs_whole_line = True
+    
+    def __init__(self):
+        self.lines = []
+    
+    def feed(self, lines):
+        self.lines.extend(lines)
+        return []
+    
+    def finish(self):
+        self.lines.sort()
+        return self.lines
+
+TEXT_TRANSFORMS = {}  # 名前 -> 変換のクラス（登録した順）
+
+def register_transform(transform_class):
+    """変換を登録し、TextPipelineで名前を指定して使えるようにする"""
+    TEXT_TRANSFORMS[transform_class.name] = transform_class
+    return transform_class
+
+for _transform_class in (RemoveTabsAndNewlines, TrimLines, ConvertWidth, DedupeLines, SortLines):
+    register_transform(_transform_class)
+
+class TextPipeline:
+    """登録した変換を順に組み合わせ、テキストを行の区切りで分けながら1回で変換する
+    
+    各変換はTRANSFORM_CHUNK_CHARSずつの行を受け取って次の変換に渡すため、変換ごとにテキスト全体を
+    作り直すことはない。並べ替えのようにまとめて処理する変換だけが、すべての行を受け取るまで待つ。
+    """
+    
+    def __init__(self, names):
+        """
+        Raises:
+            KeyError: 登録されていない変換の名前がある場合
+        """
+        self.transform_classes = [TEXT_TRANSFORMS[name] for name in names]
+    
+    @property
+    def label(self):
+        return "・".join(transform_class.label for transform_class in self.transform_classes)
+    
+    def run(self, text, should_abort=None, on_progress=None, chunk_chars=TRANSFORM_CHUNK_CHARS):
+        """テキストを変換する（呼び出したスレッドで実行）
+        
+        末尾の改行は行としては扱わず、行をつなげる変換がなければ変換後にも付ける。
+        
+        Args:
+            should_abort (callable): Trueを返したら中断する
+            on_progress (callable): (変換した文字数, 全体の文字数) で呼ばれる
+        
+        Returns:
+            str: 変換後のテキスト（中断した場合はNone）
+        """
+        stream = self._read_lines(text, should_abort, on_progress, chunk_chars)
+        joined = False
+        for transform_class in self.transform_classes:
+            if joined and transform_class.needs_whole_line:
+                stream = self._join_fragments(stream)
+            stream = self._apply(transform_class(), stream)
+            joined = joined or transform_class.joins_lines
+        
+        parts = []
+        try:
+            for lines in stream:
+                parts.extend(lines)
+        except TransformAborted:
+            return None
+        if joined:
+            return "".join(parts)
+        return "\n".join(parts) + ("\n" if parts and text.endswith('\n') else "")
+    
+    @staticmethod
+    def _read_lines(text, should_abort, on_progress, chunk_chars):
+        position = 0
+        while position < len(text):
+            if should_abort and should_abort():
+                raise TransformAborted()
+            end = text.find('\n', position + chunk_chars)
+            end = len(text) if end < 0 else end + 1
+            lines = text[position:end].split('\n')
+            if text[end - 1] == '\n':
+                lines.pop()  # 区切りの後ろの空文字列
+            position = end
+            if on_progress:
+                on_progress(position, len(text))
+            yield lines
+    
+    @staticmethod
+    def _apply(transform, stream):
+        for lines in stream:
+            lines = transform.feed(lines)
+            if lines:
+                yield lines
+        lines = transform.finish()
+        if lines:
+            yield lines
+    
+    @staticmethod
+    def _join_fragments(stream):
+        yield ["".join(fragment for fragments in stream for fragment in fragments)]
+
+def common_prefix_length(a, b, limit):
+    """2つの文字列の先頭から一致する文字数（limitまで）"""
+    position = 0
+    while position < limit:
+        size = min(COMPARE_BLOCK_CHARS, limit - position)
+        if a[position:position + size] == b[position:position + size]:
+            position += size
+            continue
+        # 異なる文字を含むブロックを半分ずつに絞る
+        while size > 1:
+            half = size // 2
+            if a[position:position + half] == b[position:position + half]:
+                position += half
+                size -= half
+            else:
+                size = half
+        return position
+    return limit
+
+def common_suffix_length(a, b, limit):
+    """2つの文字列の末尾から一致する文字数（limitまで）"""
+    a_end, b_end = len(a), len(b)
+    length = 0
+    while length < limit:
+        size = min(COMPARE_BLOCK_CHARS, limit - length)
+        if a[a_end - length - size:a_end - length] == b[b_end - length - size:b_end - length]:
+            length += size
+            continue
+        while size > 1:
+            half = size // 2
+            if a[a_end - length - half:a_end - length] == b[b_end - length - half:b_end - length]:
+                length += half
+                size -= half
+            else:
+                size = half
+        return length
+    return limit
+
+def changed_range(old, new):
+    """変換前後で変わった範囲を求める
+    
+    Returns:
+        tuple: (範囲の開始, 範囲の終了, 範囲を置き換える文字列) 位置は変換前の文字列での位置
+    """
+    limit = min(len(old), len(new))
+    prefix = common_prefix_length(old, new, limit)
+    suffix = common_suffix_length(old, new, limit - prefix)
+    return prefix, len(old) - suffix, new[prefix:len(new) - suffix]
+
+class TransformTask(QRunnable):
+    """スナップショットを変換し、変わった範囲を求めるタスク（ドキュメントへの反映はGUIスレッドで行う）"""
+    
+    def __init__(self, transformer, generation, text, pipeline):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.transformer = transformer
+        self.generation = generation
+        self.text = text
+        self.pipeline = pipeline
+    
+    def is_stale(self):
+        return self.transformer.generation != self.generation
+    
+    def on_progress(self, done, total):
+        self.transformer._progress_ready.emit(self.generation, done, total)
+    
+    def run(self):
+        started = time.perf_counter()
+        try:
+            transformed = self.pipeline.run(self.text, self.is_stale, self.on_progress)
+        except Exception as e:
+            print(f"!!! ERROR: テキストの変換に失敗しました: {e}")
+            self.transformer._transform_ready.emit(self.generation, {'error': f"テキストの変換に失敗しました: {e}"})
+            return
+        if transformed is None or self.is_stale():
+            return
+        start, end, replaced = changed_range(self.text, transformed)
+        positions = DocumentPositions(self.text)
+        self.transformer._transform_ready.emit(self.generation, {
+            'start': positions.to_document(start), 'end': positions.to_document(end), 'text': replaced,
+            'length': DocumentPositions(transformed).to_document(len(transformed)),
+            'before': len(self.text), 'after': len(transformed), 'started': started})
+
+class TextTransformer(QObject):
+    """選択範囲（なければメモ全体）のテキスト変換を、GUIスレッドを止めずに行う
+    
+    テキストをスナップショットしてスレッドプールで変換し、変わった範囲だけを1つの編集として反映する
+    （Undo 1回で元に戻せる。反映のしかたはすべて置換と同じ）。新しい変換を始めるかcancel()すると世代が変わり、
+    実行中の変換は次の区切りで止まり、古い世代の結果は捨てる。
+    """
+    
+    transform_progress = pyqtSignal(int, int)  # (変換した文字数, 全体の文字数)
+    transform_finished = pyqtSignal(object)  # dict(editor, changed, before, after, elapsed) または dict(editor, error)
+    _progress_ready = pyqtSignal(int, int, int)  # 以下は作業スレッドからGUIスレッドへの受け渡し用
+    _transform_ready = pyqtSignal(int, object)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(1)
+        self.generation = 0
+        self._target = None  # 実行中の変換の (エディタ, ドキュメント, 版, 選択範囲の開始 or None)
+        self._progress_ready.connect(self._on_progress_ready)
+        self._transform_ready.connect(self._on_transform_ready)
+    
+    @property
+    def is_busy(self):
+        return self._target is not None
+    
+    def start(self, editor, names):
+        """エディタの選択範囲（なければメモ全体）の変換を始める（実行中の変換は取り消す）
+        
+        Args:
+            names (list): 順に適用する変換の名前
+        
+        Returns:
+            bool: 始めた場合True（読み取り専用・読み込み中のメモは変換しない）
+        
+        Raises:
+            KeyError: 登録されていない変換の名前がある場合
+        """
+        self.cancel()
+        if editor.isReadOnly() or editor.progressive_loader.is_loading:
+            return False
+        pipeline = TextPipeline(names)
+        document = editor.document()
+        cursor = editor.textCursor()
+        if cursor.hasSelection():
+            # selectedText()は改行をU+2029で返す
+            text = cursor.selectedText().replace('\u2029', '\n')
+            selection_start = cursor.selectionStart()
+        else:
+            text = document.toPlainText()
+            selection_start = None
+        self._target = (editor, document, document.revision(), selection_start)
+        self.thread_pool.start(TransformTask(self, self.generation, text, pipeline))
+        return True
+    
+    def cancel(self):
+        """実行中の変換を取り消す（GUIスレッドで呼ぶ）"""
+        self.generation += 1
+        self.thread_pool.clear()
+        self._target = None
+    
+    def wait(self, timeout_ms=-1):
+        """実行中のタスクの終了を待つ
+        
+        Returns:
+            bool: 終了した場合True
+        """
+        return self.thread_pool.waitForDone(timeout_ms)
+    
+    def _is_target_current(self):
+        """変換を始めた時点からエディタのドキュメントが変わっていないか"""
+        editor, document, revision, _ = self._target
+        try:
+            return editor.document() is document and document.revision() == revision
+        except RuntimeError:
+            # エディタ（タブ）が閉じられた
+            return False
+    
+    def _on_progress_ready(self, generation, done, total):
+        if generation == self.generation and self._target is not None:
+            self.transform_progress.emit(done, total)
+    
+    def _on_transform_ready(self, generation, result):
+        if generation != self.generation or self._target is None:
+            return
+        editor, _, _, selection_start = self._target
+        is_current = self._is_target_current()
+        self._target = None
+        if 'error' in result:
+            result['editor'] = editor
+            self.transform_finished.emit(result)
+            return
+        if not is_current:
+            self.transform_finished.emit({'editor': editor, 'error': "変換中にメモが変更されたため、変換を中止しました"})
+            return
+        
+        changed = result['start'] != result['end'] or result['text'] != ""
+        offset = selection_start or 0
+        if changed:
+            apply_replacement(editor, offset + result['start'], offset + result['end'], result['text'])
+        if selection_start is not None:
+            # 変換した範囲を選択し直す（続けて別の変換をかけられるように）
+            cursor = editor.textCursor()
+            cursor.setPosition(selection_start)
+            cursor.setPosition(selection_start + result['length'], QTextCursor.MoveMode.KeepAnchor)
+            editor.setTextCursor(cursor)
+        stats = {'editor': editor, 'changed': changed, 'before': result['before'], 'after': result['after'],
+                 'elapsed': time.perf_counter() - result['started']}
+        if ENABLE_DEBUG_OUTPUT:
+            print(f"DEBUG: テキストを変換しました: {stats['before']:,} → {stats['after']:,}文字 ({stats['elapsed'] * 1000:.0f}ms)")
+        self.transform_finished.emit(stats)
@@ -1,20 +1,28 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
+import time
 import traceback
+from bisect import bisect_left, bisect_right
+from collections import deque
 from PyQt6.QtWidgets import (
     QWidget, QTextEdit, QTreeView, QTabBar, QTabWidget, QDialog, 
-    QFormLayout, QDialogButtonBox, QLineEdit, QVBoxLayout
+    QFormLayout, QDialogButtonBox, QLineEdit, QVBoxLayout, QScrollBar,
+    QListWidget, QListWidgetItem, QLabel, QHBoxLayout, QCheckBox, QPushButton
 )
 from PyQt6.QtGui import (
     QPainter, QPalette, QColor, QTextCursor, QTextFormat, QFont, 
-    QInputMethodEvent, QTextCharFormat, QFileSystemModel
+    QInputMethodEvent, QTextCharFormat, QFileSystemModel, QTextDocument
 )
 from PyQt6.QtCore import (
-    Qt, QSize, QRect, pyqtSignal, QPoint, QTimer
+    Qt, QSize, QRect, pyqtSignal, QPoint, QTimer, QObject
 )
 
-from .constants import PREEDIT_PROPERTY_ID, PLUS_TAB_PROPERTY, DEFAULT_FONT_SIZE
+from .constants import (
+    PREEDIT_PROPERTY_ID, PLUS_TAB_PROPERTY, DEFAULT_FONT_SIZE, WINDOWED_VIEW_WINDOW_LINES, SEARCH_DEBOUNCE_MS,
+    GREP_MAX_RESULTS, FIND_HIGHLIGHT_PROPERTY_ID, FIND_HIGHLIGHT_LIMIT
+)
 
 # --- DOM更新最適化クラス ---
 class UpdateDebouncer(QTimer):
@@ -57,6 +65,207 @@ class UpdateDebouncer(QTimer):
         except Exception as e:
             print(f"!!! ERROR: Execute updates error: {e}")
 
+# --- 段階的なドキュメント読み込み ---
+class ProgressiveDocumentLoader(QTimer):
+    """ストリーミングで届いたテキストを、UIスレッドの短い時間枠ごとにドキュメントへ追記するクラス
+    
+    最初のチャンクが届いた時点で表示を始め、残りはイベントループの合間に埋めていく。
+    """
+    
+    def __init__(self, editor, slice_ms=8, piece_chars=16 * 1024):
+        super().__init__(editor)
+        self.editor = editor
+        self.slice_ms = slice_ms  # 1回の追記に使うUIスレッド時間の上限
+        self.piece_chars = piece_chars  # 1回のinsertTextで追記する最大文字数
+        self.pending_pieces = deque()
+        self.finished_callback = None
+        self.is_loading = False
+        self._at_start = True
+        
+        self.setInterval(0)
+        self.timeout.connect(self._append_pending)
+    
+    def begin(self):
+        """読み込みを開始（ドキュメントを空にし、読み込み中はUndo履歴を残さない）"""
+        self.stop()
+        self.pending_pieces.clear()
+        self.finished_callback = None
+        self.is_loading = True
+        self._at_start = True
+        self.editor.setUndoRedoEnabled(False)
+        self.editor.document().clear()
+    
+    def append(self, text):
+        """テキストを追記キューに追加"""
+        if not self.is_loading or not text:
+            return
+        # 大きなチャンクは1回の追記が長くならないよう分割
+        for start in range(0, len(text), self.piece_chars):
+            self.pending_pieces.append(text[start:start + self.piece_chars])
+        if not self.isActive():
+            self.start()
+    
+    def finish(self, callback):
+        """キューに残ったテキストを追記し終えたらcallbackを呼ぶ"""
+        if not self.is_loading:
+            return
+        self.finished_callback = callback
+        if not self.isActive():
+            self.start()
+    
+    def abort(self):
+        """読み込みを中止（追記済みの内容はそのまま残す）"""
+        self.stop()
+        self.pending_pieces.clear()
+        self.finished_callback = None
+        if self.is_loading:
+            self.is_loading = False
+            self.editor.setUndoRedoEnabled(True)
+    
+    def _append_pending(self):
+        """時間枠の範囲でキューのテキストをドキュメント末尾に追記"""
+        if self.pending_pieces:
+            deadline = time.perf_counter() + self.slice_ms / 1000
+            cursor = QTextCursor(self.editor.document())
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.beginEditBlock()
+            while self.pending_pieces and time.perf_counter() < deadline:
+                cursor.insertText(self.pending_pieces.popleft())
+            cursor.endEditBlock()
+            
+            if self._at_start:
+                # 先頭に置いたカーソルが追記に押し流されないよう戻す
+                self.editor.moveCursor(QTextCursor.MoveOperation.Start)
+                self._at_start = False
+            if self.pending_pieces:
+                return
+        
+        self.stop()
+        if self.finished_callback:
+            callback = self.finished_callback
+            self.finished_callback = None
+            self.is_loading = False
+            self.editor.setUndoRedoEnabled(True)
+            callback()
+
+# --- 大容量メモの閲覧モード ---
+class WindowedTextView(QObject):
+    """巨大なメモのうち表示位置周辺の行だけをドキュメントに置く閲覧専用ビュー
+    
+    ドキュメントにはwindow_lines行だけを置き、スクロールが端に近づいたらファイルから読み直して窓をずらす。
+    ファイル全体での位置はエディタ右端の専用スクロールバーで表す。
+    """
+    
+    def __init__(self, editor, line_offsets, read_range, window_lines=WINDOWED_VIEW_WINDOW_LINES):
+        super().__init__(editor)
+        self.editor = editor
+        self.line_offsets = line_offsets  # 行頭バイトオフセット（末尾は最終行の終端）
+        self.read_range = read_range  # read_range(start_offset, end_offset) -> str
+        self.window_lines = window_lines
+        self.window_start = 0  # ドキュメント先頭の行番号（0始まり）
+        self.window_end = 0
+        self._updating = False
+        
+        self.scroll_bar = QScrollBar(Qt.Orientation.Vertical, editor)
+        self.scroll_bar.valueChanged.connect(self._on_outer_scroll)
+        editor.verticalScrollBar().valueChanged.connect(self._on_inner_scroll)
+        editor.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        editor.setUndoRedoEnabled(False)
+        self._update_scroll_range()
+        self.scroll_bar.show()
+    
+    @property
+    def total_lines(self):
+        """索引済みの行数"""
+        return len(self.line_offsets) - 1
+    
+    def set_line_offsets(self, line_offsets):
+        """行索引を差し替え（先頭部分だけの索引からファイル全体の索引へ）"""
+        top_line = self.top_line()
+        self.line_offsets = line_offsets
+        self.window_end = -1  # 窓を読み直させる
+        self._update_scroll_range()
+        self.show_line(top_line)
+    
+    def top_line(self):
+        """表示中の先頭行（ファイル全体での0始まりの行番号）"""
+        # ドキュメント余白の分だけ下を調べないと、1つ前のブロックに当たることがある
+        margin = int(self.editor.document().documentMargin())
+        return self.window_start + self.editor.cursorForPosition(QPoint(0, margin)).blockNumber()
+    
+    def show_line(self, line):
+        """指定行が先頭に来るように表示（必要なら窓を読み直す）"""
+        line = max(0, min(line, self.total_lines - 1))
+        start = max(0, min(line - self.window_lines // 3, self.total_lines - self.window_lines))
+        end = min(self.total_lines, start + self.window_lines)
+        
+        self._updating = True
+        try:
+            if (start, end) != (self.window_start, self.window_end):
+                try:
+                    text = self.read_range(self.line_offsets[start], self.line_offsets[end])
+                except OSError as e:
+                    print(f"!!! ERROR: 閲覧モードの読み込みに失敗しました: {e}")
+                    return
+                self.window_start, self.window_end = start, end
+                self.editor.document().setPlainText(text)
+                self.editor.document().setModified(False)
+            document = self.editor.document()
+            block = document.findBlockByNumber(line - start)
+            top = document.documentLayout().blockBoundingRect(block).top()
+            self.editor.verticalScrollBar().setValue(int(top))
+            self.scroll_bar.setValue(line)
+        finally:
+            self._updating = False
+        self.editor.lineNumberArea.update()
+    
+    def layout_scroll_bar(self):
+        """スクロールバーをエディタ右端に配置"""
+        cr = self.editor.contentsRect()
+        width = self.scroll_bar_width()
+        self.scroll_bar.setGeometry(QRect(cr.right() - width + 1, cr.top(), width, cr.height()))
+        self._update_scroll_range()
+    
+    def scroll_bar_width(self):
+        return self.scroll_bar.sizeHint().width()
+    
+    def close(self):
+        """閲覧モードを終了してエディタを通常の状態に戻す"""
+        self.editor.verticalScrollBar().valueChanged.disconnect(self._on_inner_scroll)
+        self.scroll_bar.hide()
+        self.scroll_bar.deleteLater()
+        self.editor.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.editor.setUndoRedoEnabled(True)
+        self.deleteLater()
+    
+    def _update_scroll_range(self):
+        """スクロールバーの範囲をファイル全体の行数に合わせる"""
+        visible_lines = max(1, self.editor.viewport().height() // max(1, self.editor.fontMetrics().height()))
+        self.scroll_bar.blockSignals(True)
+        self.scroll_bar.setRange(0, max(0, self.total_lines - 1))
+        self.scroll_bar.setPageStep(visible_lines)
+        self.scroll_bar.blockSignals(False)
+    
+    def _on_outer_scroll(self, value):
+        """専用スクロールバー操作時：指定行へ移動"""
+        if not self._updating:
+            self.show_line(value)
+    
+    def _on_inner_scroll(self, _value):
+        """ホイール・キー操作によるスクロール時：位置を同期し、窓の端に近づいたらずらす"""
+        if self._updating:
+            return
+        top = self.top_line()
+        self.scroll_bar.blockSignals(True)
+        self.scroll_bar.setValue(top)
+        self.scroll_bar.blockSignals(False)
+        
+        margin = self.window_lines // 6
+        near_start = top - self.window_start < margin and self.window_start > 0
+        near_end = self.window_end - top < margin * 2 and self.window_end < self.total_lines
+        if near_start or near_end:
+            self.show_line(top)
+
 # --- 行番号表示用ウィジェット ---
 class LineNumberArea(QWidget):
     def __init__(self, editor):
@@ -72,7 +281,7 @@ class LineNumberArea(QWidget):
         if not doc:
             return 50  # デフォルト3桁分の幅を確保
         font_metrics = self.fontMetrics() if self.font() else self.codeEditor.fontMetrics()
-        max_num = max(1, doc.blockCount())
+        max_num = max(1, self.codeEditor.total_line_count())
         while max_num >= 10:
             max_num //= 10
             digits += 1
@@ -83,7 +292,9 @@ class LineNumberArea(QWidget):
         return space
     
     def update_width(self):
-        self.codeEditor.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
+        windowed_view = self.codeEditor.windowed_view
+        right_margin = windowed_view.scroll_bar_width() if windowed_view else 0
+        self.codeEditor.setViewportMargins(self.line_number_area_width(), 0, right_margin, 0)
     
     def paintEvent(self, event):
         self.codeEditor.line_number_area_paint_event(event)
@@ -96,20 +307,30 @@ class LineNumberArea(QWidget):
 class MemoTextEdit(QTextEdit):
     def __init__(self, parent=None, file_path=None):
         super().__init__(parent)
+        self.windowed_view = None  # 閲覧モード中はWindowedTextView
+        self._hibernated = None  # 休止中は (切り離したドキュメント, カーソル, 縦スクロール位置, 横スクロール位置)
         self.lineNumberArea = LineNumberArea(self)
         self.file_path = file_path
         self.is_loaded = False
+        self.find_matches = None  # 検索で一致した範囲 (開始位置のarray, 終了位置のarray)
         
         # デバウンシング機能の初期化
         self.update_debouncer = UpdateDebouncer(delay_ms=50, parent=self)
         self.line_highlight_debouncer = UpdateDebouncer(delay_ms=25, parent=self)
+        self.find_highlight_debouncer = UpdateDebouncer(delay_ms=50, parent=self)
+        
+        # ストリーミング読み込み時にドキュメントへ段階的に追記する
+        self.progressive_loader = ProgressiveDocumentLoader(self)
         
         # 元のシグナル接続
-        self.document().blockCountChanged.connect(self._schedule_line_number_update)
-        self.document().contentsChanged.connect(self._schedule_line_number_area_update)
+        self._connect_document(self.document())
         self.verticalScrollBar().valueChanged.connect(self._schedule_line_number_area_update)
         self.cursorPositionChanged.connect(self._schedule_highlight_update)
         self.cursorPositionChanged.connect(self._schedule_line_number_area_update)
+        # 検索で一致した箇所は表示範囲の分だけ強調表示する
+        self.verticalScrollBar().valueChanged.connect(self._schedule_find_highlight_update)
+        self.horizontalScrollBar().valueChanged.connect(self._schedule_find_highlight_update)
+        self.textChanged.connect(self._clear_stale_find_matches)
         
         self.setLineWrapMode(QTextEdit.LineWrapMode.WidgetWidth)
         self.update_line_number_area_width(0)
@@ -123,6 +344,145 @@ class MemoTextEdit(QTextEdit):
             self.setFont(font)
             self.lineNumberArea.set_font(font)
     
+    def setPlainText(self, text):
+        # 内容を丸ごと置き換える場合は段階的な追記・閲覧モード・休止中のドキュメントを止める
+        self.progressive_loader.abort()
+        self.close_windowed_view()
+        self._hibernated = None
+        super().setPlainText(text)
+    
+    def clear(self):
+        self.progressive_loader.abort()
+        self.close_windowed_view()
+        self._hibernated = None
+        super().clear()
+    
+    def _connect_document(self, document, connect=True):
+        """行番号の更新に使うドキュメントのシグナルを接続（connect=Falseで切断）"""
+        signals = ((document.blockCountChanged, self._schedule_line_number_update),
+                   (document.contentsChanged, self._schedule_line_number_area_update))
+        for signal, slot in signals:
+            if connect:
+                signal.connect(slot)
+            else:
+                signal.disconnect(slot)
+    
+    @property
+    def is_hibernated(self):
+        return self._hibernated is not None
+    
+    def content_document(self):
+        """このエディタのメモを持つドキュメント（休止中は切り離したドキュメント）"""
+        return self._hibernated[0] if self._hibernated else self.document()
+    
+    def hibernate_document(self):
+        """ドキュメントを切り離して空のドキュメントに差し替える（非アクティブなタブ用）
+        
+        切り離したドキュメントはUndo履歴・レイアウト・変更フラグをそのまま持つため、
+        wake_document()で付け直せばsetPlainTextによる作り直しは不要になる。
+        
+        Returns:
+            bool: 休止した場合True（読み込み中・閲覧モード中・休止中は何もしない）
+        """
+        if self.is_hibernated or self.windowed_view is not None or self.progressive_loader.is_loading:
+            return False
+        document = self.document()
+        self._hibernated = (document, self.textCursor(),
+                            self.verticalScrollBar().value(), self.horizontalScrollBar().value())
+        # エディタの子のまま差し替えるとQtに削除されるため、親を外して参照を保持する
+        document.setParent(None)
+        self._connect_document(document, connect=False)
+        
+        placeholder = QTextDocument(self)
+        placeholder.setDefaultFont(document.defaultFont())
+        self.setDocument(placeholder)
+        self._connect_document(placeholder)
+        return True
+    
+    def wake_document(self):
+        """hibernate_document()で切り離したドキュメントを付け直す
+        
+        Returns:
+            bool: 復元した場合True
+        """
+        if not self.is_hibernated:
+            return False
+        document, cursor, vertical_pos, horizontal_pos = self._hibernated
+        self._hibernated = None
+        
+        placeholder = self.document()
+        self._connect_document(placeholder, connect=False)
+        document.setParent(self)
+        if document.defaultFont() != self.font():
+            document.setDefaultFont(self.font())
+        self.setDocument(document)
+        self._connect_document(document)
+        placeholder.deleteLater()
+        self.setTextCursor(cursor)
+        self.verticalScrollBar().setValue(vertical_pos)
+        self.horizontalScrollBar().setValue(horizontal_pos)
+        self.update_line_number_area_width()
+        return True
+    
+    def release_document(self):
+        """休止中のドキュメントを手放す（メモリ上限を超えたタブの追い出し用）
+        
+        Returns:
+            dict or None: cursor_pos, scroll_pos, modified と、未保存の変更がある場合のみ content
+        """
+        if not self.is_hibernated:
+            return None
+        document, cursor, vertical_pos, _ = self._hibernated
+        self._hibernated = None
+        modified = document.isModified()
+        state = {
+            'cursor_pos': cursor.position(),
+            'scroll_pos': vertical_pos,
+            'modified': modified,
+            'content': document.toPlainText() if modified else None,
+        }
+        document.deleteLater()
+        return state
+    
+    def setReadOnly(self, read_only):
+        # 閲覧モード中のドキュメントはファイルの一部なので編集させない
+        super().setReadOnly(read_only or self.windowed_view is not None)
+    
+    def open_windowed_view(self, line_offsets, read_range):
+        """閲覧モードで表示を開始
+        
+        Args:
+            line_offsets (list): 行頭バイトオフセット（末尾は最終行の終端）
+            read_range (callable): read_range(start_offset, end_offset) -> str
+        """
+        self.progressive_loader.abort()
+        self.close_windowed_view()
+        self.windowed_view = WindowedTextView(self, line_offsets, read_range)
+        self.setReadOnly(True)
+        self.lineNumberArea.update_width()
+        self.windowed_view.layout_scroll_bar()
+        self.windowed_view.show_line(0)
+        return self.windowed_view
+    
+    def close_windowed_view(self):
+        """閲覧モードを終了（閲覧モードでなければ何もしない）"""
+        if self.windowed_view is None:
+            return
+        self.windowed_view.close()
+        self.windowed_view = None
+        super().clear()
+        self.lineNumberArea.update_width()
+    
+    def line_number_offset(self):
+        """行番号表示に加算する値（閲覧モードでは窓の先頭行）"""
+        return self.windowed_view.window_start if self.windowed_view else 0
+    
+    def total_line_count(self):
+        """行番号の桁数計算に使う総行数"""
+        if self.windowed_view:
+            return self.windowed_view.total_lines
+        return self.document().blockCount()
+    
     def _schedule_line_number_update(self, _=0):
         """行番号更新をスケジュール"""
         self.update_debouncer.schedule_update("line_number_width", 
@@ -138,6 +498,51 @@ class MemoTextEdit(QTextEdit):
         self.line_highlight_debouncer.schedule_update("highlight", 
                                                      lambda: self.highlight_current_line())
 
+    def _schedule_find_highlight_update(self, _=0):
+        """一致箇所の強調表示の更新をスケジュール"""
+        if self.find_matches is not None:
+            self.find_highlight_debouncer.schedule_update("find_highlight", self.update_find_highlights)
+    
+    def set_find_matches(self, starts, ends):
+        """検索で一致した範囲を設定して強調表示（Noneで解除）
+        
+        Args:
+            starts (array): 一致の開始位置（昇順）
+            ends (array): 一致の終了位置
+        """
+        self.find_matches = (starts, ends) if starts is not None else None
+        self.update_find_highlights()
+    
+    def _clear_stale_find_matches(self):
+        # 編集で位置がずれた一致は強調表示しない（検索ダイアログが検索し直す）
+        if self.find_matches is not None:
+            self.set_find_matches(None, None)
+    
+    def update_find_highlights(self):
+        """表示範囲にある一致だけを強調表示（一致が多くても表示範囲の分しか作らない）"""
+        selections = [sel for sel in self.extraSelections() if sel.format.property(FIND_HIGHLIGHT_PROPERTY_ID) != True]
+        if self.find_matches is not None:
+            starts, ends = self.find_matches
+            viewport = self.viewport()
+            # ドキュメント余白の上を調べると見当違いの位置が返ることがあるため、余白の分だけ下を調べる
+            margin = int(self.document().documentMargin())
+            first = self.cursorForPosition(QPoint(0, margin)).position()
+            last = self.cursorForPosition(QPoint(viewport.width(), viewport.height())).position()
+            index = bisect_right(ends, first)
+            stop = min(bisect_right(starts, last), index + FIND_HIGHLIGHT_LIMIT)
+            highlight_format = QTextCharFormat()
+            highlight_format.setBackground(QColor(255, 184, 108, 110))  # 一致箇所の色（半透明のオレンジ）
+            highlight_format.setProperty(FIND_HIGHLIGHT_PROPERTY_ID, True)
+            document = self.document()
+            for i in range(index, stop):
+                selection = QTextEdit.ExtraSelection()
+                selection.cursor = QTextCursor(document)
+                selection.cursor.setPosition(starts[i])
+                selection.cursor.setPosition(ends[i], QTextCursor.MoveMode.KeepAnchor)
+                selection.format = highlight_format
+                selections.append(selection)
+        self.setExtraSelections(selections)
+
     def insertFromMimeData(self, source):
         if source.hasText():
             self.insertPlainText(source.text())
@@ -146,12 +551,14 @@ class MemoTextEdit(QTextEdit):
         painter = QPainter(self.lineNumberArea)
         bg_color = self.palette().color(QPalette.ColorRole.Base)
         painter.fillRect(event.rect(), bg_color)
-        first_visible_cursor = self.cursorForPosition(QPoint(0, 0))
+        # ドキュメント余白の上を調べると見当違いのブロックが返ることがあるため、余白の分だけ下を調べる
+        first_visible_cursor = self.cursorForPosition(QPoint(0, int(self.document().documentMargin())))
         block = first_visible_cursor.block()
         if not block.isValid():
             return
         
         blockNumber = block.blockNumber()
+        line_number_offset = self.line_number_offset()
         offset = QPoint(self.horizontalScrollBar().value(), self.verticalScrollBar().value())
         top = self.document().documentLayout().blockBoundingRect(block).translated(-offset.x(), -offset.y()).top()
         bottom = top + self.document().documentLayout().blockBoundingRect(block).height()
@@ -163,15 +570,19 @@ class MemoTextEdit(QTextEdit):
         
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
-                number = str(blockNumber + 1)
+                number = str(blockNumber + 1 + line_number_offset)
                 is_current_line = self.textCursor().blockNumber() == blockNumber
                 pen_color = current_line_pen_color if is_current_line else default_pen_color
                 painter.setPen(pen_color)
                 painter.drawText(0, int(top), width - 5, height, Qt.AlignmentFlag.AlignRight, number)
             block = block.next()
             if block.isValid():
+                block_height = self.document().documentLayout().blockBoundingRect(block).height()
+                if block_height <= 0:
+                    # まだレイアウトされていないブロック（大きなメモの置換直後など）から先は表示されていない
+                    break
                 top = bottom
-                bottom = top + self.document().documentLayout().blockBoundingRect(block).height()
+                bottom = top + block_height
             blockNumber += 1
 
     def resizeEvent(self, event):
@@ -180,6 +591,9 @@ class MemoTextEdit(QTextEdit):
         self.lineNumberArea.setGeometry(QRect(cr.left(), cr.top(), 
                                               self.lineNumberArea.line_number_area_width(), 
                                               cr.height()))
+        if self.windowed_view:
+            self.windowed_view.layout_scroll_bar()
+        self._schedule_find_highlight_update()
     
     def update_line_number_area_width(self, _=0):
         self.lineNumberArea.update_width()
@@ -385,3 +799,349 @@ class AutoTextSettingsDialog(QDialog):
         for i, text in enumerate(texts):
             if i < len(self.text_inputs):
                 self.text_inputs[i].setText(text)
+
+class MemoSearchDialog(QDialog):
+    """メモの検索ダイアログ（入力が止まるたびに検索し、選んだメモを開く）
+
+    全文検索とクイックオープン（メモ名のあいまい検索）で共用する。
+    """
+    memo_selected = pyqtSignal(str)
+
+    def __init__(self, search_func, root_dir="", parent=None, title="全文検索",
+                 placeholder="検索語（空白区切りですべてを含むメモ）", debounce_ms=SEARCH_DEBOUNCE_MS):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(600, 500)
+        self.search_func = search_func  # search_func(query) -> [dict(path, title, snippet)]
+        self.root_dir = root_dir
+
+        layout = QVBoxLayout(self)
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText(placeholder)
+        self.query_input.textChanged.connect(self._schedule_search)
+        self.query_input.returnPressed.connect(self._open_current)
+        layout.addWidget(self.query_input)
+        self.result_list = QListWidget()
+        self.result_list.setWordWrap(True)
+        self.result_list.itemActivated.connect(self._open_item)
+        layout.addWidget(self.result_list)
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(debounce_ms)
+        self.search_timer.timeout.connect(self.run_search)
+
+    def set_index_status(self, text):
+        """索引の作成状況を表示（検索結果がないときだけ）"""
+        if not self.result_list.count():
+            self.status_label.setText(text)
+
+    def keyPressEvent(self, event):
+        # 入力欄から上下キーで結果を選べるようにする
+        if event.key() in (Qt.Key.Key_Down, Qt.Key.Key_Up) and self.result_list.count():
+            row = self.result_list.currentRow() + (1 if event.key() == Qt.Key.Key_Down else -1)
+            self.result_list.setCurrentRow(max(0, min(row, self.result_list.count() - 1)))
+            return
+        super().keyPressEvent(event)
+
+    def _schedule_search(self):
+        self.search_timer.start()
+
+    def run_search(self):
+        """入力中の検索語で検索して結果を表示"""
+        self.search_timer.stop()
+        query = self.query_input.text().strip()
+        self.result_list.clear()
+        if not query:
+            self.status_label.clear()
+            return
+        started = time.perf_counter()
+        try:
+            results = self.search_func(query)
+        except Exception as e:
+            print(f"!!! ERROR: 検索に失敗しました: {e}")
+            self.status_label.setText("検索に失敗しました")
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.add_results(results)
+        self.status_label.setText(f"{len(results)}件 ({elapsed_ms:.0f}ms)")
+
+    def add_results(self, results):
+        """結果を一覧の末尾に追加（最初の結果を選択する）"""
+        for result in results:
+            folder = os.path.dirname(result['path'])
+            if self.root_dir:
+                folder = os.path.relpath(folder, self.root_dir)
+            text = f"{result['title']}  ({folder})"
+            if result['snippet']:
+                text += f"\n{result['snippet']}"
+            item = QListWidgetItem(text)
+            item.setData(Qt.ItemDataRole.UserRole, result['path'])
+            item.setToolTip(result['path'])
+            self.result_list.addItem(item)
+        if results and self.result_list.currentRow() < 0:
+            self.result_list.setCurrentRow(0)
+
+    def _open_current(self):
+        if self.search_timer.isActive():
+            self.run_search()
+        item = self.result_list.currentItem()
+        if item:
+            self._open_item(item)
+
+    def _open_item(self, item):
+        self.memo_selected.emit(item.data(Qt.ItemDataRole.UserRole))
+
+class GrepDialog(MemoSearchDialog):
+    """全メモのgrep検索ダイアログ（文字列・正規表現で一致した行を、見つかった順に追加していく）"""
+
+    def __init__(self, searcher, root_dir="", parent=None):
+        super().__init__(None, root_dir, parent, title="grep検索", placeholder="文字列（正規表現にもできます）")
+        self.searcher = searcher  # GrepSearcher
+        self.result_count = 0
+
+        options = QHBoxLayout()
+        self.regex_check = QCheckBox("正規表現")
+        self.case_check = QCheckBox("大文字と小文字を区別")
+        for check in (self.regex_check, self.case_check):
+            check.toggled.connect(self._schedule_search)
+            options.addWidget(check)
+        options.addStretch()
+        self.layout().insertLayout(1, options)
+
+        searcher.hits_found.connect(self._on_hits_found)
+        searcher.search_finished.connect(self._on_search_finished)
+
+    def _schedule_search(self):
+        # 入力が変わった時点で実行中の検索を取り消し、古い検索語の結果が追加されないようにする
+        self.searcher.cancel()
+        super()._schedule_search()
+
+    def run_search(self):
+        """入力中の検索語で検索を開始（結果はhits_foundで届いた分から表示する）"""
+        self.search_timer.stop()
+        self.searcher.cancel()
+        self.result_list.clear()
+        self.result_count = 0
+        query = self.query_input.text()
+        if not query.strip():
+            self.status_label.clear()
+            return
+        try:
+            self.searcher.start(query, self.regex_check.isChecked(), self.case_check.isChecked())
+        except re.error as e:
+            self.status_label.setText(f"正規表現が正しくありません: {e}")
+            return
+        self.status_label.setText("検索中…")
+
+    def hideEvent(self, event):
+        self.searcher.cancel()
+        super().hideEvent(event)
+
+    def _on_hits_found(self, hits):
+        hits = hits[:GREP_MAX_RESULTS - self.result_count]
+        self.add_results(hits)
+        self.result_count += len(hits)
+        if self.result_count >= GREP_MAX_RESULTS:
+            self.searcher.cancel()
+            self.status_label.setText(f"{self.result_count}行（上限に達したため検索を打ち切りました）")
+        else:
+            self.status_label.setText(f"{self.result_count}行（検索中…）")
+
+    def _on_search_finished(self, stats):
+        self.status_label.setText(f"{self.result_count}行 / {stats['files']:,}件のメモ ({stats['elapsed'] * 1000:.0f}ms)")
+
+class FindReplaceDialog(QDialog):
+    """開いているメモの検索・置換ダイアログ（一致はバックグラウンドで求め、表示範囲の分だけ強調表示する）"""
+
+    def __init__(self, finder, editor_provider, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("検索と置換")
+        self.resize(480, 0)
+        self.finder = finder  # DocumentFinder
+        self.editor_provider = editor_provider  # 対象のエディタ（現在のタブ）を返す
+        self.editor = None  # 一致を表示しているエディタ
+        self.matches = None  # (開始位置のarray, 終了位置のarray)
+        self.pending_move = 0  # 検索が終わったら移動する向き（1: 次へ, -1: 前へ）
+
+        layout = QVBoxLayout(self)
+        form_layout = QFormLayout()
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("検索する文字列")
+        self.query_input.textChanged.connect(self._schedule_search)
+        self.query_input.returnPressed.connect(self.find_next)
+        form_layout.addRow("検索:", self.query_input)
+        self.replace_input = QLineEdit()
+        self.replace_input.setPlaceholderText("置換後の文字列（正規表現では\\1で一致した部分を使えます）")
+        self.replace_input.returnPressed.connect(self.replace_current)
+        form_layout.addRow("置換:", self.replace_input)
+        layout.addLayout(form_layout)
+
+        options = QHBoxLayout()
+        self.regex_check = QCheckBox("正規表現")
+        self.case_check = QCheckBox("大文字と小文字を区別")
+        for check in (self.regex_check, self.case_check):
+            check.toggled.connect(self._schedule_search)
+            options.addWidget(check)
+        options.addStretch()
+        layout.addLayout(options)
+
+        buttons = QHBoxLayout()
+        for text, slot in (("前へ", self.find_previous), ("次へ", self.find_next),
+                           ("置換", self.replace_current), ("すべて置換", self.replace_all)):
+            button = QPushButton(text)
+            button.setAutoDefault(False)
+            button.clicked.connect(slot)
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.run_search)
+
+        finder.matches_found.connect(self._on_matches_found)
+        finder.replace_finished.connect(self._on_replace_finished)
+
+    def options(self):
+        return self.query_input.text(), self.regex_check.isChecked(), self.case_check.isChecked()
+
+    def _schedule_search(self):
+        # 古い一致で移動・置換しないよう、入力が変わった時点で捨てる
+        self.finder.cancel()
+        self.matches = None
+        self.search_timer.start()
+
+    def _set_editor(self, editor):
+        """対象のエディタを切り替える（前のエディタの強調表示は消す）"""
+        if editor is self.editor:
+            return
+        if self.editor is not None:
+            try:
+                self.editor.textChanged.disconnect(self._schedule_search)
+                self.editor.set_find_matches(None, None)
+            except (RuntimeError, TypeError):
+                pass  # タブが閉じられた
+        self.editor = editor
+        if editor is not None:
+            editor.textChanged.connect(self._schedule_search)
+
+    def run_search(self):
+        """対象のエディタで検索を開始（結果はmatches_foundで届く）"""
+        self.search_timer.stop()
+        self._set_editor(self.editor_provider())
+        self.matches = None
+        query, is_regex, case_sensitive = self.options()
+        if self.editor is None or not query:
+            self.pending_move = 0
+            if self.editor is not None:
+                self.editor.set_find_matches(None, None)
+            self.status_label.setText("" if self.editor is not None else "メモが開かれていません")
+            return
+        try:
+            self.finder.start_find(self.editor, query, is_regex, case_sensitive)
+        except re.error as e:
+            self.pending_move = 0
+            self.editor.set_find_matches(None, None)
+            self.status_label.setText(f"正規表現が正しくありません: {e}")
+            return
+        self.status_label.setText("検索中…")
+
+    def find_next(self):
+        self._move(1)
+
+    def find_previous(self):
+        self._move(-1)
+
+    def _move(self, direction):
+        """カーソルの次（前）の一致を選択（検索が終わっていなければ終わってから）"""
+        if self.matches is None or self.editor is not self.editor_provider():
+            self.pending_move = direction
+            if not self.finder.is_busy or self.search_timer.isActive():
+                self.run_search()
+            return
+        starts, ends = self.matches
+        if not starts:
+            self.status_label.setText("見つかりません")
+            return
+        cursor = self.editor.textCursor()
+        if direction > 0:
+            index = bisect_left(starts, cursor.selectionEnd())
+            # 空の一致の上にいる場合は次の一致へ進める
+            if index < len(starts) and starts[index] == ends[index] == cursor.selectionStart():
+                index += 1
+            index %= len(starts)
+        else:
+            index = (bisect_left(starts, cursor.selectionStart()) - 1) % len(starts)
+        cursor.setPosition(starts[index])
+        cursor.setPosition(ends[index], QTextCursor.MoveMode.KeepAnchor)
+        self.editor.setTextCursor(cursor)
+        self.status_label.setText(f"{index + 1:,}/{len(starts):,}件")
+
+    def replace_current(self):
+        """選択中の一致を置換して次の一致へ（選択が一致でなければ次の一致を選ぶだけ）"""
+        editor = self.editor_provider()
+        if editor is None:
+            return
+        query, is_regex, case_sensitive = self.options()
+        if not query:
+            return
+        try:
+            replaced = self.finder.replace_selection(editor, query, self.replace_input.text(), is_regex, case_sensitive)
+        except re.error as e:
+            self.status_label.setText(f"置換できません: {e}")
+            return
+        if replaced:
+            # 置換で検索し直しになるため、終わってから次の一致へ進む
+            self.run_search()
+            self.pending_move = 1
+        else:
+            self.find_next()
+
+    def replace_all(self):
+        """すべての一致をバックグラウンドで置換（反映は1回の編集にまとめ、Undo 1回で元に戻せる）"""
+        self.search_timer.stop()
+        self._set_editor(self.editor_provider())
+        query, is_regex, case_sensitive = self.options()
+        if self.editor is None or not query:
+            return
+        self.matches = None
+        self.pending_move = 0
+        try:
+            started = self.finder.start_replace_all(self.editor, query, self.replace_input.text(), is_regex, case_sensitive)
+        except re.error as e:
+            self.status_label.setText(f"正規表現が正しくありません: {e}")
+            return
+        self.status_label.setText("置換中…" if started else "このメモは読み込み中か読み取り専用のため置換できません")
+
+    def hideEvent(self, event):
+        self.search_timer.stop()
+        self.finder.cancel()
+        self.finder.release_snapshot()
+        self._set_editor(None)
+        self.matches = None
+        super().hideEvent(event)
+
+    def _on_matches_found(self, result):
+        if result['editor'] is not self.editor:
+            return
+        self.matches = (result['starts'], result['ends'])
+        self.editor.set_find_matches(*self.matches)
+        count = len(result['starts'])
+        self.status_label.setText(f"{count:,}件 ({result['elapsed'] * 1000:.0f}ms)" if count else "見つかりません")
+        direction, self.pending_move = self.pending_move, 0
+        if direction and count:
+            self._move(direction)
+
+    def _on_replace_finished(self, result):
+        if result['editor'] is not self.editor:
+            return
+        if 'error' in result:
+            self.status_label.setText(result['error'])
+            return
+        self.run_search()
+        self.status_label.setText(f"{result['count']:,}件を置換しました ({result['elapsed'] * 1000:.0f}ms)")
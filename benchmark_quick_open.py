@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import os
+import random
+import sys
+import time
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, test_dir)
+
+from NekoNyanMemoNote.quick_open import MemoNameIndex
+
+MEMO_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+QUERY_COUNT = 30
+
+def create_names(rng):
+    """漢字・かな・英単語・日付を組み合わせたメモ名を作成"""
+    kanji = [chr(code) for code in range(0x4E00, 0x4E00 + 2000)]
+    kana = [chr(code) for code in range(0x3042, 0x3093)] + [chr(code) for code in range(0x30A2, 0x30F3)]
+    words = ["".join(rng.choice(kanji) for _ in range(rng.randint(2, 3))) for _ in range(3000)]
+    words += ["".join(rng.choice(kana) for _ in range(rng.randint(3, 5))) for _ in range(1500)]
+    words += ["report", "meeting", "notes", "draft", "todo", "plan", "review", "design", "idea", "memo"]
+    names = []
+    for i in range(MEMO_COUNT):
+        parts = rng.sample(words, rng.randint(1, 3))
+        if rng.random() < 0.3:
+            parts.append(f"{rng.randint(2015, 2025)}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}")
+        names.append(f"{'_'.join(parts)}_{i}")
+    return names
+
+def main():
+    """メモ名を1文字ずつ入力したときの検索時間を計測"""
+    rng = random.Random(0)
+    names = create_names(rng)
+    index = MemoNameIndex()
+    started = time.perf_counter()
+    for i, name in enumerate(names):
+        index.add(os.path.join(os.sep, "memo", f"フォルダ{i % 40}", name + ".txt"))
+    index._prepare_scan()
+    print(f"クイックオープンのベンチマーク（{MEMO_COUNT}件、登録 {time.perf_counter() - started:.2f}秒）")
+
+    queries = [names[rng.randrange(len(names))].rsplit("_", 1)[0] for _ in range(QUERY_COUNT)]
+    queries += ["meeting notes", "meetng", "report 2024"]
+    times = []
+    for query in queries:
+        for length in range(1, len(query) + 1):
+            started = time.perf_counter()
+            index.search(query[:length])
+            times.append((time.perf_counter() - started) * 1000)
+    times.sort()
+    print(f"{len(times)}打鍵: 中央値 {times[len(times) // 2]:.2f}ms / 95% {times[int(len(times) * 0.95)]:.2f}ms"
+          f" / 最大 {times[-1]:.2f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import sys
+import tempfile
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, test_dir)
+
+from NekoNyanMemoNote.search_index import SearchIndex, default_scan_processes
+
+MEMO_COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+FOLDER_COUNT = 50
+
+def create_corpus(root):
+    """UTF-8とCP932が混ざったメモを作成"""
+    line = "全文検索の索引作成ベンチマーク用のメモです。猫と予算と会議の話。\n"
+    for i in range(MEMO_COUNT):
+        folder = os.path.join(root, f"フォルダ{i % FOLDER_COUNT}")
+        os.makedirs(folder, exist_ok=True)
+        encoding = 'cp932' if i % 3 == 0 else 'utf-8'
+        with open(os.path.join(folder, f"メモ{i}.txt"), 'w', encoding=encoding) as f:
+            f.write(f"{i}番目\n" + line * (20 + i % 40))
+
+def measure(root, work_dir, processes):
+    """空の索引から作成した時間を計測"""
+    index = SearchIndex(os.path.join(work_dir, f"search{processes}.sqlite3"))
+    try:
+        return index.build(root, processes=processes)
+    finally:
+        index.close()
+
+def main():
+    """初回の索引作成の所要時間をプロセス数ごとに比較"""
+    work_dir = tempfile.mkdtemp()
+    try:
+        root = os.path.join(work_dir, "PyMemoNoteData")
+        create_corpus(root)
+        print(f"初回の索引作成ベンチマーク（{MEMO_COUNT}件）")
+        for processes in sorted({1, default_scan_processes()}):
+            stats = measure(root, work_dir, processes)
+            print(f"{processes:>2}プロセス: {stats['elapsed']:.2f}秒 ({stats['indexed']}件)")
+    finally:
+        shutil.rmtree(work_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+from PyQt6.QtWidgets import QApplication
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, test_dir)
+
+from NekoNyanMemoNote.widgets import MemoTextEdit
+from NekoNyanMemoNote.hibernation_store import HibernationStore
+
+SIZES_MB = (1, 10)
+ROUNDS = 3
+
+def create_content(size_mb):
+    """指定サイズ（UTF-8換算）のメモ内容を作成"""
+    line = "タブ切り替えベンチマーク用のテキスト行です。\n"
+    return line * (size_mb * 1024 * 1024 // len(line.encode('utf-8')))
+
+def prepare_editor(content):
+    """内容を入れて表示したエディタを作成"""
+    editor = MemoTextEdit(file_path="benchmark.txt")
+    editor.resize(800, 600)
+    editor.show()
+    editor.setPlainText(content)
+    QApplication.processEvents()
+    return editor
+
+def measure_compress(content):
+    """従来方式: toPlainTextで取り出して圧縮退避し、setPlainTextで作り直す"""
+    editor = prepare_editor(content)
+    store = HibernationStore()
+    hibernate_times, wake_times = [], []
+    try:
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            store.put(editor.file_path, editor.toPlainText(), editor.textCursor().position(),
+                      editor.verticalScrollBar().value(), editor.document().isModified())
+            editor.clear()
+            QApplication.processEvents()
+            hibernate_times.append(time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            saved_state = store.take(editor.file_path)
+            editor.setPlainText(saved_state['content'])
+            editor.verticalScrollBar().setValue(saved_state['scroll_pos'])
+            QApplication.processEvents()
+            wake_times.append(time.perf_counter() - start)
+    finally:
+        store.clear()
+        editor.deleteLater()
+    return min(hibernate_times), min(wake_times)
+
+def measure_swap(content):
+    """新方式: ドキュメントを切り離して付け直す"""
+    editor = prepare_editor(content)
+    hibernate_times, wake_times = [], []
+    try:
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            editor.hibernate_document()
+            QApplication.processEvents()
+            hibernate_times.append(time.perf_counter() - start)
+            
+            start = time.perf_counter()
+            editor.wake_document()
+            QApplication.processEvents()
+            wake_times.append(time.perf_counter() - start)
+    finally:
+        editor.deleteLater()
+    return min(hibernate_times), min(wake_times)
+
+def main():
+    """タブ休止・復帰の所要時間を方式ごとに比較"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    print("タブ休止・復帰ベンチマーク（各方式の最短時間、ミリ秒）")
+    print(f"{'サイズ':>6} | {'方式':<8} | {'休止':>9} | {'復帰':>9}")
+    for size_mb in SIZES_MB:
+        content = create_content(size_mb)
+        for name, measure in (('compress', measure_compress), ('swap', measure_swap)):
+            hibernate_time, wake_time = measure(content)
+            print(f"{size_mb:>4}MB | {name:<8} | {hibernate_time * 1000:>9.1f} | {wake_time * 1000:>9.1f}")
+    app.quit()
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 import sys
 import platform
+import multiprocessing
 import ctypes
 
 from PyQt6.QtWidgets import QApplication, QMessageBox
@@ -243,4 +244,6 @@ def main():
         sys.exit(1)
 
 if __name__ == '__main__':
+    # 検索索引の作成で起動するワーカープロセス（spawn）が、exe化した環境でアプリを起動し直さないようにする
+    multiprocessing.freeze_support()
     main()
@@ -1,20 +1,40 @@
 # -*- coding: utf-8 -*-
 
 import unittest
+import codecs
 import tempfile
 import os
 import shutil
 from unittest.mock import Mock, patch, MagicMock
 import sys
+import time
+from PyQt6.QtWidgets import QApplication, QMessageBox
 
 # テスト用のパス設定
 test_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(test_dir)
 sys.path.insert(0, parent_dir)
 
-from NekoNyanMemoNote.file_system import FileSystemManager
+from PyQt6.QtCore import Qt
+
+from NekoNyanMemoNote.file_system import (
+    FileSystemManager, FileIOWorker, ProgressThrottle, atomic_write_bytes, detect_memo_encoding, encode_memo_content,
+    ENCODING_PROBE_SIZE
+)
+
+def wait_until(predicate, timeout=5.0):
+    """イベントループを回しながら条件が満たされるまで待機"""
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.005)
+    return predicate()
 
 class TestFileSystemManager(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+    
     def setUp(self):
         """テスト前の準備"""
         self.mock_parent = Mock()
@@ -29,6 +49,7 @@ class TestFileSystemManager(unittest.TestCase):
     
     def tearDown(self):
         """テスト後のクリーンアップ"""
+        self.fs_manager.cleanup()
         self.patcher.stop()
         if os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
@@ -105,9 +126,416 @@ class TestFileSystemManager(unittest.TestCase):
         result = self.fs_manager.save_memo_content(test_file, test_content)
         
         self.assertTrue(result)
-        with open(test_file, 'r', encoding='utf-8') as f:
+        with open(test_file, 'r', encoding='utf-8-sig') as f:
             saved_content = f.read()
         self.assertEqual(saved_content, test_content)
 
+    def test_async_save_then_load_keeps_order(self):
+        """同じパスへの非同期保存→読み込みは投入順に実行される"""
+        test_file = os.path.join(self.temp_dir, "async_test.txt")
+        with open(test_file, 'w', encoding='utf-8') as f:
+            f.write("古い内容")
+        
+        results = {}
+        self.fs_manager.save_memo_content_async(test_file, "新しい内容", lambda ok: results.setdefault('saved', ok))
+        self.fs_manager.load_memo_content_async(test_file, lambda content: results.setdefault('loaded', content))
+        
+        self.assertTrue(wait_until(lambda: 'loaded' in results))
+        self.assertTrue(results['saved'])
+        self.assertEqual(results['loaded'], "新しい内容")
+        self.assertEqual(self.fs_manager.get_active_operations(), set())
+    
+    def test_save_replaces_file_atomically(self):
+        """保存は一時ファイルを残さず差し替え、所要時間を記録する"""
+        test_file = os.path.join(self.temp_dir, "atomic_test.txt")
+        with open(test_file, 'w', encoding='utf-8') as f:
+            f.write("古い内容")
+        
+        self.assertTrue(self.fs_manager._save_memo_content_sync(test_file, "新しい内容"))
+        
+        with open(test_file, 'r', encoding='utf-8-sig') as f:
+            self.assertEqual(f.read(), "新しい内容")
+        self.assertEqual(os.listdir(self.temp_dir), ["atomic_test.txt"])
+        stats = self.fs_manager.get_save_statistics()
+        self.assertEqual(stats['count'], 1)
+        self.assertEqual(stats['bytes'], len(encode_memo_content("新しい内容")))
+    
+    def test_chunked_atomic_write(self):
+        """チャンク書き込みでも内容は一致し、進捗は最後に全体サイズを通知する"""
+        test_file = os.path.join(self.temp_dir, "chunked_test.txt")
+        data = "あいうえお\n".encode('utf-8') * 10000
+        progress = []
+        atomic_write_bytes(test_file, data, 4096, lambda current, total: progress.append((current, total)))
+        
+        with open(test_file, 'rb') as f:
+            self.assertEqual(f.read(), data)
+        self.assertEqual(progress[-1], (len(data), len(data)))
+        self.assertEqual(len(progress), -(-len(data) // 4096))
+    
+    def test_save_skipped_when_content_unchanged(self):
+        """読み込んだ内容と同じ内容の保存は書き込みを省略する"""
+        test_file = os.path.join(self.temp_dir, "digest_test.txt")
+        with open(test_file, 'w', encoding='utf-8-sig') as f:
+            f.write("元の内容")
+        
+        content = self.fs_manager.load_memo_content(test_file)
+        mtime_before = os.stat(test_file).st_mtime_ns
+        self.assertTrue(self.fs_manager.save_memo_content(test_file, content))
+        self.assertEqual(os.stat(test_file).st_mtime_ns, mtime_before)
+        
+        self.assertTrue(self.fs_manager.save_memo_content(test_file, "変更後"))
+        self.assertTrue(self.fs_manager.save_memo_content(test_file, "変更後"))
+        stats = self.fs_manager.get_save_statistics()
+        self.assertEqual(stats['count'], 1)
+        self.assertEqual(stats['skipped'], 2)
+    
+    def test_save_keeps_bom_and_os_newlines(self):
+        """保存はBOM付きUTF-8で、改行はOSの改行にする（Windowsで開いたCRLFのメモはCRLFのまま）"""
+        test_file = os.path.join(self.temp_dir, "crlf_test.txt")
+        with open(test_file, 'wb') as f:
+            f.write(codecs.BOM_UTF8 + "一行目\r\n二行目\r\n".encode('utf-8'))
+        content = self.fs_manager.load_memo_content(test_file)
+        self.assertEqual(content, "一行目\n二行目\n")
+        
+        with patch.object(os, 'linesep', '\r\n'):
+            self.assertTrue(self.fs_manager.save_memo_content(test_file, content + "三行目"))
+        with open(test_file, 'rb') as f:
+            self.assertEqual(f.read(), codecs.BOM_UTF8 + "一行目\r\n二行目\r\n三行目".encode('utf-8'))
+        self.assertEqual(self.fs_manager.load_memo_content(test_file), "一行目\n二行目\n三行目")
+        
+        with patch.object(os, 'linesep', '\n'):
+            self.assertTrue(self.fs_manager.save_memo_content(test_file, "LFのみ\n"))
+        with open(test_file, 'rb') as f:
+            self.assertEqual(f.read(), codecs.BOM_UTF8 + "LFのみ\n".encode('utf-8'))
+    
+    def test_change_notifier_reports_file_operations(self):
+        """作成・保存・削除を通知し、書き込みを省略した保存は通知しない"""
+        events = []
+        self.fs_manager.change_notifier.file_changed.connect(lambda *event: events.append(event[:2]))
+        with patch('NekoNyanMemoNote.file_system.QInputDialog.getText', return_value=("通知", True)):
+            memo_path = self.fs_manager.create_new_memo(self.temp_dir)
+        
+        self.fs_manager.save_memo_content(memo_path, "内容")
+        self.fs_manager.save_memo_content(memo_path, "内容")
+        with patch('NekoNyanMemoNote.file_system.QMessageBox.question', return_value=QMessageBox.StandardButton.Yes):
+            self.assertTrue(self.fs_manager.delete_memo(memo_path, "通知"))
+        
+        # 保存の通知はワーカーからキュー経由で届く
+        self.assertTrue(wait_until(lambda: len(events) >= 3))
+        QApplication.processEvents()
+        self.assertCountEqual(events, [("created", memo_path), ("saved", memo_path), ("deleted", memo_path)])
+    
+    def test_cp932_file_decoded_once_and_cached(self):
+        """CP932のファイルは推定結果をキャッシュし、次回以降は推定を省略する"""
+        test_file = os.path.join(self.temp_dir, "legacy.txt")
+        with open(test_file, 'w', encoding='cp932') as f:
+            f.write("シフトJISのメモ\r\n2行目")
+        
+        with patch('NekoNyanMemoNote.file_system.QMessageBox'):
+            self.assertEqual(self.fs_manager.load_memo_content(test_file), "シフトJISのメモ\n2行目")
+            with patch('NekoNyanMemoNote.file_system.detect_memo_encoding') as mock_detect:
+                self.assertEqual(self.fs_manager.load_memo_content(test_file), "シフトJISのメモ\n2行目")
+                mock_detect.assert_not_called()
+        
+        cache_path = os.path.join(self.temp_dir, "encoding_cache.json")
+        self.fs_manager.save_encoding_cache(cache_path)
+        other_manager = FileSystemManager(self.mock_parent)
+        try:
+            other_manager.load_encoding_cache(cache_path)
+            self.assertEqual(other_manager.worker._cached_encoding(test_file, os.stat(test_file)), 'cp932')
+        finally:
+            other_manager.cleanup()
+    
+    def test_content_cache_hits_and_invalidation(self):
+        """読み込み・保存した内容はキャッシュから返し、外部で更新されたら読み直す"""
+        test_file = os.path.join(self.temp_dir, "cache_test.txt")
+        with open(test_file, 'w', encoding='utf-8') as f:
+            f.write("最初の内容")
+        
+        self.assertEqual(self.fs_manager.load_memo_content(test_file), "最初の内容")
+        self.assertEqual(self.fs_manager.load_memo_content(test_file), "最初の内容")
+        self.assertTrue(self.fs_manager.save_memo_content(test_file, "保存した内容"))
+        self.assertEqual(self.fs_manager.load_memo_content(test_file), "保存した内容")
+        stats = self.fs_manager.get_content_cache_statistics()
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        
+        with open(test_file, 'w', encoding='utf-8') as f:
+            f.write("外部で書き換えた内容")
+        self.assertEqual(self.fs_manager.load_memo_content(test_file), "外部で書き換えた内容")
+    
+    def test_content_cache_evicts_least_recently_used(self):
+        """上限を超えると最も使われていない内容から追い出す"""
+        paths = []
+        for i in range(3):
+            path = os.path.join(self.temp_dir, f"lru_{i}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(str(i) * 1000)
+            paths.append(path)
+        self.fs_manager.set_content_cache_budget(2500)
+        
+        for path in paths:
+            self.fs_manager.load_memo_content(path)
+        stats = self.fs_manager.get_content_cache_statistics()
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertLessEqual(stats['bytes'], 2500)
+        
+        self.fs_manager.load_memo_content(paths[0])
+        self.assertEqual(self.fs_manager.get_content_cache_statistics()['misses'], 4)
+    
+    def test_prefetch_warms_cache_and_counts_hits(self):
+        """先読みしたメモは開いたときにキャッシュから返り、的中として数えられる"""
+        paths = []
+        for name in ("next.txt", "other.txt"):
+            path = os.path.join(self.temp_dir, name)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f"{name}の内容")
+            paths.append(path)
+        self.fs_manager.prefetcher.delay_ms = 0
+        
+        self.fs_manager.prefetch_memos(paths)
+        self.assertTrue(wait_until(lambda: self.fs_manager.get_prefetch_statistics()['warmed'] == 2))
+        self.assertEqual(self.fs_manager.get_content_cache_statistics()['misses'], 0)
+        
+        results = []
+        self.fs_manager.load_memo_content_async(paths[0], results.append)
+        self.assertTrue(wait_until(lambda: results))
+        self.assertEqual(results, ["next.txtの内容"])
+        self.assertEqual(self.fs_manager.get_content_cache_statistics()['hits'], 1)
+        stats = self.fs_manager.get_prefetch_statistics()
+        self.assertEqual((stats['loads'], stats['used']), (1, 1))
+        self.assertEqual(stats['accuracy'], 0.5)
+    
+    def test_user_load_cancels_pending_prefetch(self):
+        """ユーザー操作の読み込みが来たら予定中の先読みは実行しない"""
+        test_file = os.path.join(self.temp_dir, "prefetch_cancel.txt")
+        with open(test_file, 'w', encoding='utf-8') as f:
+            f.write("内容")
+        
+        self.fs_manager.prefetch_memos([test_file])
+        self.fs_manager.load_memo_content_async(test_file)
+        self.assertTrue(wait_until(lambda: not self.fs_manager.get_active_operations()))
+        QApplication.processEvents()
+        self.assertEqual(self.fs_manager.get_prefetch_statistics()['requested'], 0)
+    
+    def test_detect_memo_encoding(self):
+        """先頭部分からのエンコーディング推定"""
+        self.assertEqual(detect_memo_encoding(b"\xef\xbb\xbf" + "本文".encode('utf-8')), 'utf-8-sig')
+        # 推定範囲の末尾で切れたマルチバイト文字はUTF-8として扱う
+        self.assertEqual(detect_memo_encoding("日本語".encode('utf-8')[:-1]), 'utf-8-sig')
+        self.assertEqual(detect_memo_encoding("日本語".encode('cp932')), 'cp932')
+    
+    def test_streaming_load_decodes_across_chunks(self):
+        """ストリーミング読み込みはチャンク境界をまたぐ文字・改行も正しく復元する"""
+        test_file = os.path.join(self.temp_dir, "large.txt")
+        line = "ログ行：日本語テキスト\r\n"
+        with open(test_file, 'wb') as f:
+            f.write(codecs.BOM_UTF8 + line.encode('utf-8') * 40000)
+        
+        results = {}
+        def on_stream(content, current_pos=-1, total_size=-1):
+            if current_pos == -1:
+                results['content'] = content
+        self.fs_manager.load_memo_content_streaming(test_file, on_stream)
+        
+        self.assertTrue(wait_until(lambda: 'content' in results))
+        expected = line.replace("\r\n", "\n") * 40000
+        self.assertEqual(results['content'], expected)
+        
+        # ストリーミング中に計算したダイジェストで変更なしの保存を省略できる（Windowsの改行で保存する場合）
+        with patch.object(os, 'linesep', '\r\n'):
+            self.fs_manager.save_memo_content(test_file, expected)
+        self.assertEqual(self.fs_manager.get_save_statistics()['skipped'], 1)
+    
+    def test_streaming_waits_for_acknowledgement(self):
+        """受信側が確認応答しない間は、クレジット分のチャンクしか送らない"""
+        test_file = os.path.join(self.temp_dir, "credit_test.txt")
+        with open(test_file, 'w', encoding='utf-8') as f:
+            f.write("行\n" * (1024 * 1024))
+        
+        worker = FileIOWorker()
+        chunks = []
+        finished = []
+        direct = Qt.ConnectionType.DirectConnection
+        worker.operation_chunk.connect(lambda op_id, chunk, pos, total: chunks.append(op_id), direct)
+        worker.operation_finished.connect(lambda op_id, result: finished.append(result), direct)
+        operation_id = worker.load_file_streaming(test_file, credit_window=2)
+        
+        time.sleep(0.3)
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(finished, [])
+        
+        deadline = time.monotonic() + 5.0
+        while not finished and time.monotonic() < deadline:
+            worker.acknowledge_chunk(operation_id)
+            time.sleep(0.001)
+        self.assertEqual(finished, [True])
+        self.assertGreater(len(chunks), 2)
+        self.assertTrue(worker.wait_for_done())
+    
+    def test_progress_throttle(self):
+        """進捗通知は間引かれるが、最後の通知は必ず通る"""
+        throttle = ProgressThrottle(updates_per_second=1)
+        self.assertTrue(throttle.ready(1, 100))
+        self.assertFalse(throttle.ready(50, 100))
+        self.assertTrue(throttle.ready(100, 100))
+    
+    def test_line_index_and_text_range(self):
+        """行索引のオフセットで任意の行範囲を読み込める"""
+        test_file = os.path.join(self.temp_dir, "lines.txt")
+        with open(test_file, 'w', encoding='cp932', newline='') as f:
+            f.write("一行目\r\n二行目\r\n三行目")
+        
+        results = {}
+        self.fs_manager.build_line_index_async(test_file, lambda offsets: results.setdefault('offsets', offsets))
+        self.assertTrue(wait_until(lambda: 'offsets' in results))
+        offsets = results['offsets']
+        self.assertEqual(len(offsets) - 1, 3)
+        self.assertEqual(self.fs_manager.scan_line_offsets(test_file, 12), offsets[:2])
+        
+        encoding = self.fs_manager.detect_encoding(test_file)
+        self.assertEqual(self.fs_manager.read_text_range(test_file, offsets[1], offsets[3], encoding), "二行目\n三行目")
+    
+    def test_text_range_switches_to_cp932_after_ascii_prefix(self):
+        """先頭部分がASCIIだけのCP932のメモは、不正なバイトのある範囲からCP932で読み、以降もCP932で読む"""
+        test_file = os.path.join(self.temp_dir, "ascii_prefix.txt")
+        prefix = ("ascii line\r\n" * (ENCODING_PROBE_SIZE // 12 + 1)).encode('ascii')
+        body = "日本語の行\r\n".encode('cp932')
+        with open(test_file, 'wb') as f:
+            f.write(prefix + body * 4)
+    
+        self.assertEqual(self.fs_manager.detect_encoding(test_file), 'utf-8-sig')
+        self.assertEqual(self.fs_manager.read_text_range(test_file, 0, 12), "ascii line")
+        start = len(prefix)
+        self.assertEqual(self.fs_manager.read_text_range(test_file, start, start + len(body) * 2), "日本語の行\n日本語の行")
+        self.assertEqual(self.fs_manager.detect_encoding(test_file), 'cp932')
+        start += len(body) * 2
+        self.assertEqual(self.fs_manager.read_text_range(test_file, start, start + len(body)), "日本語の行")
+    
+    def test_line_index_persisted_and_invalidated(self):
+        """行索引はファイルに保存され、内容が変わると使われない"""
+        test_file = os.path.join(self.temp_dir, "indexed.txt")
+        with open(test_file, 'wb') as f:
+            f.write(b"a\nbb\nccc")
+        index_dir = os.path.join(self.temp_dir, "index_cache")
+        self.fs_manager.enable_line_index_cache(index_dir)
+        
+        results = {}
+        self.fs_manager.build_line_index_async(test_file, lambda offsets: results.setdefault('offsets', offsets))
+        self.assertTrue(wait_until(lambda: 'offsets' in results))
+        self.assertEqual(list(results['offsets']), [0, 2, 5, 8])
+        
+        other_manager = FileSystemManager(self.mock_parent)
+        try:
+            other_manager.enable_line_index_cache(index_dir)
+            self.assertEqual(list(other_manager.get_line_index(test_file)), [0, 2, 5, 8])
+            with open(test_file, 'ab') as f:
+                f.write(b"\n")
+            self.assertIsNone(other_manager.get_line_index(test_file))
+        finally:
+            other_manager.cleanup()
+    
+    def test_windowed_strategy_above_threshold(self):
+        """しきい値以上のファイルは閲覧モードで開く"""
+        test_file = os.path.join(self.temp_dir, "huge.txt")
+        with open(test_file, 'wb') as f:
+            f.write(b"x" * (1024 * 1024))
+        
+        self.assertEqual(self.fs_manager.get_file_load_strategy(test_file), 'streaming')
+        self.fs_manager.windowed_view_threshold = 1024 * 1024
+        self.assertEqual(self.fs_manager.get_file_load_strategy(test_file), 'windowed')
+    
+    def test_scheduled_saves_are_coalesced(self):
+        """同じパスへの連続した保存要求は1回の書き込みにまとまる"""
+        test_file = os.path.join(self.temp_dir, "coalesce_test.txt")
+        scheduler = self.fs_manager.save_scheduler
+        scheduler.debounce_ms = 50
+        contents = ["一回目", "二回目", "三回目"]
+        results = []
+        for content in contents:
+            self.fs_manager.schedule_save(test_file, lambda content=content: content, results.append)
+        self.assertTrue(scheduler.has_pending(test_file))
+        
+        self.assertTrue(wait_until(lambda: len(results) == 3))
+        self.assertEqual(results, [True, True, True])
+        with open(test_file, 'r', encoding='utf-8-sig') as f:
+            self.assertEqual(f.read(), "三回目")
+        stats = self.fs_manager.get_save_queue_statistics()
+        self.assertEqual((stats['requests'], stats['coalesced'], stats['writes']), (3, 2, 1))
+        self.assertEqual(stats['pending'], 0)
+    
+    def test_scheduled_save_respects_max_latency(self):
+        """入力が続いても最大待ち時間で書き込み、flushで即時に書き込める"""
+        test_file = os.path.join(self.temp_dir, "latency_test.txt")
+        scheduler = self.fs_manager.save_scheduler
+        scheduler.debounce_ms = 200
+        scheduler.max_latency_ms = 300
+        results = []
+        started = time.monotonic()
+        # debounceより短い間隔で要求し続ける
+        while not results and time.monotonic() - started < 3.0:
+            self.fs_manager.schedule_save(test_file, lambda: "入力中", results.append)
+            wait_until(lambda: bool(results), timeout=0.05)
+        self.assertTrue(wait_until(lambda: bool(results)))
+        self.assertLess(self.fs_manager.get_save_queue_statistics()['max_latency_ms'], 2000)
+        
+        scheduler.debounce_ms = 60000
+        flushed = []
+        self.fs_manager.schedule_save(test_file, lambda: "確定", flushed.append)
+        self.fs_manager.flush_saves(test_file)
+        self.assertFalse(scheduler.has_pending())
+        self.assertTrue(wait_until(lambda: flushed == [True]))
+        with open(test_file, 'r', encoding='utf-8-sig') as f:
+            self.assertEqual(f.read(), "確定")
+    
+    def test_flush_documents_saves_all_in_parallel(self):
+        """終了時の一括保存は全メモを書き込み、予約中の保存は渡された内容で置き換える"""
+        documents = {os.path.join(self.temp_dir, f"flush_{i}.txt"): f"内容{i}" * 1000 for i in range(4)}
+        first_path = next(iter(documents))
+        self.fs_manager.save_scheduler.debounce_ms = 60000
+        self.fs_manager.schedule_save(first_path, lambda: "古い予約")
+        
+        results = self.fs_manager.flush_documents(documents, deadline_ms=5000)
+        
+        self.assertEqual(results, dict.fromkeys(documents, True))
+        self.assertFalse(self.fs_manager.save_scheduler.has_pending())
+        for file_path, content in documents.items():
+            with open(file_path, 'r', encoding='utf-8-sig') as f:
+                self.assertEqual(f.read(), content)
+    
+    def test_flush_documents_reports_failures_and_timeouts(self):
+        """書き込めなかったメモはFalse、期限内に終わらなかったメモはNoneを返す（イベントループは回さない）"""
+        saved_path = os.path.join(self.temp_dir, "flush_ok.txt")
+        # 親がファイルのパスには書き込めない
+        blocker = os.path.join(self.temp_dir, "not_a_dir")
+        with open(blocker, 'w', encoding='utf-8') as f:
+            f.write("")
+        failed_path = os.path.join(blocker, "flush_ng.txt")
+        with patch.object(QApplication, 'processEvents', side_effect=AssertionError("イベントループを回した")):
+            results = self.fs_manager.flush_documents({saved_path: "保存", failed_path: "失敗"}, deadline_ms=5000)
+        self.assertEqual(results, {saved_path: True, failed_path: False})
+    
+        slow_path = os.path.join(self.temp_dir, "flush_slow.txt")
+        results = self.fs_manager.flush_documents({slow_path: "遅い" * (16 * 1024 * 1024)}, deadline_ms=0)
+        self.assertEqual(results, {slow_path: None})
+        self.assertTrue(self.fs_manager.wait_for_pending_operations(slow_path, timeout_ms=30000))
+    
+    def test_cancel_file_operation_drops_callback(self):
+        """キャンセルした読み込みのコールバックは呼ばれない"""
+        test_file = os.path.join(self.temp_dir, "cancel_test.txt")
+        with open(test_file, 'w', encoding='utf-8') as f:
+            f.write("内容")
+        
+        results = []
+        # 先行する保存の後ろに並んだ読み込みをキャンセルする
+        self.fs_manager.save_memo_content_async(test_file, "内容" * (1024 * 1024))
+        operation_id = self.fs_manager.load_memo_content_async(test_file, results.append)
+        self.assertIn(operation_id, self.fs_manager.get_active_operations())
+        self.fs_manager.cancel_file_operation(test_file)
+        
+        self.assertTrue(wait_until(lambda: not self.fs_manager.get_active_operations()))
+        QApplication.processEvents()
+        self.assertEqual(results, [])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import os
+import sys
+import time
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QTextCursor
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(test_dir)
+sys.path.insert(0, parent_dir)
+
+from NekoNyanMemoNote.constants import FIND_HIGHLIGHT_PROPERTY_ID
+from NekoNyanMemoNote.find_replace import (
+    DocumentFinder, compile_find_pattern, find_matches, replace_in_text, replacement_template
+)
+from NekoNyanMemoNote.widgets import MemoTextEdit
+
+def wait_until(predicate, timeout=10.0):
+    """イベントループを回しながら条件が満たされるまで待機"""
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.005)
+    return predicate()
+
+class TestFindFunctions(unittest.TestCase):
+    def test_matches_are_in_document_positions(self):
+        """一致の位置はQTextDocumentと同じく、絵文字などを2文字に数える"""
+        starts, ends = find_matches("猫🐱猫🐈猫", compile_find_pattern("猫"))
+        self.assertEqual((list(starts), list(ends)), ([0, 3, 6], [1, 4, 7]))
+        starts, _ = find_matches("Cat cat CAT", compile_find_pattern("cat", case_sensitive=True))
+        self.assertEqual(list(starts), [4])
+        self.assertIsNone(find_matches("a" * 10000, compile_find_pattern("a"), should_abort=lambda: True))
+
+    def test_replace_returns_only_changed_range(self):
+        """置換は最初の一致から最後の一致までの範囲だけを返す"""
+        text = "前置き foo1 と foo22 の後ろ"
+        self.assertEqual(replace_in_text(text, compile_find_pattern(r"foo(\d+)", is_regex=True), r"bar\1"),
+                         (2, 4, 16, "bar1 と bar22"))
+        self.assertEqual(replace_in_text(text, compile_find_pattern("なし"), ""), (0, 0, 0, ""))
+        self.assertEqual(replace_in_text(text, compile_find_pattern("foo"), replacement_template("a\\b")),
+                         (2, 4, 14, "a\\b1 と a\\b"))
+        self.assertIsNone(replace_in_text("a" * 10000, compile_find_pattern("a"), "b", should_abort=lambda: True))
+
+class TestDocumentFinder(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.editor = MemoTextEdit()
+        self.editor.resize(400, 300)
+        self.editor.show()
+        self.finder = DocumentFinder()
+        self.found, self.replaced = [], []
+        self.finder.matches_found.connect(self.found.append)
+        self.finder.replace_finished.connect(self.replaced.append)
+
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        self.finder.cancel()
+        self.finder.wait(5000)
+        self.editor.close()
+
+    def test_find_highlights_only_visible_matches(self):
+        """すべての一致を求め、強調表示は表示範囲の分だけ作る"""
+        self.editor.setPlainText("猫と犬\n" * 5000)
+        self.finder.start_find(self.editor, "犬")
+        self.assertTrue(wait_until(lambda: self.found))
+        self.assertEqual(len(self.found[0]['starts']), 5000)
+        self.editor.set_find_matches(self.found[0]['starts'], self.found[0]['ends'])
+        highlights = [sel for sel in self.editor.extraSelections() if sel.format.property(FIND_HIGHLIGHT_PROPERTY_ID)]
+        self.assertTrue(0 < len(highlights) < 100)
+        self.assertEqual(highlights[0].cursor.selectedText(), "犬")
+
+        # 編集すると位置がずれるため強調表示は消える
+        self.editor.textCursor().insertText("鳥")
+        self.assertIsNone(self.editor.find_matches)
+
+    def test_replace_all_is_one_undo_step(self):
+        """すべて置換は1回の編集として反映され、Undo 1回で元に戻る"""
+        original = "前置き\n" + "foo1 bar foo22\n" * 2000 + "後ろ🐱"
+        self.editor.setPlainText(original)
+        self.assertTrue(self.finder.start_replace_all(self.editor, r"foo(\d+)", r"<\1>", is_regex=True))
+        self.assertTrue(wait_until(lambda: self.replaced))
+        self.assertEqual(self.replaced[0]['count'], 4000)
+        self.assertEqual(self.editor.toPlainText(), "前置き\n" + "<1> bar <22>\n" * 2000 + "後ろ🐱")
+        self.assertTrue(self.editor.document().isModified())
+        self.editor.document().undo()
+        self.assertEqual(self.editor.toPlainText(), original)
+
+    def test_replace_all_is_dropped_if_memo_changed(self):
+        """置換を求めている間にメモが編集されたら、古い内容での置換は反映しない"""
+        self.editor.setPlainText("猫\n" * 1000)
+        self.finder.start_replace_all(self.editor, "猫", "ねこ")
+        self.editor.moveCursor(QTextCursor.MoveOperation.End)
+        self.editor.textCursor().insertText("追記")
+        self.assertTrue(wait_until(lambda: self.replaced))
+        self.assertIn('error', self.replaced[0])
+        self.assertEqual(self.editor.toPlainText(), "猫\n" * 1000 + "追記")
+
+    def test_literal_replacement_keeps_backslashes(self):
+        """正規表現でなければ置換後の文字列の\\もそのまま入る"""
+        self.editor.setPlainText("C:/memo")
+        self.finder.start_replace_all(self.editor, "/", "\\")
+        self.assertTrue(wait_until(lambda: self.replaced))
+        self.assertEqual(self.editor.toPlainText(), "C:\\memo")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+from PyQt6.QtWidgets import QApplication
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(test_dir)
+sys.path.insert(0, parent_dir)
+
+from NekoNyanMemoNote.grep_search import GrepSearcher, compile_grep_query, grep_file
+
+class TestGrepFile(unittest.TestCase):
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, content, encoding='utf-8'):
+        file_path = os.path.join(self.temp_dir, name)
+        with open(file_path, 'w', encoding=encoding, newline='') as f:
+            f.write(content)
+        return file_path
+
+    def lines(self, file_path, query, is_regex=False, case_sensitive=False, **kwargs):
+        return [hit['line'] for hit in grep_file(file_path, compile_grep_query(query, is_regex, case_sensitive), **kwargs)]
+
+    def test_literal_and_regex_in_utf8_and_cp932(self):
+        """UTF-8・CP932のメモを文字コードを推定して読み、一致した行の番号と抜粋を返す"""
+        content = "一行目\r\n猫が好き Cat\r\n犬\r\nねこ cat\r\n"
+        for encoding in ('utf-8', 'cp932'):
+            file_path = self.write(f"{encoding}.txt", content, encoding)
+            self.assertEqual(self.lines(file_path, "cat"), [2, 4])
+            self.assertEqual(self.lines(file_path, "Cat", case_sensitive=True), [2])
+            self.assertEqual(self.lines(file_path, r"^(猫|ねこ)", is_regex=True), [2, 4])
+            self.assertEqual(self.lines(file_path, "鳥"), [])
+        hits = grep_file(file_path, compile_grep_query("犬"))
+        self.assertEqual((hits[0]['title'], hits[0]['snippet']), ("cp932", "3行: 【犬】"))
+
+    def test_large_memo_is_scanned_in_blocks(self):
+        """大きなメモは行の区切りで分けて照合し、ブロックをまたいでも行番号がずれない"""
+        lines = [f"{i}行目のテキスト" + ("（一致）" if i % 50 == 0 else "") for i in range(1, 401)]
+        file_path = self.write("large.txt", "\r\n".join(lines), 'cp932')
+        expected = list(range(50, 401, 50))
+        self.assertEqual(self.lines(file_path, "一致", block_size=256), expected)
+        self.assertEqual(self.lines(file_path, "一.", is_regex=True, block_size=256), expected)
+        self.assertEqual(self.lines(file_path, "一致", block_size=256, max_hits=3), expected[:3])
+
+    def test_empty_matching_regex_hits_each_line_once(self):
+        """空文字列に一致する正規表現でも、ブロックの境目で行が重複したり存在しない行が出たりしない"""
+        file_path = self.write("empty_match.txt", "aa\nbb\ncc\ndd\n")
+        for query in ("^", r"\w*", "$", "x|"):
+            self.assertEqual(self.lines(file_path, query, is_regex=True, block_size=4), [1, 2, 3, 4])
+        file_path = self.write("blank_line.txt", "aa\n\nbb")
+        self.assertEqual(self.lines(file_path, "^", is_regex=True, block_size=4), [1, 2, 3])
+
+class TestGrepSearcher(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        for i in range(100):
+            folder = os.path.join(self.temp_dir, f"フォルダ{i % 4}")
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"メモ{i}.txt"), 'w', encoding='utf-8') as f:
+                f.write(f"メモ{i}\n" + ("合言葉\n" if i % 10 == 0 else "") + "本文\n" * 50)
+
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        shutil.rmtree(self.temp_dir)
+
+    def wait_for(self, condition, timeout=10):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            QApplication.processEvents()
+            time.sleep(0.005)
+
+    def test_hits_stream_in_and_cancelled_search_sends_nothing(self):
+        """一致はメモごとに届き、取り消した検索の結果は届かない"""
+        searcher = GrepSearcher(self.temp_dir)
+        hits, finished = [], []
+        searcher.hits_found.connect(hits.append)
+        searcher.search_finished.connect(finished.append)
+
+        searcher.start("本文")
+        searcher.cancel()
+        self.assertTrue(searcher.wait(5000))
+        QApplication.processEvents()
+        self.assertEqual((hits, finished), ([], []))
+
+        searcher.start("合言葉")
+        self.wait_for(lambda: finished)
+        self.assertEqual(len(hits), 10)
+        self.assertTrue(all(len(batch) == 1 and batch[0]['line'] == 2 for batch in hits))
+        self.assertEqual((finished[0]['files'], finished[0]['hits']), (100, 10))
+        self.assertFalse(searcher.is_searching)
+
+if __name__ == '__main__':
+    unittest.main()
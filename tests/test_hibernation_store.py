@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import os
+import sys
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(test_dir)
+sys.path.insert(0, parent_dir)
+
+from NekoNyanMemoNote.hibernation_store import HibernationStore
+
+class TestHibernationStore(unittest.TestCase):
+    def setUp(self):
+        """テスト前の準備"""
+        self.store = HibernationStore()
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        self.store.clear()
+    
+    def test_put_and_take_restores_state(self):
+        """圧縮して退避した内容と状態はそのまま取り出せる"""
+        content = "猫のメモ\n" * 10000
+        self.store.put("a.txt", content, cursor_pos=12, scroll_pos=34, modified=True)
+        
+        stats = self.store.get_statistics()
+        self.assertEqual(stats['raw_bytes'], len(content.encode('utf-8')))
+        self.assertLess(stats['compressed_bytes'], stats['raw_bytes'] // 10)
+        self.assertIn("a.txt", self.store)
+        
+        state = self.store.take("a.txt")
+        self.assertEqual(state, {'content': content, 'cursor_pos': 12, 'scroll_pos': 34, 'modified': True})
+        self.assertNotIn("a.txt", self.store)
+        self.assertIsNone(self.store.take("a.txt"))
+    
+    def test_coldest_entries_spill_to_temp_file(self):
+        """メモリ上限を超えると古い順に一時ファイルへ書き出し、取り出しは透過的に行える"""
+        self.store.memory_budget_bytes = 1500
+        contents = {f"{i}.txt": os.urandom(600).hex() for i in range(3)}
+        for file_path, content in contents.items():
+            self.store.put(file_path, content)
+        
+        stats = self.store.get_statistics()
+        self.assertLessEqual(stats['memory_bytes'], 1500)
+        self.assertEqual(stats['spilled_entries'], 1)
+        for file_path, content in contents.items():
+            self.assertEqual(self.store.peek(file_path)['content'], content)
+        
+        del self.store["0.txt"]
+        self.assertEqual(self.store.get_statistics()['spilled_bytes'], 0)
+    
+    def test_modified_paths_and_mark_saved(self):
+        """未保存の変更がある退避内容を列挙し、保存済みにできる"""
+        self.store.put("a.txt", "a", modified=True)
+        self.store.put("b.txt", "b", modified=False)
+        self.assertEqual(self.store.modified_paths(), ["a.txt"])
+        self.store.mark_saved("a.txt")
+        self.assertEqual(self.store.modified_paths(), [])
+
+if __name__ == '__main__':
+    unittest.main()
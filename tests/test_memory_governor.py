@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import os
+import sys
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QTextCursor
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(test_dir)
+sys.path.insert(0, parent_dir)
+
+from NekoNyanMemoNote.widgets import MemoTextEdit
+from NekoNyanMemoNote.hibernation_store import HibernationStore
+from NekoNyanMemoNote.memory_governor import MemoryGovernor, estimate_document_bytes
+
+class TestMemoryGovernor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """テスト前の準備（同じ大きさのメモを開いたタブを3つ用意）"""
+        self.store = HibernationStore()
+        self.editors = []
+        for name in ("a.txt", "b.txt", "c.txt"):
+            editor = MemoTextEdit(file_path=name)
+            editor.setPlainText(f"{name}の内容\n" * 2000)
+            editor.document().setModified(False)
+            self.editors.append(editor)
+        self.document_bytes = estimate_document_bytes(self.editors[0].document())
+        # 表示順を記録し終えるまでは無制限にしておく
+        self.governor = MemoryGovernor(self.store, budget_bytes=0)
+
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        self.store.clear()
+
+    def show(self, editor):
+        """タブの表示を模して記録"""
+        self.governor.touch(editor)
+        return self.governor.enforce(self.editors, editor)
+
+    def limit_to_two_tabs(self, current):
+        """2タブ分を少し超えたら追い出す上限にして適用"""
+        self.governor.set_budget(self.document_bytes * 2 + 1000)
+        return self.governor.enforce(self.editors, current)
+
+    def test_least_recently_shown_clean_tab_is_dropped(self):
+        """上限を超えると最も長く表示していないタブのドキュメントを捨てる"""
+        a, b, c = self.editors
+        self.show(b)
+        self.show(a)
+        self.show(c)
+        decisions = self.limit_to_two_tabs(c)
+
+        self.assertEqual([(name, action) for name, action, _ in decisions], [("b.txt", 'dropped')])
+        self.assertTrue(self.governor.is_dropped(b))
+        self.assertTrue(b.content_document().isEmpty())
+        self.assertFalse(a.content_document().isEmpty())
+        self.assertLessEqual(self.governor.get_statistics()['tracked_bytes'], self.governor.budget_bytes)
+        self.assertIsNotNone(self.governor.take_dropped(b))
+        self.assertFalse(self.governor.is_dropped(b))
+
+    def test_modified_tab_is_compressed_into_store(self):
+        """未保存の変更があるタブは内容を圧縮ストアに退避する"""
+        a, b, c = self.editors
+        a.moveCursor(QTextCursor.MoveOperation.End)
+        a.insertPlainText("未保存")
+        self.show(a)
+        a.hibernate_document()
+        self.show(b)
+        self.show(c)
+        decisions = self.limit_to_two_tabs(c)
+
+        self.assertEqual([(name, action) for name, action, _ in decisions], [("a.txt", 'compressed')])
+        self.assertFalse(a.is_hibernated)
+        self.assertEqual(self.store.modified_paths(), ["a.txt"])
+        self.assertTrue(self.store.peek("a.txt")['content'].endswith("未保存"))
+
+    def test_current_tab_is_never_evicted(self):
+        """表示中のタブは上限を超えていても追い出さない"""
+        a, b, c = self.editors
+        self.governor.set_budget(1)
+        decisions = self.show(a)
+
+        self.assertEqual(sorted(name for name, _, _ in decisions), ["b.txt", "c.txt"])
+        self.assertFalse(a.content_document().isEmpty())
+
+    def test_closed_tabs_are_forgotten(self):
+        """タブから外れたエディタの記録は捨てる"""
+        a, b, c = self.editors
+        self.show(a)
+        self.show(b)
+        self.governor.enforce([a], a)
+
+        self.assertEqual(self.governor.get_statistics()['tabs'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+from PyQt6.QtWidgets import QApplication
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(test_dir)
+sys.path.insert(0, parent_dir)
+
+from NekoNyanMemoNote.quick_open import MemoNameIndex, MemoNameIndexer
+
+ROOT = os.path.abspath(os.path.join(os.sep, "memo"))
+
+def memo_path(*parts):
+    return os.path.join(ROOT, *parts)
+
+class TestMemoNameIndex(unittest.TestCase):
+    def setUp(self):
+        """テスト前の準備（ファイルを作らずに名前だけを登録）"""
+        self.index = MemoNameIndex()
+        for folder, name in (("仕事", "会議メモ"), ("仕事", "定例会議"), ("仕事", "Meeting Notes"),
+                             ("日記", "会議"), ("日記", "猫の日記"), ("日記", "予算_猫_2024")):
+            self.index.add(memo_path(folder, name + ".txt"))
+
+    def titles(self, query):
+        return [result['title'] for result in self.index.search(query)]
+
+    def test_exact_and_prefix_matches_rank_first(self):
+        """名前全体・先頭での一致を途中での一致より上位にする"""
+        self.assertEqual(self.titles("会議"), ["会議", "会議メモ", "定例会議"])
+        self.assertEqual(self.titles("meeting"), ["Meeting Notes"])
+        self.assertEqual(self.index.search("会議メモ")[0]['path'], memo_path("仕事", "会議メモ.txt"))
+
+    def test_single_character_and_multiple_terms(self):
+        """1文字の語、空白区切りの複数の語（すべてを含む名前）でも探せる"""
+        self.assertEqual(sorted(self.titles("猫")), ["予算_猫_2024", "猫の日記"])
+        self.assertEqual(self.titles("猫 予算"), ["予算_猫_2024"])
+        self.assertEqual(self.titles("notes meet"), ["Meeting Notes"])
+        self.assertEqual(self.titles("犬"), [])
+
+    def test_width_and_kana_variants_match(self):
+        """全角・半角、ひらがな・カタカナの違いを区別しない"""
+        self.assertEqual(self.titles("めも"), ["会議メモ"])
+        self.assertEqual(self.titles("ﾒﾓ"), ["会議メモ"])
+        self.assertEqual(self.titles("ＭＥＥＴＩＮＧ"), ["Meeting Notes"])
+
+    def test_typos_match_fuzzily(self):
+        """部分一致しなくても、3文字の組の半分以上が共通する名前は候補にする"""
+        self.assertEqual(self.titles("meetng"), ["Meeting Notes"])
+        self.assertEqual(self.titles("meetng nots"), ["Meeting Notes"])
+        self.assertEqual(self.titles("xyzzy"), [])
+
+    def test_changes_update_only_affected_names(self):
+        """作成・名前変更・削除の通知で索引を更新する"""
+        self.index.apply_change("created", memo_path("仕事", "議事録.txt"))
+        self.index.apply_change("saved", memo_path("仕事", "議事録.txt"))
+        self.assertEqual(self.titles("議事録"), ["議事録"])
+        self.assertEqual(len(self.index), 7)
+
+        self.index.apply_change("renamed", memo_path("仕事", "議事録2.txt"), memo_path("仕事", "議事録.txt"))
+        self.assertEqual(self.titles("議事録"), ["議事録2"])
+        self.index.apply_change("renamed", memo_path("業務"), memo_path("仕事"))
+        self.assertEqual(self.index.search("定例")[0]['path'], memo_path("業務", "定例会議.txt"))
+
+        self.index.apply_change("deleted", memo_path("業務"))
+        self.assertEqual(self.titles("会議"), ["会議"])
+        self.assertEqual(len(self.index), 3)
+
+        # 削除したIDを使い回しても古い名前で見つからない
+        self.index.apply_change("created", memo_path("日記", "旅行.txt"))
+        self.assertEqual(self.titles("旅"), ["旅行"])
+        self.assertEqual(self.titles("定例"), [])
+
+    def test_single_character_search_after_changes(self):
+        """変更を反映しても1文字の語の検索用の文字列は作り直さず、追加・削除したメモを正しく扱う"""
+        self.assertEqual(sorted(self.titles("議")), ["会議", "会議メモ", "定例会議"])
+        scan_text = self.index._scan_text
+        self.index.apply_change("created", memo_path("仕事", "議事録.txt"))
+        self.index.apply_change("deleted", memo_path("仕事", "定例会議.txt"))
+        self.index.apply_change("created", memo_path("日記", "休日.txt"))  # 削除したIDを使い回す
+        self.assertIs(self.index._scan_text, scan_text)
+        self.assertEqual(sorted(self.titles("議")), ["会議", "会議メモ", "議事録"])
+        self.assertEqual(sorted(self.titles("日")), ["休日", "猫の日記"])
+        self.assertEqual(self.titles("例"), [])
+
+class TestMemoNameIndexer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        for i in range(20):
+            folder = os.path.join(self.temp_dir, f"フォルダ{i % 2}")
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"メモ{i}.txt"), 'w', encoding='utf-8') as f:
+                f.write("")
+
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_build_in_background_and_replay_changes(self):
+        """索引は裏で作成し、作成中に届いた変更は作成後に反映する"""
+        indexer = MemoNameIndexer(self.temp_dir)
+        finished = []
+        indexer.build_finished.connect(finished.append)
+        self.assertTrue(indexer.start_build())
+        new_path = os.path.join(self.temp_dir, "フォルダ0", "あとから.txt")
+        with open(new_path, 'w', encoding='utf-8') as f:
+            f.write("")
+        indexer.on_file_changed("created", new_path)
+        indexer.on_file_changed("deleted", os.path.join(self.temp_dir, "フォルダ1"))
+
+        deadline = time.monotonic() + 10
+        while not finished and time.monotonic() < deadline:
+            QApplication.processEvents()
+            time.sleep(0.005)
+        self.assertEqual(finished[0]['memos'], 21)
+        self.assertFalse(indexer.is_building)
+        self.assertEqual(len(indexer.index), 11)
+        self.assertEqual([result['path'] for result in indexer.search("あとから")], [new_path])
+
+if __name__ == '__main__':
+    unittest.main()
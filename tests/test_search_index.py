@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+from PyQt6.QtWidgets import QApplication
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(test_dir)
+sys.path.insert(0, parent_dir)
+
+from NekoNyanMemoNote.search_index import SearchIndex, SearchIndexer, build_search_terms, fts5_trigram_available
+
+@unittest.skipUnless(fts5_trigram_available(), "SQLiteがFTS5のtrigramに対応していない")
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        """テスト前の準備（フォルダ2つにメモを作成）"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "PyMemoNoteData")
+        self.write("仕事/会議.txt", "来週の定例会議で予算案を確認する")
+        self.write("仕事/買い物.txt", "猫のごはんと牛乳を買う")
+        self.write("日記/2024.txt", "今日は猫と遊んだ。予算のことは忘れた")
+        self.index = SearchIndex(os.path.join(self.temp_dir, "search.sqlite3"))
+
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        self.index.close()
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, relative_path, content, encoding='utf-8'):
+        file_path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w', encoding=encoding) as f:
+            f.write(content)
+        return file_path
+
+    def titles(self, query):
+        return sorted(result['title'] for result in self.index.search(query))
+
+    def test_japanese_substring_search_with_snippet(self):
+        """空白のない日本語を部分一致で検索し、一致箇所を括弧で囲んだ抜粋を返す"""
+        self.index.build(self.root)
+        results = self.index.search("予算案")
+        self.assertEqual([result['title'] for result in results], ["会議"])
+        self.assertIn("【予算案】", results[0]['snippet'])
+        self.assertEqual(self.titles("予算 会議"), ["会議"])
+
+    def test_short_terms_and_titles(self):
+        """2文字以下の語はLIKEで探し、ファイル名も検索対象になる"""
+        self.write("日記/古いメモ.txt", "猫についての覚え書き", encoding='cp932')
+        self.index.build(self.root)
+        self.assertEqual(self.titles("猫"), ["2024", "古いメモ", "買い物"])
+        self.assertTrue(all("【猫】" in result['snippet'] for result in self.index.search("猫")))
+        self.assertEqual(self.titles("買い物"), ["買い物"])
+
+    def test_width_and_kana_variants_match(self):
+        """全角・半角、ひらがな・カタカナの違いを区別せずに一致し、抜粋は元の本文のまま括弧で囲む"""
+        self.write("日記/ﾈｺ.txt", "ﾈｺﾉｶﾞｲﾄﾞﾌﾞｯｸ…ＭＥＭＯ")
+        self.index.build(self.root)
+        results = self.index.search("ねこのガイド")
+        self.assertEqual([result['title'] for result in results], ["ﾈｺ"])
+        self.assertIn("【ﾈｺﾉｶﾞｲﾄﾞ】", results[0]['snippet'])
+        self.assertIn("【…ＭＥＭＯ】", self.index.search("...memo")[0]['snippet'])
+        self.assertEqual(self.titles("ネコ"), ["ﾈｺ"])
+
+    def test_build_reindexes_only_changed_files(self):
+        """2回目以降は変更・追加されたメモだけを索引し、削除されたメモは索引から消す"""
+        first = self.index.build(self.root)
+        self.assertEqual((first['files'], first['indexed']), (3, 3))
+        self.assertEqual(self.index.build(self.root)['indexed'], 0)
+
+        changed = self.write("仕事/買い物.txt", "犬のおやつを買う（追記あり）")
+        stat = os.stat(changed)
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+        os.remove(os.path.join(self.root, "日記", "2024.txt"))
+        stats = self.index.build(self.root)
+        self.assertEqual((stats['indexed'], stats['removed']), (1, 1))
+        self.assertEqual(self.titles("おやつ"), ["買い物"])
+        self.assertEqual(self.titles("遊んだ"), [])
+        self.assertEqual(self.index.get_statistics()['memos'], 2)
+
+    def test_parallel_build_matches_sequential_build(self):
+        """複数プロセスで読んでも、1スレッドで読んだ場合と同じ索引になる"""
+        for i in range(40):
+            self.write(f"大量/メモ{i}.txt", f"並列で読むメモ{i}\r\n二行目", encoding='cp932' if i % 2 else 'utf-8')
+        stats = self.index.build(self.root, processes=2)
+        self.assertEqual((stats['indexed'], stats['processes']), (43, 2))
+        self.assertEqual(len(self.index.search("並列で読む", limit=100)), 40)
+        self.assertEqual(self.titles("メモ39 二行目"), ["メモ39"])
+        self.assertEqual(self.index.build(self.root, processes=2)['indexed'], 0)
+
+    def test_aborted_build_keeps_indexed_memos(self):
+        """中断しても索引済みの分は残り、次回は残りだけを索引する"""
+        stats = self.index.build(self.root, should_abort=lambda: True)
+        self.assertTrue(stats['aborted'])
+        self.assertEqual(self.index.build(self.root)['indexed'], 3)
+
+        # 読み込みの途中で中断した場合も、書き込んだ分は次回読み直さない
+        for i in range(10):
+            self.write(f"追加/メモ{i}.txt", f"追加したメモ{i}")
+        calls = []
+        stats = self.index.build(self.root, should_abort=lambda: calls.append(1) or len(calls) > 20)
+        self.assertTrue(stats['aborted'])
+        self.assertEqual(self.index.build(self.root)['indexed'], 10 - stats['indexed'])
+
+    def test_apply_changes_updates_only_affected_memos(self):
+        """保存・作成・削除の通知では、そのメモだけを索引し直す"""
+        self.index.build(self.root)
+        saved = self.write("仕事/会議.txt", "議事録: 予算案は承認された")
+        created = self.write("仕事/新規.txt", "新しく作ったメモ")
+        shutil.rmtree(os.path.join(self.root, "日記"))
+        stats = self.index.apply_changes([("saved", saved, ""), ("created", created, ""), ("saved", saved, ""),
+                                          ("deleted", os.path.join(self.root, "日記"), "")])
+        self.assertEqual((stats['indexed'], stats['removed']), (2, 1))
+        self.assertEqual(self.titles("承認された"), ["会議"])
+        self.assertEqual(self.titles("作ったメモ"), ["新規"])
+        self.assertEqual(self.titles("遊んだ"), [])
+        self.assertEqual(self.index.build(self.root)['indexed'], 0)
+
+    def test_apply_changes_renames_without_reindexing(self):
+        """名前変更は本文を読み直さずにパスとタイトルを書き換え、フォルダなら中のメモも移す"""
+        self.index.build(self.root)
+        old_memo = os.path.join(self.root, "仕事", "買い物.txt")
+        new_memo = os.path.join(self.root, "仕事", "お使い.txt")
+        os.rename(old_memo, new_memo)
+        old_folder = os.path.join(self.root, "仕事")
+        new_folder = os.path.join(self.root, "業務")
+        os.rename(old_folder, new_folder)
+        stats = self.index.apply_changes([("renamed", new_memo, old_memo), ("renamed", new_folder, old_folder)])
+        
+        self.assertEqual((stats['renamed'], stats['indexed']), (3, 0))
+        self.assertEqual(self.titles("お使い"), ["お使い"])
+        self.assertEqual([result['path'] for result in self.index.search("牛乳")],
+                         [os.path.join(new_folder, "お使い.txt")])
+        self.assertEqual(self.index.build(self.root)['indexed'], 0)
+
+    def test_query_syntax_is_escaped(self):
+        """検索語に含まれるFTS5の構文文字はそのまま文字として探す"""
+        self.write("記号.txt", 'He said "NEAR(a b)" 100%_done')
+        self.index.build(self.root)
+        self.assertEqual(self.titles('"NEAR(a'), ["記号"])
+        self.assertEqual(self.titles("%_"), ["記号"])
+        self.assertEqual(build_search_terms("  "), (None, [], []))
+
+@unittest.skipUnless(fts5_trigram_available(), "SQLiteがFTS5のtrigramに対応していない")
+class TestSearchIndexer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        for i in range(50):
+            with open(os.path.join(self.temp_dir, f"memo{i}.txt"), 'w', encoding='utf-8') as f:
+                f.write(f"バックグラウンド索引のテスト{i}")
+        self.index = SearchIndex(os.path.join(self.temp_dir, "search.sqlite3"))
+
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        self.index.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_build_runs_in_background(self):
+        """索引の作成はスレッドプールで実行され、完了をシグナルで通知する"""
+        indexer = SearchIndexer(self.index, self.temp_dir)
+        finished = []
+        indexer.build_finished.connect(finished.append)
+        self.assertTrue(indexer.start_build())
+        self.assertFalse(indexer.start_build())
+
+        deadline = time.monotonic() + 10
+        while not finished and time.monotonic() < deadline:
+            QApplication.processEvents()
+            time.sleep(0.005)
+        self.assertEqual(finished[0]['indexed'], 50)
+        self.assertFalse(indexer.is_building)
+        self.assertEqual(len(self.index.search("テスト4")), 11)
+
+    def test_file_changes_are_reflected_within_a_second(self):
+        """変更の通知はまとめてバックグラウンドで反映され、1秒以内に検索できる"""
+        indexer = SearchIndexer(self.index, self.temp_dir)
+        self.index.build(self.temp_dir)
+        updated = []
+        indexer.index_updated.connect(updated.append)
+        memo_path = os.path.join(self.temp_dir, "memo7.txt")
+        with open(memo_path, 'w', encoding='utf-8') as f:
+            f.write("保存した直後の内容")
+        started = time.monotonic()
+        indexer.on_file_changed("saved", memo_path)
+        indexer.on_file_changed("saved", memo_path)
+        
+        while not updated and time.monotonic() - started < 5:
+            QApplication.processEvents()
+            time.sleep(0.005)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(len(updated), 1)
+        self.assertEqual(updated[0]['indexed'], 1)
+        self.assertEqual([result['title'] for result in self.index.search("直後の内容")], ["memo7"])
+
+if __name__ == '__main__':
+    unittest.main()
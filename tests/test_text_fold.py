@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import os
+import sys
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(test_dir)
+sys.path.insert(0, parent_dir)
+
+from NekoNyanMemoNote.text_fold import fold_text, original_position
+
+def original_of(text, term):
+    """折りたたんだ文字列でtermに一致した箇所の元の文字列"""
+    folded, offsets = fold_text(text)
+    position = folded.find(term)
+    return text[original_position(offsets, position):original_position(offsets, position + len(term), is_end=True)]
+
+class TestFoldText(unittest.TestCase):
+    def test_width_kana_and_case_are_folded(self):
+        """全角・半角、カタカナ・ひらがな、大文字・小文字を同じ形にし、長さが同じなら位置の対応を持たない"""
+        self.assertEqual(fold_text("ネコＡＢＣ１２３Memo"), ("ねこabc123memo", None))
+        self.assertEqual(fold_text("ﾈｺﾉﾒﾓ")[0], "ねこのめも")
+        self.assertEqual(fold_text("")[0], "")
+
+    def test_length_changes_keep_offsets_to_original(self):
+        """半角の濁点の合成や「…」「㍻」の展開で長さが変わっても、元の文字列の位置に戻せる"""
+        text = "㍻のｶﾞｲﾄﾞ…ﾒﾓ"
+        self.assertEqual(fold_text(text)[0], "平成のがいど...めも")
+        self.assertEqual(original_of(text, "がいど"), "ｶﾞｲﾄﾞ")
+        self.assertEqual(original_of(text, "..."), "…")
+        self.assertEqual(original_of(text, "めも"), "ﾒﾓ")
+        # 1文字が複数の文字になった場合は、その一部に一致しても元の1文字全体を返す
+        self.assertEqual(original_of(text, "成"), "㍻")
+
+    def test_decomposed_voiced_marks_are_composed(self):
+        """濁点が分かれた文字（macOSのファイル名など）も合成済みの文字と同じになる"""
+        decomposed = "か\u3099き\u3099"
+        self.assertEqual(fold_text(decomposed)[0], fold_text("がぎ")[0])
+        self.assertEqual(original_of("テスト " + decomposed, "がぎ"), decomposed)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import os
+import sys
+import time
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QTextCursor
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(test_dir)
+sys.path.insert(0, parent_dir)
+
+from NekoNyanMemoNote.text_transform import TextPipeline, TextTransformer, changed_range
+from NekoNyanMemoNote.widgets import MemoTextEdit
+
+def transform(names, text, **kwargs):
+    return TextPipeline(names).run(text, **kwargs)
+
+def wait_until(predicate, timeout=10.0):
+    """イベントループを回しながら条件が満たされるまで待機"""
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.005)
+    return predicate()
+
+class TestTextPipeline(unittest.TestCase):
+    def test_single_transforms(self):
+        """各変換の結果（末尾の改行は行をつなげる変換のときだけ消える）"""
+        self.assertEqual(transform(['remove_tabs_newlines'], "a\tb\r\nc\nd\n"), "abcd")
+        self.assertEqual(transform(['trim'], "  a \n　b\t\n"), "a\nb\n")
+        self.assertEqual(transform(['convert_width'], "ＡＢＣ１２３　ｶﾞｲﾄﾞ､ﾒﾓ"), "ABC123 ガイド、メモ")
+        self.assertEqual(transform(['sort'], "b\na\nc\n"), "a\nb\nc\n")
+        self.assertEqual(transform(['dedupe'], "b\na\nb\na"), "b\na")
+        self.assertEqual(transform(['sort', 'dedupe'], ""), "")
+
+    def test_composed_transforms_stream_across_chunks(self):
+        """組み合わせた変換は行の区切りで分けて流しても、まとめて変換した場合と同じになる"""
+        text = "".join(f" 行{i % 7}\t\n" for i in range(200))
+        for names in (['trim', 'dedupe'], ['trim', 'sort', 'dedupe'], ['convert_width', 'remove_tabs_newlines']):
+            self.assertEqual(transform(names, text, chunk_chars=16), transform(names, text))
+        self.assertEqual(transform(['trim', 'sort', 'dedupe'], text), "".join(f"行{i}\n" for i in range(7)))
+
+    def test_whole_line_transform_after_join_sees_one_line(self):
+        """行をつなげた後の行全体を見る変換は、つなげ終わった1行に対して行う"""
+        self.assertEqual(transform(['remove_tabs_newlines', 'trim'], " a\n b \n", chunk_chars=1), "a b")
+        self.assertEqual(transform(['remove_tabs_newlines', 'dedupe'], "x\nx\n", chunk_chars=1), "xx")
+
+    def test_abort_and_progress(self):
+        """中断するとNoneを返し、進み具合は全体の文字数まで通知する"""
+        progress = []
+        text = "行\n" * 1000
+        self.assertEqual(transform(['trim'], text, on_progress=lambda done, total: progress.append((done, total)),
+                                   chunk_chars=100)[:2], "行\n")
+        self.assertEqual(progress[-1], (len(text), len(text)))
+        self.assertGreater(len(progress), 1)
+        self.assertIsNone(transform(['sort'], text, should_abort=lambda: True))
+
+    def test_changed_range(self):
+        """変換前後で変わらない先頭と末尾を除いた範囲を返す"""
+        old = "abcdef" * 30000
+        new = old[:100] + "X" + old[101:]
+        self.assertEqual(changed_range(old, new), (100, 101, "X"))
+        self.assertEqual(changed_range("ab", "abab"), (2, 2, "ab"))
+        self.assertEqual(changed_range("同じ", "同じ"), (2, 2, ""))
+
+class TestTextTransformer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.editor = MemoTextEdit()
+        self.editor.resize(400, 300)
+        self.editor.show()
+        self.transformer = TextTransformer()
+        self.finished = []
+        self.transformer.transform_finished.connect(self.finished.append)
+
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        self.transformer.cancel()
+        self.transformer.wait(5000)
+        self.editor.close()
+
+    def test_document_transform_is_one_undo_step(self):
+        """メモ全体の変換は変わった範囲だけを1回の編集として反映し、Undo 1回で元に戻る"""
+        text = "\t猫🐱\n犬\t\n" * 2000
+        self.editor.setPlainText(text)
+        self.assertTrue(self.transformer.start(self.editor, ['remove_tabs_newlines']))
+        self.assertTrue(wait_until(lambda: self.finished))
+        self.assertTrue(self.finished[0]['changed'])
+        self.assertEqual(self.editor.toPlainText(), "猫🐱犬" * 2000)
+        self.editor.document().undo()
+        self.assertEqual(self.editor.toPlainText(), text)
+
+    def test_selection_transform_keeps_selection(self):
+        """選択範囲だけを変換し、変換後のテキストを選択し直す"""
+        self.editor.setPlainText("前🐱\nb\na\nb\n後")
+        cursor = self.editor.textCursor()
+        cursor.setPosition(4)
+        cursor.setPosition(9, QTextCursor.MoveMode.KeepAnchor)
+        self.editor.setTextCursor(cursor)
+        self.assertTrue(self.transformer.start(self.editor, ['sort', 'dedupe']))
+        self.assertTrue(wait_until(lambda: self.finished))
+        self.assertEqual(self.editor.toPlainText(), "前🐱\na\nb\n後")
+        self.assertEqual(self.editor.textCursor().selectedText(), "a\u2029b")
+
+    def test_stale_revision_and_read_only(self):
+        """変換中にメモが変更されたら反映せず、読み取り専用のメモは変換しない"""
+        self.editor.setPlainText("a\tb\n" * 100)
+        self.assertTrue(self.transformer.start(self.editor, ['remove_tabs_newlines']))
+        self.editor.textCursor().insertText("追記")
+        self.assertTrue(wait_until(lambda: self.finished))
+        self.assertIn('error', self.finished[0])
+        self.assertTrue(self.editor.toPlainText().startswith("追記a\tb"))
+
+        self.editor.setReadOnly(True)
+        self.assertFalse(self.transformer.start(self.editor, ['trim']))
+
+if __name__ == '__main__':
+    unittest.main()
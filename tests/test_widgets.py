@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+import os
+import sys
+import time
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QTextCursor
+
+# テスト用のパス設定
+test_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(test_dir)
+sys.path.insert(0, parent_dir)
+
+from NekoNyanMemoNote.widgets import MemoTextEdit
+
+def wait_until(predicate, timeout=5.0):
+    """イベントループを回しながら条件が満たされるまで待機"""
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        QApplication.processEvents()
+        time.sleep(0.005)
+    return predicate()
+
+class TestProgressiveDocumentLoader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """テスト前の準備"""
+        self.editor = MemoTextEdit()
+        self.loader = self.editor.progressive_loader
+
+    def test_chunks_appended_in_order(self):
+        """チャンクは届いた順に追記され、完了後にUndoが有効に戻る"""
+        finished = []
+        self.editor.setPlainText("前のメモ")
+        self.loader.begin()
+        self.loader.append("一行目\n" * 5000)
+        self.loader.append("最終行")
+        self.loader.finish(lambda: finished.append(True))
+
+        self.assertTrue(wait_until(lambda: finished))
+        self.assertEqual(self.editor.toPlainText(), "一行目\n" * 5000 + "最終行")
+        self.assertEqual(self.editor.textCursor().position(), 0)
+        self.assertTrue(self.editor.isUndoRedoEnabled())
+
+    def test_set_plain_text_aborts_loading(self):
+        """読み込み中に内容を置き換えると残りの追記は破棄される"""
+        self.loader.begin()
+        self.loader.append("読み込み途中" * 100000)
+        self.editor.setPlainText("別のメモ")
+
+        QApplication.processEvents()
+        self.assertEqual(self.editor.toPlainText(), "別のメモ")
+        self.assertFalse(self.loader.is_loading)
+
+class TestWindowedTextView(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """テスト前の準備（1万行のデータを行頭オフセットつきで用意）"""
+        self.data = "".join(f"行{i}\n" for i in range(10000)).encode('utf-8')
+        self.offsets = [0]
+        for line in self.data.splitlines(keepends=True):
+            self.offsets.append(self.offsets[-1] + len(line))
+        self.editor = MemoTextEdit()
+        self.editor.resize(400, 300)
+        self.editor.show()
+
+    def read_range(self, start, end):
+        return self.data[start:end].decode('utf-8').rstrip("\n")
+
+    def test_only_window_is_in_document(self):
+        """ドキュメントには窓の行だけが入り、行番号は窓の先頭行からずれる"""
+        view = self.editor.open_windowed_view(self.offsets, self.read_range)
+        self.assertTrue(self.editor.isReadOnly())
+        self.assertEqual(self.editor.document().blockCount(), view.window_lines)
+        self.assertEqual(self.editor.total_line_count(), 10000)
+
+        view.scroll_bar.setValue(8000)
+        self.assertEqual(view.top_line(), 8000)
+        top_block = self.editor.document().findBlockByNumber(8000 - view.window_start)
+        self.assertEqual(top_block.text(), "行8000")
+        self.assertEqual(self.editor.line_number_offset(), view.window_start)
+
+    def test_close_restores_editable_editor(self):
+        """閲覧モードを終了すると編集可能に戻せる"""
+        self.editor.open_windowed_view(self.offsets, self.read_range)
+        self.editor.setReadOnly(False)
+        self.assertTrue(self.editor.isReadOnly())
+
+        self.editor.setPlainText("通常のメモ")
+        self.assertIsNone(self.editor.windowed_view)
+        self.editor.setReadOnly(False)
+        self.assertFalse(self.editor.isReadOnly())
+        self.assertEqual(self.editor.line_number_offset(), 0)
+
+class TestDocumentHibernation(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """テスト前の準備（スクロールできる長さのメモを表示）"""
+        self.editor = MemoTextEdit(file_path="memo.txt")
+        self.editor.resize(400, 300)
+        self.editor.show()
+        self.editor.setPlainText("".join(f"行{i}\n" for i in range(2000)))
+        QApplication.processEvents()
+
+    def test_undo_history_survives(self):
+        """休止・復帰をはさんでもUndo履歴と変更フラグが残る"""
+        self.editor.moveCursor(QTextCursor.MoveOperation.End)
+        self.editor.insertPlainText("追記")
+        self.assertTrue(self.editor.document().isModified())
+
+        self.assertTrue(self.editor.hibernate_document())
+        self.assertTrue(self.editor.is_hibernated)
+        self.assertEqual(self.editor.toPlainText(), "")
+        self.assertTrue(self.editor.content_document().isModified())
+        self.assertTrue(self.editor.wake_document())
+
+        self.assertTrue(self.editor.document().isModified())
+        self.assertTrue(self.editor.toPlainText().endswith("追記"))
+        self.editor.undo()
+        self.assertFalse(self.editor.toPlainText().endswith("追記"))
+
+    def test_cursor_and_scroll_restored(self):
+        """復帰直後にカーソルとスクロール位置が元に戻る"""
+        cursor = self.editor.textCursor()
+        cursor.setPosition(5000)
+        self.editor.setTextCursor(cursor)
+        self.editor.verticalScrollBar().setValue(self.editor.verticalScrollBar().maximum() // 2)
+        scroll_pos = self.editor.verticalScrollBar().value()
+
+        self.editor.hibernate_document()
+        QApplication.processEvents()
+        self.editor.wake_document()
+
+        self.assertEqual(self.editor.textCursor().position(), 5000)
+        self.assertEqual(self.editor.verticalScrollBar().value(), scroll_pos)
+
+    def test_set_plain_text_drops_hibernated_document(self):
+        """休止中に内容を置き換えると切り離したドキュメントは破棄される"""
+        self.editor.hibernate_document()
+        self.editor.setPlainText("別のメモ")
+        self.assertFalse(self.editor.is_hibernated)
+        self.assertFalse(self.editor.wake_document())
+        self.assertEqual(self.editor.toPlainText(), "別のメモ")
+
+if __name__ == '__main__':
+    unittest.main()